@@ -14,9 +14,31 @@ def create_app(config_name='default'):
                 static_folder=os.path.join(basedir, 'static'))
     app.config.from_object(config[config_name])
     
+    # Leveled JSON logs through a background queue, tagged with request ids
+    from app.logging_config import init_logging
+    init_logging(app)
+    
+    # Opt-in cProfile/tracemalloc capture of admin-flagged requests; registered
+    # early so it spans the other hooks
+    from app.profiling import init_profiling
+    init_profiling(app)
+    
+    # orjson-backed JSON (stdlib fallback) with ISO datetimes and UUID strings
+    from app.json_provider import FastJSONProvider
+    app.json = FastJSONProvider(app)
+    
     # Enable CORS
     CORS(app)
     
+    # Prometheus request latency and /metrics; registered before compression
+    # so its after_request hook runs last and the timing includes compressing
+    from app.metrics import init_metrics
+    init_metrics(app)
+    
+    # Negotiated gzip/brotli compression of JSON and text responses
+    from app.compression import init_compression
+    init_compression(app)
+    
     # Register blueprints
     from app.routes.sprint import sprint_bp
     from app.routes.chat import chat_bp
@@ -0,0 +1,121 @@
+"""Negotiated gzip/brotli response compression.
+
+Registered by create_app via init_compression(app). Settings (see config.py):
+
+    COMPRESS_ENABLED       turn compression on/off
+    COMPRESS_MIN_SIZE      smallest body (bytes) worth compressing
+    COMPRESS_GZIP_LEVEL    zlib level 1-9
+    COMPRESS_BROTLI_QUALITY brotli quality 0-11
+    COMPRESS_BLUEPRINTS    per-blueprint overrides, e.g.
+                           {'chat': {'min_size': 256}, 'admin': {'enabled': False}}
+
+Streamed responses (exports) are compressed chunk by chunk and flushed after
+each chunk, so downloads still start immediately. Responses that already
+have a Content-Encoding, aren't text-like, or ask for no-transform are left
+alone.
+"""
+import zlib
+from flask import current_app, request
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; fall back to gzip only
+    brotli = None
+
+COMPRESSIBLE_MIMETYPES = {
+    'application/json',
+    'application/x-ndjson',
+    'application/javascript',
+    'application/xml',
+    'image/svg+xml',
+}
+
+# Strong ETags must differ per encoding, so compressed responses get a suffix
+ETAG_SUFFIXES = {'gzip': '-gzip', 'br': '-br'}
+
+def init_compression(app) -> None:
+    """Compress eligible responses of app according to its COMPRESS_* config"""
+    app.config.setdefault('COMPRESS_ENABLED', True)
+    app.config.setdefault('COMPRESS_MIN_SIZE', 500)
+    app.config.setdefault('COMPRESS_GZIP_LEVEL', 6)
+    app.config.setdefault('COMPRESS_BROTLI_QUALITY', 4)
+    app.config.setdefault('COMPRESS_BLUEPRINTS', {})
+    app.after_request(compress_response)
+
+def _settings(config) -> dict:
+    overrides = config['COMPRESS_BLUEPRINTS'].get(request.blueprint) or {}
+    return {
+        'enabled': overrides.get('enabled', config['COMPRESS_ENABLED']),
+        'min_size': overrides.get('min_size', config['COMPRESS_MIN_SIZE']),
+    }
+
+def _is_compressible(response) -> bool:
+    mimetype = response.mimetype or ''
+    return mimetype.startswith('text/') or mimetype in COMPRESSIBLE_MIMETYPES
+
+def _choose_encoding():
+    offered = ['br', 'gzip'] if brotli else ['gzip']
+    return request.accept_encodings.best_match(offered)
+
+def _compressor(encoding: str, config):
+    """(compress(chunk), flush(), finish()) functions for one response body"""
+    if encoding == 'br':
+        stream = brotli.Compressor(quality=config['COMPRESS_BROTLI_QUALITY'])
+        return stream.process, stream.flush, stream.finish
+    # wbits=31 writes a gzip header and trailer
+    stream = zlib.compressobj(config['COMPRESS_GZIP_LEVEL'], zlib.DEFLATED, 31)
+    return stream.compress, lambda: stream.flush(zlib.Z_SYNC_FLUSH), stream.flush
+
+def _stream(chunks, encoding: str, config):
+    compress, flush, finish = _compressor(encoding, config)
+    try:
+        for chunk in chunks:
+            if isinstance(chunk, str):
+                chunk = chunk.encode('utf-8')
+            data = compress(chunk) + flush()
+            if data:
+                yield data
+        yield finish()
+    finally:
+        if hasattr(chunks, 'close'):
+            chunks.close()
+
+def compress_response(response):
+    """after_request hook: compress response for the client's Accept-Encoding"""
+    config = current_app.config
+
+    if (response.status_code < 200 or response.status_code in (204, 206, 304)
+            or response.direct_passthrough
+            or 'Content-Encoding' in response.headers
+            or not _is_compressible(response)):
+        return response
+    if 'no-transform' in response.headers.get('Cache-Control', ''):
+        return response
+
+    settings = _settings(config)
+    if not settings['enabled']:
+        return response
+
+    response.vary.add('Accept-Encoding')
+    encoding = _choose_encoding()
+    if not encoding:
+        return response
+
+    if response.is_streamed:
+        response.response = _stream(response.response, encoding, config)
+        response.headers.pop('Content-Length', None)
+    else:
+        data = response.get_data()
+        if len(data) < settings['min_size']:
+            return response
+        compress, _, finish = _compressor(encoding, config)
+        compressed = compress(data) + finish()
+        if len(compressed) >= len(data):
+            return response
+        response.set_data(compressed)
+
+    response.headers['Content-Encoding'] = encoding
+    etag, weak = response.get_etag()
+    if etag:
+        response.set_etag(etag + ETAG_SUFFIXES[encoding], weak)
+    return response
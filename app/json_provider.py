@@ -0,0 +1,91 @@
+"""Fast JSON encoding/decoding shared by the API, services and database layer.
+
+Uses orjson when it is installed and falls back to the standard library
+otherwise; both paths produce the same output for the types the app uses:
+
+    datetime / date / time  ISO 8601 strings (matching what Supabase returns)
+    UUID                    canonical string
+    Decimal                 float
+    set / tuple             list
+
+FastJSONProvider plugs this into Flask, so jsonify and request.get_json use it.
+"""
+import json
+from datetime import date, datetime, time
+from decimal import Decimal
+from uuid import UUID
+from flask.json.provider import JSONProvider
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the standard library
+    orjson = None
+
+# Raised by loads() on invalid input with either implementation
+# (orjson.JSONDecodeError subclasses json.JSONDecodeError)
+JSONDecodeError = json.JSONDecodeError
+
+def _default(value):
+    """Encode types neither json nor orjson handle natively"""
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (set, frozenset, tuple)):
+        return list(value)
+    if hasattr(value, '__html__'):
+        return str(value.__html__())
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+def dumps_bytes(value, indent: bool = False) -> bytes:
+    """Serialize value to UTF-8 JSON bytes"""
+    if orjson:
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(value, default=_default, option=option)
+    return dumps(value, indent).encode('utf-8')
+
+def dumps(value, indent: bool = False) -> str:
+    """Serialize value to a JSON string"""
+    if orjson:
+        return dumps_bytes(value, indent).decode('utf-8')
+    if indent:
+        return json.dumps(value, default=_default, ensure_ascii=False, indent=2)
+    return json.dumps(value, default=_default, ensure_ascii=False, separators=(',', ':'))
+
+def loads(data):
+    """Parse JSON from str or bytes"""
+    if orjson:
+        return orjson.loads(data)
+    return json.loads(data)
+
+class FastJSONProvider(JSONProvider):
+    """Flask JSON provider backed by dumps_bytes/loads.
+
+    Keys keep their insertion order (Flask's default provider sorts them).
+    Responses are pretty-printed in debug mode unless compact is set. Calls
+    with keyword options fall back to json.dumps/json.loads with them.
+    """
+    compact = None
+    mimetype = 'application/json'
+
+    def dumps(self, obj, **kwargs) -> str:
+        # Callers passing options (e.g. the session serializer's separators) get the stdlib
+        if kwargs:
+            kwargs.setdefault('default', _default)
+            return json.dumps(obj, **kwargs)
+        return dumps(obj)
+
+    def loads(self, s, **kwargs):
+        # e.g. the session serializer's object_hook, which orjson doesn't support
+        if kwargs:
+            return json.loads(s, **kwargs)
+        return loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = self.compact is False or (self.compact is None and self._app.debug)
+        return self._app.response_class(dumps_bytes(obj, indent) + b'\n', mimetype=self.mimetype)
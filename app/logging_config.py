@@ -0,0 +1,188 @@
+"""Structured, leveled logging with request ids and sampled debug output.
+
+Registered by create_app via init_logging(app). Modules log through
+logging.getLogger(__name__); records go onto an in-memory queue and a
+background QueueListener (one per process) writes them, so request threads
+never block on stdout. Settings (see config.py):
+
+    LOG_LEVEL         minimum level for app.* loggers
+    LOG_FORMAT        'json' (one object per line) or 'text'
+    LOG_DEBUG_SAMPLE  fraction of requests whose DEBUG records are kept
+    LOG_PAYLOADS      log prompt/response/session payloads via log_payload()
+
+Every record carries the request id, taken from an incoming X-Request-ID
+header or generated, and echoed back on the response.
+"""
+import copy
+import logging
+import os
+import queue
+import random
+import re
+import sys
+import time
+import uuid
+from contextvars import ContextVar
+from logging.handlers import QueueHandler, QueueListener
+from flask import g, request
+from app.json_provider import dumps
+
+REQUEST_ID_HEADER = 'X-Request-ID'
+# Accept client-supplied ids only if they are short and safe to log
+_VALID_REQUEST_ID = re.compile(r'^[A-Za-z0-9._:-]{1,64}$')
+
+# Attributes every LogRecord has; anything else was passed via extra=
+_RECORD_ATTRS = set(vars(logging.makeLogRecord({}))) | {'message', 'asctime', 'request_id'}
+
+_request_id: ContextVar[str] = ContextVar('request_id', default='-')
+_debug_sampled: ContextVar[bool] = ContextVar('debug_sampled', default=True)
+_settings = {'payloads': False, 'debug_sample': 1.0}
+
+class RequestContextFilter(logging.Filter):
+    """Stamp records with the request id and drop DEBUG records of unsampled requests"""
+
+    def filter(self, record) -> bool:
+        record.request_id = _request_id.get()
+        return record.levelno > logging.DEBUG or _debug_sampled.get()
+
+class JSONFormatter(logging.Formatter):
+    """One JSON object per record, including any extra= fields"""
+
+    def format(self, record) -> str:
+        entry = {
+            'ts': time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime(record.created))
+                  + f'.{int(record.msecs):03d}Z',
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+            'request_id': getattr(record, 'request_id', '-'),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS and not key.startswith('_'):
+                entry[key] = value
+        if record.exc_info:
+            entry['exc'] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry['exc'] = record.exc_text
+        try:
+            return dumps(entry)
+        except TypeError:
+            # An extra= value the encoder doesn't know; log its repr instead
+            return dumps({key: value if isinstance(value, (str, int, float, bool, type(None)))
+                          else repr(value) for key, value in entry.items()})
+
+class TextFormatter(logging.Formatter):
+    """Human-readable lines for development, with extra= fields appended as key=value"""
+
+    def format(self, record) -> str:
+        line = super().format(record)
+        extras = ' '.join(f'{key}={value!r}' for key, value in vars(record).items()
+                          if key not in _RECORD_ATTRS and not key.startswith('_'))
+        if not extras:
+            return line
+        # Keep any traceback after the fields
+        first, _, rest = line.partition('\n')
+        return f'{first} {extras}' + (f'\n{rest}' if rest else '')
+
+class StructuredQueueHandler(QueueHandler):
+    """Queues records for a background thread that writes them to target.
+
+    The thread is started on the first record a process logs, so a gunicorn
+    master that preloads the app never owns one and each forked worker starts
+    its own with a fresh queue. prepare() keeps the traceback apart from the
+    message (the stock one folds it into msg), so JSONFormatter can put it
+    under 'exc'.
+    """
+
+    def __init__(self, target: logging.Handler):
+        super().__init__(queue.SimpleQueue())
+        self.target = target
+        self.listener = None
+        self.pid = None
+
+    def enqueue(self, record) -> None:
+        # Handler.handle holds self.lock here, so only one thread starts it
+        if self.pid != os.getpid():
+            self.queue = queue.SimpleQueue()
+            self.listener = QueueListener(self.queue, self.target, respect_handler_level=True)
+            self.listener.start()
+            self.pid = os.getpid()
+        super().enqueue(record)
+
+    def prepare(self, record):
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def close(self) -> None:
+        # Called by logging.shutdown at exit; drains whatever is still queued
+        if self.listener is not None and self.pid == os.getpid():
+            self.listener.stop()
+            self.listener = None
+        super().close()
+
+TEXT_FORMAT = '%(asctime)s %(levelname)s [%(request_id)s] %(name)s: %(message)s'
+
+def init_logging(app) -> None:
+    """Route app.* loggers through a queue to stdout according to app's LOG_* config"""
+    app.config.setdefault('LOG_LEVEL', 'INFO')
+    app.config.setdefault('LOG_FORMAT', 'json')
+    app.config.setdefault('LOG_DEBUG_SAMPLE', 1.0)
+    app.config.setdefault('LOG_PAYLOADS', False)
+    _settings['payloads'] = app.config['LOG_PAYLOADS']
+    _settings['debug_sample'] = app.config['LOG_DEBUG_SAMPLE']
+
+    app.before_request(_start_request)
+    app.after_request(_tag_response)
+    app.teardown_request(_end_request)
+
+    stream = logging.StreamHandler(sys.stdout)
+    if app.config['LOG_FORMAT'] == 'json':
+        stream.setFormatter(JSONFormatter())
+    else:
+        stream.setFormatter(TextFormatter(TEXT_FORMAT))
+
+    handler = StructuredQueueHandler(stream)
+    # Filters run in the logging thread, while the request context is still there
+    handler.addFilter(RequestContextFilter())
+    logger = logging.getLogger('app')
+    logger.setLevel(app.config['LOG_LEVEL'])
+    for existing in [h for h in logger.handlers if isinstance(h, StructuredQueueHandler)]:
+        logger.removeHandler(existing)
+        existing.close()
+    logger.addHandler(handler)
+    logger.propagate = False
+
+def _start_request() -> None:
+    incoming = request.headers.get(REQUEST_ID_HEADER, '')
+    request_id = incoming if _VALID_REQUEST_ID.match(incoming) else uuid.uuid4().hex
+    g.request_id = request_id
+    _request_id.set(request_id)
+    # Sample per request so a kept request has all its debug records
+    _debug_sampled.set(random.random() < _settings['debug_sample'])
+
+def _tag_response(response):
+    request_id = g.get('request_id')
+    if request_id:
+        response.headers[REQUEST_ID_HEADER] = request_id
+    return response
+
+def _end_request(exc=None) -> None:
+    # Threads and greenlets are reused; don't leak this id into the next task
+    _request_id.set('-')
+    _debug_sampled.set(True)
+
+def get_request_id() -> str:
+    """The current request's id ('-' outside a request)"""
+    return _request_id.get()
+
+def log_payload(logger: logging.Logger, message: str, payload, limit: int = 1000) -> None:
+    """DEBUG-log a prompt, model response or other payload, only if LOG_PAYLOADS is on"""
+    if _settings['payloads'] and logger.isEnabledFor(logging.DEBUG):
+        text = payload if isinstance(payload, str) else repr(payload)
+        logger.debug(message, extra={'payload': text[:limit], 'payload_chars': len(text)})
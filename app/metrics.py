@@ -0,0 +1,231 @@
+"""Prometheus metrics for routes, LLM calls, database methods and the cache.
+
+Registered by create_app via init_metrics(app), which times every request
+and serves the exposition format at /metrics. Settings (see config.py):
+
+    METRICS_ENABLED        turn collection and the endpoint on/off
+    METRICS_TOKEN          if set, /metrics requires "Authorization: Bearer <token>"
+    METRICS_REQUIRE_TOKEN  serve /metrics only when METRICS_TOKEN is set (on in production)
+
+Under gunicorn with several workers, set PROMETHEUS_MULTIPROC_DIR to an
+empty directory so /metrics aggregates every worker (gunicorn.conf.py clears
+it on start and marks exited workers dead).
+
+Request latency covers the view and after_request hooks; for streamed
+responses (exports) that is the time to the first byte. prometheus_client is
+optional: without it every metric is a no-op and /metrics returns 501.
+"""
+import hmac
+import inspect
+import logging
+import os
+import time
+from contextlib import contextmanager
+from flask import Response, current_app, g, request
+
+try:
+    import prometheus_client
+except ImportError:  # prometheus_client is optional; metrics become no-ops
+    prometheus_client = None
+
+LLM_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.0, 4.0, 8.0, 15.0, 30.0, 60.0, 120.0)
+DB_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+logger = logging.getLogger(__name__)
+
+class _NoopMetric:
+    """Stands in for a metric when prometheus_client isn't installed"""
+
+    def labels(self, *args, **kwargs):
+        return self
+
+    def observe(self, amount) -> None:
+        pass
+
+    def inc(self, amount=1) -> None:
+        pass
+
+def _metric(kind: str, name: str, documentation: str, labels: tuple, **kwargs):
+    if prometheus_client is None:
+        return _NoopMetric()
+    return getattr(prometheus_client, kind)(name, documentation, labels, **kwargs)
+
+REQUEST_LATENCY = _metric(
+    'Histogram', 'http_request_duration_seconds', 'Request latency by route',
+    ('method', 'route', 'status')
+)
+LLM_LATENCY = _metric(
+    'Histogram', 'llm_request_duration_seconds', 'LLM API call latency',
+    ('provider', 'operation', 'outcome'), buckets=LLM_BUCKETS
+)
+LLM_RETRIES = _metric(
+    'Counter', 'llm_retries_total', 'LLM calls retried after a transient error',
+    ('provider', 'operation')
+)
+LLM_ERRORS = _metric(
+    'Counter', 'llm_errors_total', 'Failed LLM API calls by exception type',
+    ('provider', 'operation', 'error')
+)
+LLM_TOKENS = _metric(
+    'Counter', 'llm_tokens_total', 'Tokens reported by the LLM provider',
+    ('provider', 'operation', 'kind')
+)
+DB_LATENCY = _metric(
+    'Histogram', 'db_query_duration_seconds', 'Database service call latency by method',
+    ('backend', 'method'), buckets=DB_BUCKETS
+)
+DB_ERRORS = _metric(
+    'Counter', 'db_query_errors_total', 'Database service calls that raised',
+    ('backend', 'method')
+)
+CACHE_REQUESTS = _metric(
+    'Counter', 'db_cache_requests_total', 'Read-through cache lookups by result',
+    ('method', 'result')
+)
+
+# =====================================================
+# Flask Integration
+# =====================================================
+
+def init_metrics(app) -> None:
+    """Time app's requests and expose /metrics according to its METRICS_* config"""
+    app.config.setdefault('METRICS_ENABLED', True)
+    app.config.setdefault('METRICS_TOKEN', None)
+    app.config.setdefault('METRICS_REQUIRE_TOKEN', False)
+    if not app.config['METRICS_ENABLED']:
+        return
+    app.before_request(_start_timer)
+    app.after_request(_record_request)
+    if app.config['METRICS_REQUIRE_TOKEN'] and not app.config['METRICS_TOKEN']:
+        # Latencies, LLM error rates and token volumes aren't for the public
+        logger.warning("METRICS_TOKEN is not set; /metrics is disabled")
+        return
+    app.add_url_rule('/metrics', 'metrics', metrics_view)
+
+def _start_timer() -> None:
+    g.metrics_start = time.perf_counter()
+
+def _record_request(response):
+    start = g.pop('metrics_start', None)
+    if start is not None and request.endpoint != 'metrics':
+        # The rule template, not the path, keeps label cardinality bounded
+        route = request.url_rule.rule if request.url_rule else 'unmatched'
+        REQUEST_LATENCY.labels(request.method, route, str(response.status_code)).observe(
+            time.perf_counter() - start
+        )
+    return response
+
+def metrics_view():
+    """Prometheus exposition of this process (or all workers in multiprocess mode)"""
+    token = current_app.config['METRICS_TOKEN']
+    if token and not hmac.compare_digest(request.headers.get('Authorization', '').encode(),
+                                         f'Bearer {token}'.encode()):
+        return Response('Unauthorized\n', status=401, mimetype='text/plain')
+    if prometheus_client is None:
+        return Response('prometheus_client is not installed\n', status=501, mimetype='text/plain')
+
+    registry = prometheus_client.REGISTRY
+    if os.getenv('PROMETHEUS_MULTIPROC_DIR'):
+        from prometheus_client import multiprocess
+        registry = prometheus_client.CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    return Response(prometheus_client.generate_latest(registry),
+                    content_type=prometheus_client.CONTENT_TYPE_LATEST)
+
+# =====================================================
+# LLM Calls
+# =====================================================
+
+@contextmanager
+def observe_llm_call(provider: str, operation: str):
+    """Time one LLM API call, counting it as an error if the block raises.
+
+    Yields a dict whose 'seconds' holds the latency once the block completes.
+    """
+    timing = {}
+    start = time.perf_counter()
+    try:
+        yield timing
+    except Exception as e:
+        LLM_LATENCY.labels(provider, operation, 'error').observe(time.perf_counter() - start)
+        LLM_ERRORS.labels(provider, operation, type(e).__name__).inc()
+        raise
+    timing['seconds'] = time.perf_counter() - start
+    LLM_LATENCY.labels(provider, operation, 'ok').observe(timing['seconds'])
+
+def record_llm_retry(provider: str, operation: str) -> None:
+    LLM_RETRIES.labels(provider, operation).inc()
+
+def record_llm_tokens(provider: str, operation: str, prompt_tokens, completion_tokens) -> None:
+    """Count the tokens a provider reported for one call (None when it didn't say)"""
+    if prompt_tokens:
+        LLM_TOKENS.labels(provider, operation, 'prompt').inc(prompt_tokens)
+    if completion_tokens:
+        LLM_TOKENS.labels(provider, operation, 'completion').inc(completion_tokens)
+
+# =====================================================
+# Database Calls
+# =====================================================
+
+# Attributes that aren't queries and are returned untouched
+_UNTIMED = {'transaction', 'pool', 'client'}
+
+class InstrumentedDatabaseService:
+    """Times each public method of a database service.
+
+    Sits directly on the backend (under any CachedDatabaseService), so only
+    calls that reach the database are measured. Generator methods such as
+    iter_sprint_rows record one sample per batch fetched, so time the consumer
+    spends between batches (e.g. a streaming export) isn't counted.
+    """
+
+    def __init__(self, db, backend: str):
+        self.db = db
+        self.backend = backend
+
+    def __getattr__(self, name):
+        attr = getattr(self.db, name)
+        if name.startswith('_') or name in _UNTIMED or not callable(attr):
+            return attr
+        if inspect.isgeneratorfunction(attr):
+            wrapped = self._timed_generator(name, attr)
+        else:
+            wrapped = self._timed(name, attr)
+        # Later lookups find the wrapper directly and skip __getattr__
+        setattr(self, name, wrapped)
+        return wrapped
+
+    def _timed(self, name: str, method):
+        latency = DB_LATENCY.labels(self.backend, name)
+        errors = DB_ERRORS.labels(self.backend, name)
+
+        def call(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return method(*args, **kwargs)
+            except Exception:
+                errors.inc()
+                raise
+            finally:
+                latency.observe(time.perf_counter() - start)
+        return call
+
+    def _timed_generator(self, name: str, method):
+        latency = DB_LATENCY.labels(self.backend, name)
+        errors = DB_ERRORS.labels(self.backend, name)
+
+        def call(*args, **kwargs):
+            batches = method(*args, **kwargs)
+            while True:
+                start = time.perf_counter()
+                try:
+                    batch = next(batches)
+                except StopIteration:
+                    return
+                except Exception:
+                    errors.inc()
+                    latency.observe(time.perf_counter() - start)
+                    raise
+                latency.observe(time.perf_counter() - start)
+                yield batch
+        return call
@@ -0,0 +1,220 @@
+"""On-demand profiling of single requests.
+
+Registered by create_app via init_profiling(app). An admin session profiles
+one request by sending "X-Profile: cpu" (or "cpu,memory"), or by adding
+?_profile=cpu to the URL. The request runs under cProfile, and with 'memory'
+also under tracemalloc, and the results are written to PROFILE_DIR. The
+response carries an X-Profile-ID header; download the artifacts from
+/api/admin/profiles/<id>/cpu (a pstats file for snakeviz, or ?format=text)
+and /api/admin/profiles/<id>/memory. Settings (see config.py):
+
+    PROFILING_ENABLED  register the hooks at all; off means no per-request cost
+    PROFILE_DIR        where artifacts are kept (shared by a host's workers)
+    PROFILE_KEEP       how many profiles to keep before the oldest are deleted
+
+Both profilers are process-wide, so a worker profiles one request at a time;
+a request asking while another is being profiled runs normally and gets
+"X-Profile-Skipped: busy". The profile ends with the after_request hooks, so
+for streamed responses (exports) it covers the time to the first byte. Under
+gevent, other greenlets running on the worker meanwhile show up in it too.
+"""
+import cProfile
+import io
+import logging
+import os
+import pstats
+import re
+import threading
+import time
+import tracemalloc
+import uuid
+from datetime import datetime
+from flask import current_app, g, request, session
+from app.json_provider import dumps, loads
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = 'X-Profile'
+PROFILE_PARAM = '_profile'
+
+# Artifact file suffix per kind; metadata lives next to them in <id>.json
+ARTIFACT_SUFFIXES = {'cpu': '.prof', 'memory': '.memory.txt'}
+
+_VALID_PROFILE_ID = re.compile(r'^[0-9]{8}T[0-9]{6}-[0-9a-f]{8}$')
+
+# Frames kept per allocation site in the memory report
+TRACEMALLOC_FRAMES = 10
+
+_lock = threading.Lock()
+
+def init_profiling(app) -> None:
+    """Profile admin-requested requests of app according to its PROFILE_* config"""
+    app.config.setdefault('PROFILING_ENABLED', False)
+    app.config.setdefault('PROFILE_DIR', '/tmp/retro_profiles')
+    app.config.setdefault('PROFILE_KEEP', 50)
+    if not app.config['PROFILING_ENABLED']:
+        return
+    app.before_request(_start_profile)
+    app.after_request(_finish_profile)
+    # If a later after_request hook raises, _finish_profile never runs; don't
+    # leave the profiler on and the lock held
+    app.teardown_request(_abort_profile)
+
+def _requested_kinds() -> list:
+    raw = request.headers.get(PROFILE_HEADER) or request.args.get(PROFILE_PARAM)
+    if not raw:
+        return []
+    kinds = {kind.strip().lower() for kind in raw.split(',')}
+    # Memory alone would tell you little about where the time went
+    return ['cpu'] + (['memory'] if 'memory' in kinds else [])
+
+def _start_profile() -> None:
+    kinds = _requested_kinds()
+    if not kinds or not session.get('is_admin'):
+        return
+    if not _lock.acquire(blocking=False):
+        g.profile_skipped = 'busy'
+        return
+    # Leave tracing alone if it was already on (PYTHONTRACEMALLOC)
+    owns_tracemalloc = 'memory' in kinds and not tracemalloc.is_tracing()
+    if owns_tracemalloc:
+        tracemalloc.start(TRACEMALLOC_FRAMES)
+    profiler = cProfile.Profile()
+    g.profile = {'kinds': kinds, 'profiler': profiler, 'start': time.perf_counter(),
+                 'owns_tracemalloc': owns_tracemalloc}
+    profiler.enable()
+
+def _stop(state: dict) -> dict:
+    """Stop the profilers and release the lock; returns what was captured"""
+    state['profiler'].disable()
+    captured = {'seconds': time.perf_counter() - state['start'], 'cpu': state['profiler']}
+    try:
+        if 'memory' in state['kinds']:
+            captured['memory'] = tracemalloc.take_snapshot()
+            captured['traced_bytes'], captured['peak_bytes'] = tracemalloc.get_traced_memory()
+        if state['owns_tracemalloc']:
+            tracemalloc.stop()
+    finally:
+        _lock.release()
+    return captured
+
+def _finish_profile(response):
+    if g.pop('profile_skipped', None):
+        response.headers['X-Profile-Skipped'] = 'busy'
+    state = g.pop('profile', None)
+    if state is None:
+        return response
+    captured = _stop(state)
+    try:
+        profile_id = _save(captured, response.status_code)
+    except OSError as e:
+        logger.warning("Failed to save request profile: %s", e)
+        return response
+    response.headers['X-Profile-ID'] = profile_id
+    logger.info("Saved request profile", extra={'profile_id': profile_id,
+                                                 'seconds': round(captured['seconds'], 3)})
+    return response
+
+def _abort_profile(exc=None) -> None:
+    state = g.pop('profile', None)
+    if state is not None:
+        _stop(state)
+
+# =====================================================
+# Artifacts
+# =====================================================
+
+def _profile_dir() -> str:
+    return current_app.config['PROFILE_DIR']
+
+def _save(captured: dict, status: int) -> str:
+    directory = _profile_dir()
+    os.makedirs(directory, exist_ok=True)
+    profile_id = f"{datetime.utcnow():%Y%m%dT%H%M%S}-{uuid.uuid4().hex[:8]}"
+    base = os.path.join(directory, profile_id)
+
+    captured['cpu'].dump_stats(base + ARTIFACT_SUFFIXES['cpu'])
+    kinds = ['cpu']
+    if 'memory' in captured:
+        with open(base + ARTIFACT_SUFFIXES['memory'], 'w') as f:
+            f.write(format_memory(captured['memory'], captured['traced_bytes'],
+                                  captured['peak_bytes']))
+        kinds.append('memory')
+
+    meta = {
+        'id': profile_id,
+        'method': request.method,
+        'path': request.path,
+        'route': request.url_rule.rule if request.url_rule else None,
+        'status': status,
+        'seconds': round(captured['seconds'], 4),
+        'kinds': kinds,
+        'request_id': g.get('request_id'),
+        'pid': os.getpid(),
+        'created_at': datetime.utcnow().isoformat() + 'Z',
+    }
+    # Written last: a profile is listed only once all its files exist
+    with open(base + '.json', 'w') as f:
+        f.write(dumps(meta))
+    _prune(directory, current_app.config['PROFILE_KEEP'])
+    return profile_id
+
+def _prune(directory: str, keep: int) -> None:
+    # Ids start with a UTC timestamp, so name order is age order
+    ids = sorted(name[:-len('.json')] for name in os.listdir(directory) if name.endswith('.json'))
+    for profile_id in ids[:-keep] if keep > 0 else []:
+        for suffix in ('.json', *ARTIFACT_SUFFIXES.values()):
+            try:
+                os.remove(os.path.join(directory, profile_id + suffix))
+            except FileNotFoundError:
+                pass
+
+def format_memory(snapshot, traced_bytes: int, peak_bytes: int, top: int = 30) -> str:
+    """Text report of the allocations made during the request that were still alive at its end"""
+    # The profiler's own bookkeeping isn't interesting
+    snapshot = snapshot.filter_traces([
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, cProfile.__file__),
+        tracemalloc.Filter(False, __file__),
+    ])
+    stats = snapshot.statistics('traceback')
+    lines = [
+        f"Traced at end: {traced_bytes / 1024:.1f} KiB, peak: {peak_bytes / 1024:.1f} KiB",
+        f"Top {min(top, len(stats))} of {len(stats)} allocation sites by size",
+        '',
+    ]
+    for stat in stats[:top]:
+        lines.append(f"{stat.size / 1024:.1f} KiB in {stat.count} blocks")
+        lines.extend(f"    {line}" for line in stat.traceback.format(most_recent_first=True))
+        lines.append('')
+    return '\n'.join(lines)
+
+def list_profiles() -> list:
+    """Metadata of the stored profiles, newest first"""
+    directory = _profile_dir()
+    if not os.path.isdir(directory):
+        return []
+    profiles = []
+    for name in sorted(os.listdir(directory), reverse=True):
+        if name.endswith('.json'):
+            try:
+                with open(os.path.join(directory, name)) as f:
+                    profiles.append(loads(f.read()))
+            except (OSError, ValueError):
+                # Pruned by another worker since listdir
+                continue
+    return profiles
+
+def artifact_path(profile_id: str, kind: str):
+    """Path of one stored artifact, or None if the id or kind is unknown"""
+    if not _VALID_PROFILE_ID.match(profile_id) or kind not in ARTIFACT_SUFFIXES:
+        return None
+    path = os.path.join(_profile_dir(), profile_id + ARTIFACT_SUFFIXES[kind])
+    return path if os.path.isfile(path) else None
+
+def format_cpu(path: str, sort: str = 'cumulative', top: int = 40) -> str:
+    """pstats text report of a stored CPU profile"""
+    out = io.StringIO()
+    stats = pstats.Stats(path, stream=out)
+    stats.strip_dirs().sort_stats(sort).print_stats(top)
+    return out.getvalue()
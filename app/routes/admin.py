@@ -1,11 +1,19 @@
-from flask import Blueprint, request, jsonify, session, render_template
-from app.services.database_service import DatabaseService
+from flask import Blueprint, Response, request, jsonify, session, render_template, send_file
+from app.services import registry
+from app.profiling import artifact_path, format_cpu, list_profiles
+from app.services.cache_service import cache_stats
+from app.routes.pagination import get_page_args, next_cursor
 from functools import wraps
+from datetime import datetime, timedelta
 import bcrypt
 import os
 
 admin_bp = Blueprint('admin', __name__, url_prefix='/api/admin')
-db = DatabaseService()
+db = registry.database
+
+# Same default as get_top_llm_usage_sprints and top_llm_usage_sprints()
+LLM_USAGE_DEFAULT_LIMIT = 20
+LLM_USAGE_MAX_LIMIT = 100
 
 def require_admin(f):
     """Decorator to require admin authentication"""
@@ -44,7 +52,54 @@ def dashboard():
     """Admin dashboard data - Get sprints created by current user"""
     user_id = session.get('user_id') or session.get('admin_name')
     if not user_id:
-         return jsonify({'sprints': []})
+         return jsonify({'sprints': [], 'next_cursor': None})
+
+    limit, cursor = get_page_args()
+    try:
+        sprints = db.get_sprints_by_creator(user_id, limit=limit, cursor=cursor)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    return jsonify({'sprints': sprints, 'next_cursor': next_cursor(sprints, limit)})
 
-    sprints = db.get_sprints_by_creator(user_id)
-    return jsonify({'sprints': sprints})
+@admin_bp.route('/llm-usage', methods=['GET'])
+@require_admin
+def get_llm_usage():
+    """Sprints with the highest LLM cost (top ?limit=, default 20), optionally over the last ?days=N"""
+    limit = request.args.get('limit', LLM_USAGE_DEFAULT_LIMIT, type=int)
+    limit = max(1, min(limit, LLM_USAGE_MAX_LIMIT))
+    days = request.args.get('days')
+    if days is not None:
+        try:
+            days = int(days)
+        except ValueError:
+            days = 0
+        if days <= 0:
+            return jsonify({'error': 'days must be a positive whole number'}), 400
+    since = datetime.utcnow() - timedelta(days=days) if days else None
+    return jsonify({'sprints': db.get_top_llm_usage_sprints(since=since, limit=limit)})
+
+@admin_bp.route('/cache-stats', methods=['GET'])
+@require_admin
+def get_cache_stats():
+    """Database cache hit ratios per cached method for this worker"""
+    return jsonify({'cache': cache_stats()})
+
+@admin_bp.route('/profiles', methods=['GET'])
+@require_admin
+def get_profiles():
+    """Request profiles captured with the X-Profile header, newest first"""
+    return jsonify({'profiles': list_profiles()})
+
+@admin_bp.route('/profiles/<profile_id>/<kind>', methods=['GET'])
+@require_admin
+def download_profile(profile_id, kind):
+    """Download a profile artifact: cpu (pstats file, or ?format=text) or memory (text)"""
+    path = artifact_path(profile_id, kind)
+    if path is None:
+        return jsonify({'error': 'Profile not found'}), 404
+    if kind == 'cpu' and request.args.get('format') == 'text':
+        sort = request.args.get('sort', 'cumulative')
+        if sort not in ('cumulative', 'tottime', 'calls'):
+            return jsonify({'error': 'Unknown sort. Use one of: cumulative, tottime, calls'}), 400
+        return Response(format_cpu(path, sort), mimetype='text/plain')
+    return send_file(path, as_attachment=True, download_name=path.rsplit('/', 1)[-1])
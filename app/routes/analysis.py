@@ -1,11 +1,14 @@
+import logging
 from flask import Blueprint, request, jsonify, render_template
-from app.services.analysis_service import AnalysisService
-from app.services.database_service import DatabaseService
+from app.services import registry
 from app.routes.admin import require_admin
+from app.routes.export import export_response
+from app.routes.conditional import make_etag, not_modified, with_etag
 
+logger = logging.getLogger(__name__)
 analysis_bp = Blueprint('analysis', __name__, url_prefix='/api')
-analysis_service = AnalysisService()
-db = DatabaseService()
+analysis_service = registry.analysis
+db = registry.database
 
 @analysis_bp.route('/sprint/<sprint_id>/analyze', methods=['POST'])
 @require_admin
@@ -17,8 +20,7 @@ def analyze_sprint(sprint_id):
         return jsonify({'error': 'Sprint not found'}), 404
     
     # Check if there are responses
-    responses = db.get_sprint_responses(sprint_id)
-    if len(responses) == 0:
+    if db.count_sprint_responses(sprint_id) == 0:
         return jsonify({'error': 'No responses to analyze'}), 400
     
     # Update status to analyzing
@@ -40,21 +42,38 @@ def analyze_sprint(sprint_id):
         })
     
     except Exception as e:
-        print(f"Analysis error: {e}")
+        logger.exception("Analysis failed", extra={'sprint_id': sprint_id})
         # Revert status
         db.update_sprint_status(sprint_id, 'collecting')
         return jsonify({'error': f'Analysis failed: {str(e)}'}), 500
 
+@analysis_bp.route('/sprint/<sprint_id>/llm-usage', methods=['GET'])
+@require_admin
+def get_llm_usage(sprint_id):
+    """LLM tokens and estimated cost spent on a sprint, per call type"""
+    if not db.get_sprint(sprint_id):
+        return jsonify({'error': 'Sprint not found'}), 404
+    return jsonify(db.get_sprint_llm_usage(sprint_id))
+
 @analysis_bp.route('/sprint/<sprint_id>/report', methods=['GET'])
 @require_admin
 def get_report(sprint_id):
     """Get analysis report for a sprint"""
+    # A report only changes when it is regenerated, so id + generated_at
+    # identify its version without loading the themes and recommendations
+    version = db.get_analysis_report_version(sprint_id)
+    if not version:
+        return jsonify({'error': 'Report not found. Run analysis first.'}), 404
+    unchanged = not_modified(make_etag('report', version['id'], version['generated_at']), 'report')
+    if unchanged:
+        return unchanged
+    
     report = db.get_analysis_report(sprint_id)
     
     if not report:
         return jsonify({'error': 'Report not found. Run analysis first.'}), 404
     
-    return jsonify(report)
+    return with_etag(jsonify(report), make_etag('report', report['id'], report['generated_at']), 'report')
 
 
 
@@ -71,6 +90,15 @@ def export_report(sprint_id):
     response.headers['Content-Disposition'] = f'attachment; filename=sprint_{sprint_id}_report.json'
     return response
 
+@analysis_bp.route('/sprint/<sprint_id>/export/<dataset>', methods=['GET'])
+@require_admin
+def export_sprint_data(sprint_id, dataset):
+    """Stream a sprint's responses, reports or action_items as NDJSON or CSV"""
+    if not db.get_sprint(sprint_id):
+        return jsonify({'error': 'Sprint not found'}), 404
+    
+    return export_response(db, dataset, [sprint_id], f'sprint_{sprint_id}')
+
 @analysis_bp.route('/sprint/<current_id>/compare/<previous_id>', methods=['POST'])
 @require_admin
 def compare_sprints(current_id, previous_id):
@@ -87,7 +115,7 @@ def compare_sprints(current_id, previous_id):
         })
     
     except Exception as e:
-        print(f"Comparison error: {e}")
+        logger.exception("Sprint comparison failed")
         return jsonify({'error': f'Comparison failed: {str(e)}'}), 500
 
 @analysis_bp.route('/action-items', methods=['POST'])
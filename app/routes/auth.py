@@ -1,8 +1,8 @@
 from flask import Blueprint, request, jsonify, session
-from app.services.database_service import DatabaseService
+from app.services import registry
 
 auth_bp = Blueprint('auth', __name__, url_prefix='/api/auth')
-db = DatabaseService()
+db = registry.database
 
 @auth_bp.route('/login', methods=['POST'])
 def login():
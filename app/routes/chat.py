@@ -1,14 +1,17 @@
+import logging
 from flask import Blueprint, request, jsonify, render_template, session
-from app.services.groq_service import GroqService
-from app.services.gemini_service import GeminiService
-from app.services.database_service import DatabaseService
+from app.services import registry
+from app.logging_config import log_payload
+from app.services.llm_usage import usage_context
+import re
 import uuid
 from datetime import datetime
 
+logger = logging.getLogger(__name__)
 chat_bp = Blueprint('chat', __name__)
-db = DatabaseService()
-chat_ai = GroqService()      # Fast chat with Groq
-summary_ai = GeminiService() # Summaries with Gemini
+db = registry.database
+chat_ai = registry.groq        # Fast chat with Groq
+summary_ai = registry.gemini   # Summaries with Gemini
 
 @chat_bp.route('/api/chat/start-session', methods=['POST'])
 def start_session():
@@ -21,8 +24,7 @@ def start_session():
     
     # Check membership
     user_email = session.get('email')
-    members = db.get_team_members(sprint_id)
-    member = next((m for m in members if m.get('email') == user_email), None)
+    member = db.get_team_member_by_email(sprint_id, user_email)
     
     if not member and session.get('role') != 'leader':
         return jsonify({'error': 'Not a member of this sprint'}), 403
@@ -113,104 +115,65 @@ def validate_chat_token(token):
 @chat_bp.route('/api/chat/validate-code/<code>', methods=['GET'])
 def validate_access_code(code):
     """Validate access code and return team member info with sprint context"""
-    # Get team member by access code
-    member = db.get_team_member_by_code(code)
+    # Validate code, get or create session, and load context in one database call.
+    # The new token is only used if the member has no session yet.
+    result = db.bootstrap_chat_session(code, str(uuid.uuid4()))
+    status = result.get('status')
     
-    if not member:
+    if status == 'invalid_code':
         return jsonify({'valid': False, 'error': 'Invalid access code'}), 404
     
-    # Check if already submitted
-    is_submitted = member.get('has_submitted', False)
-    # We now allow them to proceed but in read-only mode if submitted
-
-    
-    # Get sprint info (nested in the query result)
-    sprint = member.get('sprints')
-    if not sprint:
+    if status == 'sprint_not_found':
         return jsonify({'valid': False, 'error': 'Sprint not found'}), 404
     
-    if sprint.get('status') not in ['collecting', 'active']:
+    if status == 'not_accepting':
         return jsonify({
             'valid': False, 
             'error': 'This retrospective is no longer accepting responses'
         }), 403
     
-    # Check for existing active session
-    existing_session = db.get_active_session(sprint['id'], member['id'])
+    # Submitted members may proceed in read-only mode
+    member = result['member']
+    sprint = result['sprint']
+    session_token = result['session_token']
     
-    if existing_session:
-        session_token = existing_session['session_token']
-        history = existing_session.get('conversation_history', [])
-        
-        session['session_token'] = session_token
-        session['sprint_id'] = sprint['id']
-        session['member_id'] = member['id']
-        session['member_name'] = member['name']
-        session['member_role'] = member.get('role', 'Team Member')
-        
-        # Get sprint context for AI (needed for response structure)
-        sprint_context = db.get_sprint_with_context(sprint['id'])
-        
-        return jsonify({
-            'valid': True,
-            'member': {
-                'id': member['id'],
-                'name': member['name'],
-                'role': member.get('role', 'Team Member'),
-                'email': member.get('email'),
-                'has_submitted': is_submitted
-            },
-            'sprint': {
-                'id': sprint['id'],
-                'name': sprint.get('name'),
-                'start_date': sprint.get('start_date'),
-                'end_date': sprint.get('end_date'),
-                'goals': sprint_context.get('goals', []) if sprint_context else [],
-                'outcomes': sprint_context.get('outcomes') if sprint_context else None,
-                'project': sprint_context.get('project') if sprint_context else None
-            },
-            'session_token': session_token,
-            'history': history,
-            'restored': True,
-            'submitted': is_submitted
-        })
-
-    # Create new session for this chat
-    session_token = str(uuid.uuid4())
     session['session_token'] = session_token
     session['sprint_id'] = sprint['id']
     session['member_id'] = member['id']
     session['member_name'] = member['name']
     session['member_role'] = member.get('role', 'Team Member')
     
-    # Create session in database
-    db.create_session(sprint['id'], session_token, member_id=member['id'])
-    
-    # Get sprint context for AI
-    sprint_context = db.get_sprint_with_context(sprint['id'])
-    
     return jsonify({
         'valid': True,
-        'member': {
-            'id': member['id'],
-            'name': member['name'],
-            'role': member.get('role', 'Team Member'),
-            'email': member.get('email'),
-            'has_submitted': is_submitted
-        },
-        'sprint': {
-            'id': sprint['id'],
-            'name': sprint.get('name'),
-            'start_date': sprint.get('start_date'),
-            'end_date': sprint.get('end_date'),
-            'goals': sprint_context.get('goals', []) if sprint_context else [],
-            'outcomes': sprint_context.get('outcomes') if sprint_context else None,
-            'project': sprint_context.get('project') if sprint_context else None
-        },
+        'member': member,
+        'sprint': sprint,
         'session_token': session_token,
-        'submitted': is_submitted
+        'history': result.get('history', []),
+        'restored': result.get('restored', False),
+        'submitted': result.get('submitted', False)
     })
 
+# Progress marker the interviewer appends to each question, e.g. [Q:3/8]
+QUESTION_MARKER = re.compile(r'\s*\[Q:(\d)/8\]')
+
+def parse_interview_markers(ai_response: str) -> tuple:
+    """Strip the interviewer's markers from a reply.
+    
+    Returns (clean_response, question_number, interview_complete, ready_to_submit);
+    question_number is 0 when the reply has no [Q:N/8] marker.
+    """
+    question_match = QUESTION_MARKER.search(ai_response)
+    question_number = int(question_match.group(1)) if question_match else 0
+    
+    interview_complete = '[INTERVIEW_COMPLETE]' in ai_response
+    # Also accept the old ready_to_submit signal (backward compat)
+    ready_to_submit = '[READY_TO_SUBMIT]' in ai_response or interview_complete
+    
+    clean_response = QUESTION_MARKER.sub('', ai_response) if question_match else ai_response
+    clean_response = clean_response.replace('[INTERVIEW_COMPLETE]', '').strip()
+    clean_response = clean_response.replace('[READY_TO_SUBMIT]', '').strip()
+    return clean_response, question_number, interview_complete, ready_to_submit
+
 @chat_bp.route('/api/chat/message', methods=['POST'])
 def send_message():
     """Process user message and return AI response"""
@@ -247,30 +210,17 @@ def send_message():
             context = db.get_sprint_with_context(sprint_id)
         
         # Get AI response with role awareness
-        ai_response = chat_ai.conduct_interview(
-            history, 
-            user_message,
-            member_name=member_name,
-            member_role=member_role,
-            sprint_context=context
-        )
-        
-        # Parse question number from response [Q:N/8]
-        import re
-        question_match = re.search(r'\[Q:(\d)/8\]', ai_response)
-        question_number = int(question_match.group(1)) if question_match else 0
+        with usage_context(sprint_id, session_token):
+            ai_response = chat_ai.conduct_interview(
+                history, 
+                user_message,
+                member_name=member_name,
+                member_role=member_role,
+                sprint_context=context
+            )
         
-        # Check for interview complete signal
-        interview_complete = '[INTERVIEW_COMPLETE]' in ai_response
-        
-        # Also check for old ready_to_submit signal (backward compat)
-        ready_to_submit = '[READY_TO_SUBMIT]' in ai_response or interview_complete
-        
-        # Clean the markers from the response shown to user
-        clean_response = ai_response
-        clean_response = re.sub(r'\s*\[Q:\d/8\]', '', clean_response)
-        clean_response = clean_response.replace('[INTERVIEW_COMPLETE]', '').strip()
-        clean_response = clean_response.replace('[READY_TO_SUBMIT]', '').strip()
+        clean_response, question_number, interview_complete, ready_to_submit = \
+            parse_interview_markers(ai_response)
         
         # Add AI response to history (with cleaned response)
         history.append({
@@ -293,7 +243,7 @@ def send_message():
         })
     
     except Exception as e:
-        print(f"Error in chat: {e}")
+        logger.exception("Chat turn failed")
         return jsonify({'error': 'Failed to get AI response'}), 500
 
 @chat_bp.route('/api/response/submit', methods=['POST'])
@@ -319,11 +269,12 @@ def submit_response():
     
     # Generate structured summary
     member_role = session.get('member_role', 'Team Member')
-    summary_data = summary_ai.generate_conversation_summary(
-        conversation_history=conversation,
-        member_name=user_name,
-        member_role=member_role
-    )
+    with usage_context(sprint_id, session_token):
+        summary_data = summary_ai.generate_conversation_summary(
+            conversation_history=conversation,
+            member_name=user_name,
+            member_role=member_role
+        )
     
     # Save response with summary
     try:
@@ -352,7 +303,7 @@ def submit_response():
         })
     
     except Exception as e:
-        print(f"Error submitting response: {e}")
+        logger.exception("Response submission failed", extra={'sprint_id': sprint_id})
         return jsonify({'error': 'Failed to submit response'}), 500
 
 @chat_bp.route('/api/chat/<session_token>/history', methods=['GET'])
@@ -367,8 +318,8 @@ def get_current_session():
     session_token = session.get('session_token')
     sprint_id = session.get('sprint_id')
     
-    print(f"DEBUG: get_current_session - Token: {session_token}, Sprint: {sprint_id}")
-    print(f"DEBUG: Session keys: {list(session.keys())}")
+    logger.debug("Current session lookup", extra={'sprint_id': sprint_id, 'has_token': bool(session_token)})
+    log_payload(logger, "Session keys", sorted(session.keys()))
 
     if not session_token or not sprint_id:
         return jsonify({'active': False}), 200
@@ -379,13 +330,14 @@ def get_current_session():
     # Get sprint context
     sprint_context = db.get_sprint_with_context(sprint_id)
     if not sprint_context:
-        print("DEBUG: Sprint context not found")
+        logger.debug("Sprint context not found", extra={'sprint_id': sprint_id})
         return jsonify({'active': False}), 200
         
-    # Get member details
+    # Get member details, ignoring a member row from another sprint
     member_id = session.get('member_id')
-    members = db.get_team_members(sprint_id)
-    member = next((m for m in members if m.get('id') == member_id), None)
+    member = db.get_team_member_by_id(member_id) if member_id else None
+    if member and member.get('sprint_id') != sprint_id:
+        member = None
     
     # Fallback to session data if member not found (shouldn't happen)
     if not member:
@@ -0,0 +1,32 @@
+import hashlib
+from flask import Response, request
+from app.compression import ETAG_SUFFIXES
+
+# Cache-Control per endpoint. Admin data is private; sprint pages change while
+# responses come in, so they always revalidate. Reports only change on re-analysis.
+CACHE_POLICIES = {
+    'sprint': 'private, no-cache',
+    'sprint_details': 'private, no-cache',
+    'report': 'private, max-age=15, must-revalidate',
+}
+
+def make_etag(*parts) -> str:
+    """Strong ETag value from the parts that identify a representation's version"""
+    return hashlib.sha1('|'.join(str(p) for p in parts).encode('utf-8')).hexdigest()[:24]
+
+def not_modified(etag: str, policy: str):
+    """A 304 response if the client already has etag, otherwise None.
+
+    Compressed responses carry an encoding suffix on their ETag, so those
+    variants match too and the 304 echoes the one the client holds.
+    """
+    for candidate in [etag] + [etag + suffix for suffix in ETAG_SUFFIXES.values()]:
+        if candidate in request.if_none_match:
+            return with_etag(Response(status=304), candidate, policy)
+    return None
+
+def with_etag(response, etag: str, policy: str):
+    """Attach a strong ETag and the endpoint's Cache-Control policy to response"""
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = CACHE_POLICIES[policy]
+    return response
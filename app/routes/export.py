@@ -0,0 +1,23 @@
+from flask import Response, request, jsonify, stream_with_context
+from app.services.export_service import EXPORT_DATASETS, EXPORT_FORMATS, iter_export
+
+def export_response(db, dataset: str, sprint_ids, filename: str):
+    """Streaming download of dataset rows for sprint_ids, in the ?format= requested.
+
+    Returns a 400 JSON error for an unknown dataset or format. Rows are fetched
+    and written batch by batch, so the download starts immediately.
+    """
+    fmt = request.args.get('format', 'ndjson').lower()
+    if dataset not in EXPORT_DATASETS:
+        return jsonify({'error': f"Unknown dataset. Use one of: {', '.join(EXPORT_DATASETS)}"}), 400
+    if fmt not in EXPORT_FORMATS:
+        return jsonify({'error': f"Unknown format. Use one of: {', '.join(EXPORT_FORMATS)}"}), 400
+
+    response = Response(
+        stream_with_context(iter_export(db, dataset, fmt, sprint_ids)),
+        mimetype=EXPORT_FORMATS[fmt]
+    )
+    response.headers['Content-Disposition'] = f'attachment; filename={filename}_{dataset}.{fmt}'
+    # Stop reverse proxies from buffering the whole export before sending it on
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
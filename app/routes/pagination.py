@@ -0,0 +1,28 @@
+from flask import request
+from app.services.database_service import DatabaseService
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 100
+
+def get_page_args():
+    """Read keyset pagination args (limit, cursor) from the query string.
+    
+    Paging is opt-in: without ?limit or ?cursor the limit is None and the
+    whole list is returned, which is what the frontend pages expect.
+    """
+    cursor = request.args.get('cursor') or None
+    raw_limit = request.args.get('limit')
+    if raw_limit is None and cursor is None:
+        return None, None
+    try:
+        limit = int(raw_limit) if raw_limit is not None else DEFAULT_PAGE_SIZE
+    except ValueError:
+        limit = DEFAULT_PAGE_SIZE
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    return limit, cursor
+
+def next_cursor(items, limit):
+    """Cursor for the following page, or None if unpaged or this page was the last"""
+    if limit is None or len(items) < limit:
+        return None
+    return DatabaseService.encode_cursor(items[-1])
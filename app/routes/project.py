@@ -1,10 +1,13 @@
 from flask import Blueprint, request, jsonify, session
-from app.services.database_service import DatabaseService
+from app.services import registry
 from app.routes.admin import require_admin
+from app.routes.pagination import get_page_args, next_cursor
+from app.routes.export import export_response
+from app.services.export_service import iter_project_sprint_ids
 import uuid
 
 project_bp = Blueprint('project', __name__, url_prefix='/api/project')
-db = DatabaseService()
+db = registry.database
 
 # Predefined roles for dropdown
 TEAM_ROLES = [
@@ -72,10 +75,14 @@ def list_projects():
     """List projects created by current user"""
     user_id = session.get('user_id')
     if not user_id:
-        return jsonify({'projects': []})
-        
-    projects = db.get_projects_by_creator(user_id)
-    return jsonify({'projects': projects})
+        return jsonify({'projects': [], 'next_cursor': None})
+    
+    limit, cursor = get_page_args()
+    try:
+        projects = db.get_projects_by_creator(user_id, limit=limit, cursor=cursor)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    return jsonify({'projects': projects, 'next_cursor': next_cursor(projects, limit)})
 
 @project_bp.route('/<project_id>', methods=['PUT'])
 @require_admin
@@ -121,8 +128,12 @@ def get_project_sprints(project_id):
     if project.get('created_by') != session.get('user_id'):
         return jsonify({'error': 'Unauthorized'}), 403
         
-    sprints = db.get_sprints_by_project(project_id)
-    return jsonify({'sprints': sprints})
+    limit, cursor = get_page_args()
+    try:
+        sprints = db.get_sprints_by_project(project_id, limit=limit, cursor=cursor)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    return jsonify({'sprints': sprints, 'next_cursor': next_cursor(sprints, limit)})
 
 
 
@@ -140,3 +151,17 @@ def get_project_team(project_id):
         
     members = db.get_project_team_members(project_id)
     return jsonify({'members': members})
+
+@project_bp.route('/<project_id>/export/<dataset>', methods=['GET'])
+@require_admin
+def export_project_data(project_id, dataset):
+    """Stream responses, reports or action_items across all of a project's sprints"""
+    project = db.get_project(project_id)
+    if not project:
+        return jsonify({'error': 'Project not found'}), 404
+    
+    if project.get('created_by') != session.get('user_id'):
+        return jsonify({'error': 'Unauthorized'}), 403
+    
+    return export_response(db, dataset, iter_project_sprint_ids(db, project_id),
+                           f'project_{project_id}')
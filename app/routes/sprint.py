@@ -1,10 +1,13 @@
 from flask import Blueprint, request, jsonify, render_template, session
-from app.services.database_service import DatabaseService
+from app.services import registry
+from app.services.database_service import generate_access_code
 from app.routes.admin import require_admin
+from app.routes.pagination import get_page_args, next_cursor
+from app.routes.conditional import make_etag, not_modified, with_etag
 import uuid
 
 sprint_bp = Blueprint('sprint', __name__, url_prefix='/api/sprint')
-db = DatabaseService()
+db = registry.database
 
 @sprint_bp.route('/my-sprints', methods=['GET'])
 def get_my_sprints():
@@ -14,11 +17,14 @@ def get_my_sprints():
     if not email:
         return jsonify({'error': 'Unauthorized'}), 401
     
-    sprints = db.get_member_sprints(email)
+    limit, cursor = get_page_args()
+    try:
+        # Each sprint carries has_submitted, has_active_session and last_activity_at
+        sprints = db.get_member_dashboard(email, limit=limit, cursor=cursor)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     
-    # Enrich with status info (e.g., has user submitted?)
-    # For now just return sprints
-    return jsonify({'sprints': sprints})
+    return jsonify({'sprints': sprints, 'next_cursor': next_cursor(sprints, limit)})
 
 @sprint_bp.route('/create', methods=['POST'])
 @require_admin
@@ -41,34 +47,36 @@ def create_sprint():
         'project_id': data.get('project_id')  # Optional project association
     }
     
-    # Create sprint
-    sprint = db.create_sprint(sprint_data)
-    
-    # Add team members with enhanced details (name, role, email, access_code)
-    team_members = data.get('team_members', [])
-    created_members = []
-    for member in team_members:
-        if member.get('email'):
-            # Use enhanced method with email and auto-generated code
-            created = db.add_team_member_with_details(
-                sprint_id, 
-                member.get('name'), 
-                member.get('role', 'Developer'),
-                member.get('email')
-            )
-        else:
-            # Fallback to basic method
-            created = db.add_team_member(sprint_id, member.get('name'), member.get('role'))
-        if created:
-            created_members.append(created)
-    
-    # Add sprint goals if provided
-    goals = data.get('goals', [])
-    for idx, goal in enumerate(goals):
-        if isinstance(goal, str) and goal.strip():
-            db.add_sprint_goal(sprint_id, goal.strip(), idx)
-        elif isinstance(goal, dict) and goal.get('text'):
-            db.add_sprint_goal(sprint_id, goal['text'].strip(), idx)
+    # Create sprint, members and goals together (atomic on the Postgres backend)
+    with db.transaction():
+        # Create sprint
+        sprint = db.create_sprint(sprint_data)
+        
+        # Add team members with enhanced details (name, role, email, access_code)
+        team_members = data.get('team_members', [])
+        created_members = []
+        for member in team_members:
+            if member.get('email'):
+                # Use enhanced method with email and auto-generated code
+                created = db.add_team_member_with_details(
+                    sprint_id, 
+                    member.get('name'), 
+                    member.get('role', 'Developer'),
+                    member.get('email')
+                )
+            else:
+                # Fallback to basic method
+                created = db.add_team_member(sprint_id, member.get('name'), member.get('role'))
+            if created:
+                created_members.append(created)
+        
+        # Add sprint goals if provided
+        goals = data.get('goals', [])
+        for idx, goal in enumerate(goals):
+            if isinstance(goal, str) and goal.strip():
+                db.add_sprint_goal(sprint_id, goal.strip(), idx)
+            elif isinstance(goal, dict) and goal.get('text'):
+                db.add_sprint_goal(sprint_id, goal['text'].strip(), idx)
     
     # Generate share URL
     share_url = f"{request.url_root}chat/{share_token}"
@@ -85,6 +93,15 @@ def create_sprint():
 @require_admin
 def get_sprint(sprint_id):
     """Get sprint details with goals and outcomes"""
+    # row_version changes whenever anything in this payload does, so a matching
+    # If-None-Match is answered without loading the sprint
+    version = db.get_sprint_version(sprint_id)
+    if version is None:
+        return jsonify({'error': 'Sprint not found'}), 404
+    unchanged = not_modified(make_etag('sprint', sprint_id, version), 'sprint')
+    if unchanged:
+        return unchanged
+    
     sprint = db.get_sprint_with_context(sprint_id)
     if not sprint:
         return jsonify({'error': 'Sprint not found'}), 404
@@ -92,26 +109,34 @@ def get_sprint(sprint_id):
     # Also get team members
     sprint['team_members'] = db.get_team_members(sprint_id)
     
-    return jsonify(sprint)
+    # Tag with the version of the data actually sent (it may come from cache)
+    return with_etag(jsonify(sprint), make_etag('sprint', sprint_id, sprint.get('row_version')), 'sprint')
 
 @sprint_bp.route('/<sprint_id>/status', methods=['GET'])
 @require_admin
 def sprint_status(sprint_id):
     """Get real-time submission status"""
-    members = db.get_team_members(sprint_id)
-    responses = db.get_sprint_responses(sprint_id)
+    # Counters are maintained by database triggers, so polling stays O(1)
+    counts = db.get_sprint_submission_counts(sprint_id)
+    if not counts:
+        return jsonify({'error': 'Sprint not found'}), 404
     
-    total = len(members)
-    submitted = sum(1 for m in members if m.get('has_submitted', False))
+    total = counts.get('team_size') or 0
+    submitted = counts.get('submitted_count') or 0
     
-    return jsonify({
+    result = {
         'total': total,
         'submitted': submitted,
         'pending': total - submitted,
         'percentage': round((submitted / total * 100), 1) if total > 0 else 0,
-        'members': members,
-        'response_count': len(responses)
-    })
+        'response_count': counts.get('response_count') or 0
+    }
+    
+    # The full roster is only loaded when explicitly requested
+    if request.args.get('include_members') in ('1', 'true'):
+        result['members'] = db.get_team_members(sprint_id)
+    
+    return jsonify(result)
 
 @sprint_bp.route('/<sprint_id>/close', methods=['PATCH'])
 @require_admin
@@ -126,10 +151,14 @@ def list_sprints():
     """List sprints created by current user"""
     user_id = session.get('user_id') or session.get('admin_name')
     if not user_id:
-        return jsonify({'sprints': []})
-        
-    sprints = db.get_sprints_by_creator(user_id)
-    return jsonify({'sprints': sprints})
+        return jsonify({'sprints': [], 'next_cursor': None})
+    
+    limit, cursor = get_page_args()
+    try:
+        sprints = db.get_sprints_by_creator(user_id, limit=limit, cursor=cursor)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    return jsonify({'sprints': sprints, 'next_cursor': next_cursor(sprints, limit)})
 
 # =====================================================
 # Sprint Goals Endpoints
@@ -231,21 +260,14 @@ def add_team_member(sprint_id):
 @require_admin
 def generate_invite_codes(sprint_id):
     """Generate access codes for team members who don't have them"""
-    import secrets
-    
     members = db.get_team_members(sprint_id)
     updated_members = []
     
     for member in members:
         if not member.get('access_code'):
-            # Generate new code
-            chars = 'ABCDEFGHJKLMNPQRSTUVWXYZ23456789'
-            code = ''.join(secrets.choice(chars) for _ in range(8))
-            
-            # Update member with code
-            db.client.table('team_members').update({
-                'access_code': code
-            }).eq('id', member['id']).execute()
+            # Generate new code and update member with it
+            code = generate_access_code()
+            db.set_team_member_access_code(member['id'], code)
             
             member['access_code'] = code
         
@@ -260,6 +282,13 @@ def generate_invite_codes(sprint_id):
 @require_admin
 def get_sprint_details(sprint_id):
     """Get complete sprint details with team members for detail page"""
+    version = db.get_sprint_version(sprint_id)
+    if version is None:
+        return jsonify({'error': 'Sprint not found'}), 404
+    unchanged = not_modified(make_etag('sprint_details', sprint_id, version), 'sprint_details')
+    if unchanged:
+        return unchanged
+    
     sprint = db.get_sprint_with_context(sprint_id)
     if not sprint:
         return jsonify({'error': 'Sprint not found'}), 404
@@ -276,7 +305,7 @@ def get_sprint_details(sprint_id):
     total = len(members)
     submitted = sum(1 for m in members if m.get('has_submitted', False))
     
-    return jsonify({
+    response = jsonify({
         'sprint': {
             'id': sprint['id'],
             'name': sprint.get('name'),
@@ -296,6 +325,8 @@ def get_sprint_details(sprint_id):
             'percentage': round((submitted / total * 100), 1) if total > 0 else 0
         }
     })
+    return with_etag(response, make_etag('sprint_details', sprint_id, sprint.get('row_version')),
+                     'sprint_details')
 
 @sprint_bp.route('/<sprint_id>/invite-links', methods=['GET'])
 @require_admin
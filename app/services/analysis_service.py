@@ -1,46 +1,67 @@
+import logging
 from time import time
 from typing import List, Dict
-from app.services.gemini_service import GeminiService
-from app.services.database_service import DatabaseService
+from app.services import registry
+from app.services.gemini_service import SENTIMENT_TEXT_CHARS
+from app.services.llm_usage import usage_context
+
+# Only the columns the analysis reads; skips session tokens and other metadata.
+# conversation, the largest column, is fetched only for responses without a
+# summary_data; sentiment is scored from user text computed by the database.
+ANALYSIS_COLUMNS = 'id, user_name, summary_data'
+ANALYSIS_BATCH_SIZE = 50
+
+logger = logging.getLogger(__name__)
 
 class AnalysisService:
     """Service for analyzing sprint retrospective responses"""
     
     def __init__(self):
-        self.ai = GeminiService()
-        self.db = DatabaseService()
+        self.ai = registry.gemini
+        self.db = registry.database
     
     def analyze_sprint(self, sprint_id: str) -> Dict:
         """
         Main analysis orchestrator.
         Uses Map-Reduce pattern for scalability.
         """
+        # Every Gemini call below is charged to this sprint in the usage ledger
+        with usage_context(sprint_id):
+            return self._analyze_sprint(sprint_id)
+    
+    def _analyze_sprint(self, sprint_id: str) -> Dict:
         start_time = time()
         
-        # Step 1: Get all responses
-        responses = self.db.get_sprint_responses(sprint_id)
-        
-        if len(responses) == 0:
+        # Step 1: Stream responses in batches, formatting each for the theme
+        # prompt and scoring its sentiment, so only one batch is held at a time
+        formatted_parts = []
+        sentiment_counts = None
+        response_count = 0
+        
+        for batch in self.db.iter_sprint_responses(sprint_id, columns=ANALYSIS_COLUMNS,
+                                                   batch_size=ANALYSIS_BATCH_SIZE):
+            self._add_missing_conversations(batch)
+            self._add_user_texts(batch)
+            for resp in batch:
+                response_count += 1
+                formatted_parts.append(self.ai._format_response_for_analysis(response_count, resp))
+            sentiment_counts = self.ai._count_sentiment(batch, sentiment_counts)
+        
+        if response_count == 0:
             return {'error': 'No responses to analyze'}
         
-        print(f"Analyzing {len(responses)} responses...")
+        logger.info("Analyzing responses", extra={'sprint_id': sprint_id, 'responses': response_count})
         
-        # Step 2: Extract themes directly from responses
-        themes_data = self.ai._extract_themes(responses)
+        # Step 2: Extract themes from the formatted responses
+        themes_data = self.ai._extract_themes_from_text(''.join(formatted_parts), response_count)
         themes = themes_data.get('themes', [])
         
-        print(f"Found {len(themes)} themes")
-        
         # Step 3: Generate recommendations based on themes
         recommendations_data = self.ai._generate_recommendations(themes)
         recommendations = recommendations_data.get('recommendations', [])
         
-        print(f"Generated {len(recommendations)} recommendation groups")
-        
-        # Step 4: Analyze sentiment
-        sentiment = self.ai._analyze_sentiment(responses)
-        
-        print(f"Overall mood: {sentiment.get('overall_mood')}")
+        # Step 4: Summarize sentiment scored during streaming
+        sentiment = self.ai._summarize_sentiment(sentiment_counts)
         
         # Step 5: Save report
         duration = int(time() - start_time)
@@ -57,10 +78,29 @@ class AnalysisService:
         # Update sprint status
         self.db.update_sprint_status(sprint_id, 'analyzed')
         
-        print(f"Analysis complete in {duration} seconds")
+        logger.info("Analysis complete", extra={
+            'sprint_id': sprint_id, 'themes': len(themes), 'recommendations': len(recommendations),
+            'overall_mood': sentiment.get('overall_mood'), 'duration_seconds': duration
+        })
         
         return report
     
+    def _add_missing_conversations(self, batch: List[Dict]) -> None:
+        """Fill in conversation for the responses of batch that have no summary_data"""
+        missing = [resp['id'] for resp in batch if not isinstance(resp.get('summary_data'), dict)]
+        if not missing:
+            return
+        conversations = self.db.get_response_conversations(missing)
+        for resp in batch:
+            if resp['id'] in conversations:
+                resp['conversation'] = conversations[resp['id']]
+    
+    def _add_user_texts(self, batch: List[Dict]) -> None:
+        """Set user_text, the start of the member's own messages that sentiment scoring reads"""
+        texts = self.db.get_response_user_texts([resp['id'] for resp in batch], SENTIMENT_TEXT_CHARS)
+        for resp in batch:
+            resp['user_text'] = texts.get(resp['id'], '')
+    
     def compare_sprints(self, current_sprint_id: str, previous_sprint_id: str) -> Dict:
         """Compare two sprint reports to identify trends"""
         
@@ -0,0 +1,434 @@
+from typing import Dict, List, Optional
+from collections import OrderedDict
+from contextlib import contextmanager
+import os
+import sqlite3
+import stat
+import tempfile
+import threading
+import time
+import uuid
+from app.json_provider import dumps, loads
+from app.metrics import CACHE_REQUESTS
+
+# Default time-to-live in seconds per cached entity type
+DEFAULT_TTLS = {
+    'sprint': 30,
+    'member': 60,
+    'project': 300,
+    'goals': 120,
+    'outcomes': 120,
+    'context': 30,
+}
+
+# Tag versions outlive any entry that could reference them
+TAG_TTL = 24 * 60 * 60
+
+# Seconds between sweeps of expired entries and tags
+PURGE_INTERVAL = 60
+
+# Hit/miss counts per cached method, shared by every wrapper in this process
+_stats = {}
+_stats_lock = threading.Lock()
+_backend = None
+_backend_lock = threading.Lock()
+
+# =====================================================
+# Cache Backends
+# =====================================================
+#
+# Values are stored as JSON (never pickle), so whoever can write the cache can
+# at worst poison cached data, not run code. Tag versions are random tokens
+# kept apart from the entries: they are never evicted to make room, and a
+# bumped tag can't come back to a value an older entry was stored with.
+
+def new_tag_version() -> str:
+    return uuid.uuid4().hex
+
+class InProcessCacheBackend:
+    """LRU cache held in this process's memory; not shared between workers"""
+
+    def __init__(self, max_entries: int = 10000):
+        self.max_entries = max_entries
+        self._data = OrderedDict()
+        # Not part of the LRU: evicting a tag would revive entries it invalidated
+        self._tags = {}
+        self._next_purge = time.time() + PURGE_INTERVAL
+        self._lock = threading.Lock()
+
+    def get(self, key: str):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            expires_at, blob = item
+            if expires_at < time.time():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+        return loads(blob)
+
+    def set(self, key: str, value, ttl: int) -> None:
+        blob = dumps(value)
+        with self._lock:
+            self._data[key] = (time.time() + ttl, blob)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def get_tag_versions(self, tags: List[str]) -> List[Optional[str]]:
+        now = time.time()
+        with self._lock:
+            items = [self._tags.get(tag) for tag in tags]
+        return [item[1] if item and item[0] >= now else None for item in items]
+
+    def bump_tag(self, tag: str, ttl: int) -> None:
+        now = time.time()
+        with self._lock:
+            self._tags[tag] = (now + ttl, new_tag_version())
+            if now >= self._next_purge:
+                self._tags = {t: item for t, item in self._tags.items() if item[0] >= now}
+                self._next_purge = now + PURGE_INTERVAL
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._tags.clear()
+
+class SharedCacheBackend:
+    """Cache in a local SQLite file so every worker on the host shares entries and invalidations"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        self._next_purge = 0.0
+        conn = self._conn()
+        conn.execute('CREATE TABLE IF NOT EXISTS cache '
+                     '(key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)')
+        conn.execute('CREATE TABLE IF NOT EXISTS cache_tags '
+                     '(tag TEXT PRIMARY KEY, version TEXT NOT NULL, expires_at REAL NOT NULL)')
+
+    def _conn(self) -> sqlite3.Connection:
+        # One connection per thread (and per forked process, since the pid changes)
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def _purge_expired(self, conn: sqlite3.Connection) -> None:
+        """Delete expired rows every PURGE_INTERVAL seconds so the file stops growing"""
+        now = time.time()
+        if now < self._next_purge:
+            return
+        self._next_purge = now + PURGE_INTERVAL
+        conn.execute('DELETE FROM cache WHERE expires_at < ?', (now,))
+        conn.execute('DELETE FROM cache_tags WHERE expires_at < ?', (now,))
+
+    def get(self, key: str):
+        row = self._conn().execute(
+            'SELECT value FROM cache WHERE key = ? AND expires_at >= ?', (key, time.time())
+        ).fetchone()
+        return loads(row[0]) if row else None
+
+    def set(self, key: str, value, ttl: int) -> None:
+        conn = self._conn()
+        conn.execute(
+            'INSERT OR REPLACE INTO cache (key, value, expires_at) VALUES (?, ?, ?)',
+            (key, dumps(value), time.time() + ttl)
+        )
+        self._purge_expired(conn)
+
+    def get_tag_versions(self, tags: List[str]) -> List[Optional[str]]:
+        rows = self._conn().execute(
+            f"SELECT tag, version FROM cache_tags WHERE tag IN ({', '.join('?' * len(tags))}) "
+            f"AND expires_at >= ?", (*tags, time.time())
+        ).fetchall()
+        versions = dict(rows)
+        return [versions.get(tag) for tag in tags]
+
+    def bump_tag(self, tag: str, ttl: int) -> None:
+        self._conn().execute(
+            'INSERT OR REPLACE INTO cache_tags (tag, version, expires_at) VALUES (?, ?, ?)',
+            (tag, new_tag_version(), time.time() + ttl)
+        )
+
+    def clear(self) -> None:
+        conn = self._conn()
+        conn.execute('DELETE FROM cache')
+        conn.execute('DELETE FROM cache_tags')
+
+def default_cache_path() -> str:
+    """SQLite file in a per-user 0700 directory under the temp dir.
+    
+    Refuses a directory another user owns or can write to, since whoever
+    controls the file controls what every worker is served.
+    """
+    directory = os.path.join(tempfile.gettempdir(), f'retro_cache-{os.getuid()}')
+    os.makedirs(directory, mode=0o700, exist_ok=True)
+    info = os.lstat(directory)
+    if (not stat.S_ISDIR(info.st_mode) or info.st_uid != os.getuid()
+            or info.st_mode & (stat.S_IRWXG | stat.S_IRWXO)):
+        raise RuntimeError(f"Cache directory {directory} is not private to this user; set CACHE_PATH")
+    return os.path.join(directory, 'cache.sqlite3')
+
+def get_cache_backend():
+    """Process-wide cache backend selected by CACHE_BACKEND ('none', 'memory' or 'shared').
+    
+    Shared by all database service instances so a write through one blueprint's
+    service invalidates entries read through another's.
+    """
+    global _backend
+    backend = os.getenv('CACHE_BACKEND', 'none').lower()
+    if backend == 'none':
+        return None
+    with _backend_lock:
+        if _backend is None:
+            if backend == 'memory':
+                _backend = InProcessCacheBackend(int(os.getenv('CACHE_MAX_ENTRIES', 10000)))
+            elif backend == 'shared':
+                _backend = SharedCacheBackend(os.getenv('CACHE_PATH') or default_cache_path())
+            else:
+                raise ValueError(f"Unknown CACHE_BACKEND: {backend}")
+        return _backend
+
+def _reset_after_fork():
+    """Give a forked worker its own backend (SQLite connections can't cross a fork)"""
+    global _backend, _backend_lock, _stats_lock
+    _backend = None
+    _backend_lock = threading.Lock()
+    _stats_lock = threading.Lock()
+    _stats.clear()
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+def get_cache_ttls() -> Dict:
+    """Per-entity TTLs, overridable with CACHE_TTL_<ENTITY> (e.g. CACHE_TTL_SPRINT=10)"""
+    ttls = dict(DEFAULT_TTLS)
+    for entity in ttls:
+        value = os.getenv(f'CACHE_TTL_{entity.upper()}')
+        if value:
+            ttls[entity] = int(value)
+    return ttls
+
+def cache_stats() -> Dict:
+    """Hits, misses and hit ratio per cached method in this process"""
+    with _stats_lock:
+        result = {}
+        for method, stats in _stats.items():
+            total = stats['hits'] + stats['misses']
+            result[method] = {
+                **stats,
+                'hit_ratio': round(stats['hits'] / total, 3) if total else 0.0
+            }
+        return result
+
+# =====================================================
+# Read-through Cache for Database Services
+# =====================================================
+
+class CachedDatabaseService:
+    """Read-through cache in front of a database service.
+
+    Rarely-changing point lookups are cached per entity with their own TTL.
+    Each entry is tagged with the entities it contains (e.g. 'sprint:<id>');
+    the wrapper's write methods bump those tags' versions, which invalidates
+    every entry built from them, after the commit when inside transaction().
+    Methods without caching rules pass through.
+    """
+
+    def __init__(self, db, backend, ttls: Dict = None):
+        self.db = db
+        self.cache = backend
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        # Tags written inside this thread's open transaction()
+        self._local = threading.local()
+
+    def __getattr__(self, name):
+        # Anything not cached or invalidated here goes straight to the database
+        return getattr(self.db, name)
+
+    # =====================================================
+    # Cache Helpers
+    # =====================================================
+
+    def _record(self, method: str, hit: bool) -> None:
+        CACHE_REQUESTS.labels(method, 'hit' if hit else 'miss').inc()
+        with _stats_lock:
+            stats = _stats.setdefault(method, {'hits': 0, 'misses': 0})
+            stats['hits' if hit else 'misses'] += 1
+
+    def _tag_versions(self, tags: List[str]) -> List[Optional[str]]:
+        return self.cache.get_tag_versions([f'tag:{tag}' for tag in tags])
+
+    def _cached(self, method: str, key: str, entity: str, load, tags_for):
+        """Return a fresh cached value for key, or load, tag and store it"""
+        cache_key = f'{method}:{key}'
+        entry = self.cache.get(cache_key)
+        if entry is not None:
+            tags, versions, value = entry
+            if self._tag_versions(tags) == versions:
+                self._record(method, hit=True)
+                return value
+
+        self._record(method, hit=False)
+        value = load()
+        # Misses aren't cached, so newly created rows show up immediately
+        if value:
+            tags = tags_for(value)
+            self.cache.set(cache_key, [tags, self._tag_versions(tags), value], self.ttls[entity])
+        return value
+
+    def invalidate(self, *tags: str) -> None:
+        """Invalidate every cached entry carrying any of these tags.
+        
+        Inside transaction() the tags are held until the outermost block ends;
+        bumping them before the commit would let a concurrent reader cache the
+        old row again under the new version.
+        """
+        pending = getattr(self._local, 'pending_tags', None)
+        if pending is not None:
+            pending.update(tags)
+            return
+        for tag in tags:
+            self.cache.bump_tag(f'tag:{tag}', TAG_TTL)
+
+    @contextmanager
+    def transaction(self):
+        """The database's transaction(), invalidating its writes' tags once it has ended"""
+        if getattr(self._local, 'pending_tags', None) is not None:
+            with self.db.transaction():
+                yield self
+            return
+        self._local.pending_tags = set()
+        try:
+            with self.db.transaction():
+                yield self
+        finally:
+            # Also after a rollback: a spurious invalidation only costs a miss
+            tags, self._local.pending_tags = self._local.pending_tags, None
+            self.invalidate(*tags)
+
+    # =====================================================
+    # Cached Reads
+    # =====================================================
+
+    def get_sprint(self, sprint_id: str) -> Optional[Dict]:
+        return self._cached('get_sprint', sprint_id, 'sprint',
+                            lambda: self.db.get_sprint(sprint_id),
+                            lambda s: [f'sprint:{sprint_id}'])
+
+    def get_sprint_by_token(self, token: str) -> Optional[Dict]:
+        return self._cached('get_sprint_by_token', token, 'sprint',
+                            lambda: self.db.get_sprint_by_token(token),
+                            lambda s: [f"sprint:{s['id']}"])
+
+    def get_team_member_by_code(self, access_code: str) -> Optional[Dict]:
+        return self._cached('get_team_member_by_code', access_code, 'member',
+                            lambda: self.db.get_team_member_by_code(access_code),
+                            lambda m: [f"member:{m['id']}", f"sprint:{m['sprint_id']}"])
+
+    def get_project(self, project_id: str) -> Optional[Dict]:
+        return self._cached('get_project', project_id, 'project',
+                            lambda: self.db.get_project(project_id),
+                            lambda p: [f'project:{project_id}'])
+
+    def get_sprint_goals(self, sprint_id: str) -> List[Dict]:
+        return self._cached('get_sprint_goals', sprint_id, 'goals',
+                            lambda: self.db.get_sprint_goals(sprint_id),
+                            lambda g: [f'goals:{sprint_id}'])
+
+    def get_sprint_outcomes(self, sprint_id: str) -> Optional[Dict]:
+        return self._cached('get_sprint_outcomes', sprint_id, 'outcomes',
+                            lambda: self.db.get_sprint_outcomes(sprint_id),
+                            lambda o: [f'outcomes:{sprint_id}'])
+
+    def get_sprint_with_context(self, sprint_id: str) -> Optional[Dict]:
+        def tags_for(sprint):
+            tags = [f'sprint:{sprint_id}', f'goals:{sprint_id}', f'outcomes:{sprint_id}']
+            if sprint.get('project_id'):
+                tags.append(f"project:{sprint['project_id']}")
+            return tags
+        return self._cached('get_sprint_with_context', sprint_id, 'context',
+                            lambda: self.db.get_sprint_with_context(sprint_id), tags_for)
+
+    # =====================================================
+    # Invalidating Writes
+    # =====================================================
+
+    def update_sprint_status(self, sprint_id: str, status: str) -> Dict:
+        result = self.db.update_sprint_status(sprint_id, status)
+        self.invalidate(f'sprint:{sprint_id}')
+        return result
+
+    def add_team_member(self, sprint_id: str, name: str, role: str = None) -> Dict:
+        # team_size on the sprint row changes via trigger
+        result = self.db.add_team_member(sprint_id, name, role)
+        self.invalidate(f'sprint:{sprint_id}')
+        return result
+
+    def add_team_member_with_details(self, sprint_id: str, name: str, role: str,
+                                     email: str = None, access_code: str = None) -> Dict:
+        result = self.db.add_team_member_with_details(sprint_id, name, role, email, access_code)
+        self.invalidate(f'sprint:{sprint_id}')
+        return result
+
+    def mark_member_submitted(self, sprint_id: str, user_name: str) -> None:
+        # Member entries are also tagged with their sprint
+        self.db.mark_member_submitted(sprint_id, user_name)
+        self.invalidate(f'sprint:{sprint_id}')
+
+    def mark_member_submitted_by_id(self, member_id: str) -> None:
+        self.db.mark_member_submitted_by_id(member_id)
+        member = self.db.get_team_member_by_id(member_id)
+        tags = [f'member:{member_id}']
+        if member and member.get('sprint_id'):
+            tags.append(f"sprint:{member['sprint_id']}")
+        self.invalidate(*tags)
+
+    def set_team_member_access_code(self, member_id: str, access_code: str) -> None:
+        self.db.set_team_member_access_code(member_id, access_code)
+        self.invalidate(f'member:{member_id}')
+
+    def update_team_member_invite_sent(self, member_id: str) -> None:
+        self.db.update_team_member_invite_sent(member_id)
+        self.invalidate(f'member:{member_id}')
+
+    def save_response(self, sprint_id: str, user_name: str, is_anonymous: bool,
+                      conversation: List[Dict], session_token: str, summary_data: Dict = None) -> str:
+        # response_count on the sprint row changes via trigger
+        result = self.db.save_response(sprint_id, user_name, is_anonymous,
+                                       conversation, session_token, summary_data)
+        self.invalidate(f'sprint:{sprint_id}')
+        return result
+
+    def update_project(self, project_id: str, updates: Dict) -> Dict:
+        result = self.db.update_project(project_id, updates)
+        self.invalidate(f'project:{project_id}')
+        return result
+
+    def migrate_project_ownership(self, old_identifier: str, new_user_id: str) -> int:
+        # Touches an unknown set of projects and sprints; rare enough to flush everything
+        result = self.db.migrate_project_ownership(old_identifier, new_user_id)
+        self.cache.clear()
+        return result
+
+    def add_sprint_goal(self, sprint_id: str, goal_text: str, display_order: int = 0) -> Dict:
+        result = self.db.add_sprint_goal(sprint_id, goal_text, display_order)
+        self.invalidate(f'goals:{sprint_id}')
+        return result
+
+    def delete_sprint_goals(self, sprint_id: str) -> None:
+        self.db.delete_sprint_goals(sprint_id)
+        self.invalidate(f'goals:{sprint_id}')
+
+    def save_sprint_outcomes(self, sprint_id: str, progress_summary: str,
+                             what_went_well: str, what_went_wrong: str) -> Dict:
+        result = self.db.save_sprint_outcomes(sprint_id, progress_summary,
+                                              what_went_well, what_went_wrong)
+        self.invalidate(f'outcomes:{sprint_id}')
+        return result
@@ -0,0 +1,232 @@
+"""Columnar (Parquet / Arrow IPC) export of retro data for offline analysis.
+
+Optional: needs pyarrow (pip install -r requirements-analytics.txt).
+Writes three files per export:
+
+    responses.<ext>  one row per response, summary_data flattened into columns
+    themes.<ext>     one row per theme in each sprint's analysis report
+    sentiment.<ext>  one row per analysis report with its sentiment breakdown
+"""
+import os
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List
+
+# summary_data fields written as list<string> / string columns
+SUMMARY_LIST_FIELDS = ['went_well', 'challenges', 'improvements', 'team_feedback', 'key_quotes']
+SUMMARY_TEXT_FIELDS = ['sentiment', 'summary']
+
+# conversation isn't read: its message counts come from get_response_message_counts
+RESPONSE_COLUMNS = 'id, sprint_id, team_member_id, user_name, is_anonymous, submitted_at, ' \
+                   'sentiment_score, summary_data'
+REPORT_COLUMNS = 'id, sprint_id, generated_at, analysis_duration_seconds, themes, sentiment_summary'
+
+COLUMNAR_FORMATS = {'parquet': 'parquet', 'arrow': 'arrow'}
+
+def _pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.ipc
+        import pyarrow.parquet
+    except ImportError as e:
+        raise ImportError(
+            "Columnar export needs pyarrow: pip install -r requirements-analytics.txt"
+        ) from e
+    return pyarrow
+
+def _schemas(pa) -> Dict:
+    strings = pa.list_(pa.string())
+    return {
+        'responses': pa.schema(
+            [
+                ('id', pa.string()),
+                ('sprint_id', pa.string()),
+                ('team_member_id', pa.string()),
+                ('user_name', pa.string()),
+                ('is_anonymous', pa.bool_()),
+                ('submitted_at', pa.timestamp('us')),
+                ('sentiment_score', pa.float64()),
+                ('message_count', pa.int32()),
+                ('user_message_count', pa.int32()),
+            ]
+            + [(f'summary_{field}', pa.string()) for field in SUMMARY_TEXT_FIELDS]
+            + [(f'summary_{field}', strings) for field in SUMMARY_LIST_FIELDS]
+        ),
+        'themes': pa.schema([
+            ('report_id', pa.string()),
+            ('sprint_id', pa.string()),
+            ('generated_at', pa.timestamp('us')),
+            ('position', pa.int16()),
+            ('name', pa.string()),
+            ('category', pa.string()),
+            ('severity', pa.string()),
+            ('frequency', pa.string()),
+            ('percentage', pa.float64()),
+            ('impact', pa.string()),
+            ('quotes', strings),
+            ('mentioned_by', strings),
+        ]),
+        'sentiment': pa.schema([
+            ('report_id', pa.string()),
+            ('sprint_id', pa.string()),
+            ('generated_at', pa.timestamp('us')),
+            ('analysis_duration_seconds', pa.int32()),
+            ('overall_mood', pa.string()),
+            ('positive_percentage', pa.float64()),
+            ('neutral_percentage', pa.float64()),
+            ('negative_percentage', pa.float64()),
+        ]),
+    }
+
+def _timestamp(value):
+    """ISO string from either backend -> naive UTC datetime"""
+    if not value:
+        return None
+    parsed = value if isinstance(value, datetime) else datetime.fromisoformat(value)
+    if parsed.tzinfo:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+def _number(value):
+    try:
+        return float(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+def _text_list(value) -> List[str]:
+    if not isinstance(value, list):
+        return []
+    return [str(item) for item in value]
+
+def response_row(resp: Dict, counts: Dict = None) -> Dict:
+    """Flatten a response, its summary_data and its message counts into one columnar row"""
+    counts = counts or {}
+    summary = resp.get('summary_data') or {}
+    row = {
+        'id': resp['id'],
+        'sprint_id': resp.get('sprint_id'),
+        'team_member_id': resp.get('team_member_id'),
+        'user_name': resp.get('user_name'),
+        'is_anonymous': resp.get('is_anonymous'),
+        'submitted_at': _timestamp(resp.get('submitted_at')),
+        'sentiment_score': _number(resp.get('sentiment_score')),
+        'message_count': counts.get('message_count', 0),
+        'user_message_count': counts.get('user_message_count', 0),
+    }
+    for field in SUMMARY_TEXT_FIELDS:
+        value = summary.get(field)
+        row[f'summary_{field}'] = str(value) if value is not None else None
+    for field in SUMMARY_LIST_FIELDS:
+        row[f'summary_{field}'] = _text_list(summary.get(field))
+    return row
+
+def theme_rows(report: Dict) -> List[Dict]:
+    """One row per theme in an analysis report"""
+    themes = report.get('themes') or []
+    if isinstance(themes, dict):
+        themes = themes.get('themes', [])
+
+    rows = []
+    for position, theme in enumerate(themes):
+        if not isinstance(theme, dict):
+            continue
+        rows.append({
+            'report_id': report['id'],
+            'sprint_id': report.get('sprint_id'),
+            'generated_at': _timestamp(report.get('generated_at')),
+            'position': position,
+            'name': theme.get('name'),
+            'category': theme.get('category'),
+            'severity': theme.get('severity'),
+            'frequency': str(theme['frequency']) if theme.get('frequency') is not None else None,
+            'percentage': _number(theme.get('percentage')),
+            'impact': theme.get('impact'),
+            'quotes': _text_list(theme.get('quotes')),
+            'mentioned_by': _text_list(theme.get('mentioned_by')),
+        })
+    return rows
+
+def sentiment_row(report: Dict) -> Dict:
+    """A report's sentiment breakdown as one row"""
+    sentiment = report.get('sentiment_summary') or {}
+    return {
+        'report_id': report['id'],
+        'sprint_id': report.get('sprint_id'),
+        'generated_at': _timestamp(report.get('generated_at')),
+        'analysis_duration_seconds': report.get('analysis_duration_seconds'),
+        'overall_mood': sentiment.get('overall_mood'),
+        'positive_percentage': _number(sentiment.get('positive_percentage')),
+        'neutral_percentage': _number(sentiment.get('neutral_percentage')),
+        'negative_percentage': _number(sentiment.get('negative_percentage')),
+    }
+
+class ColumnarWriter:
+    """Buffers rows and writes them to a Parquet or Arrow IPC file in row groups"""
+
+    def __init__(self, path: str, schema, fmt: str = 'parquet', row_group_size: int = 10000):
+        pa = _pyarrow()
+        self.pa = pa
+        self.schema = schema
+        self.row_group_size = row_group_size
+        self.rows = []
+        self.count = 0
+        if fmt == 'parquet':
+            self.writer = pa.parquet.ParquetWriter(path, schema, compression='zstd')
+        else:
+            options = pa.ipc.IpcWriteOptions(compression='zstd')
+            self.writer = pa.ipc.new_file(path, schema, options=options)
+
+    def write(self, rows: Iterable[Dict]) -> None:
+        self.rows.extend(rows)
+        if len(self.rows) >= self.row_group_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self.rows:
+            return
+        self.writer.write_table(self.pa.Table.from_pylist(self.rows, schema=self.schema))
+        self.count += len(self.rows)
+        self.rows = []
+
+    def close(self) -> None:
+        self.flush()
+        self.writer.close()
+
+def export_columnar(db, sprint_ids: Iterable[str], out_dir: str, fmt: str = 'parquet',
+                    batch_size: int = 500, row_group_size: int = 10000, progress=None) -> Dict:
+    """Write responses, themes and sentiment for sprint_ids into out_dir.
+
+    Rows are read batch_size at a time and written in row groups of
+    row_group_size, so memory stays bounded regardless of export size.
+    progress, if given, is called with (sprint_id, counts) after each sprint.
+    Returns {'responses': n, 'themes': n, 'sentiment': n, 'sprints': n}.
+    """
+    if fmt not in COLUMNAR_FORMATS:
+        raise ValueError(f"Unknown format: {fmt}")
+    schemas = _schemas(_pyarrow())
+    os.makedirs(out_dir, exist_ok=True)
+
+    writers = {
+        name: ColumnarWriter(os.path.join(out_dir, f'{name}.{COLUMNAR_FORMATS[fmt]}'),
+                             schema, fmt, row_group_size)
+        for name, schema in schemas.items()
+    }
+    sprints = 0
+    try:
+        for sprint_id in sprint_ids:
+            for batch in db.iter_sprint_rows('responses', sprint_id, RESPONSE_COLUMNS, batch_size):
+                counts = db.get_response_message_counts([resp['id'] for resp in batch])
+                writers['responses'].write(response_row(resp, counts.get(resp['id'])) for resp in batch)
+            for batch in db.iter_sprint_rows('analysis_reports', sprint_id, REPORT_COLUMNS, batch_size):
+                for report in batch:
+                    writers['themes'].write(theme_rows(report))
+                    writers['sentiment'].write([sentiment_row(report)])
+            sprints += 1
+            if progress:
+                progress(sprint_id, {name: w.count + len(w.rows) for name, w in writers.items()})
+    finally:
+        for writer in writers.values():
+            writer.close()
+
+    counts = {name: writer.count for name, writer in writers.items()}
+    counts['sprints'] = sprints
+    return counts
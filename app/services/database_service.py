@@ -1,8 +1,42 @@
-from supabase import create_client, Client
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Iterator
+from contextlib import contextmanager
+import base64
 import os
+import secrets
+import uuid
 from datetime import datetime
 
+# Access code alphabet (excludes confusing characters I, O, 0, 1)
+ACCESS_CODE_CHARS = 'ABCDEFGHJKLMNPQRSTUVWXYZ23456789'
+
+def generate_access_code() -> str:
+    """Generate an 8-character alphanumeric team member access code"""
+    return ''.join(secrets.choice(ACCESS_CODE_CHARS) for _ in range(8))
+
+def create_database_service():
+    """Create the database backend selected by DATABASE_BACKEND ('supabase' or 'postgres').
+    
+    Per-method latency is recorded (app/metrics.py), and the result is wrapped
+    in a read-through cache when CACHE_BACKEND is 'memory' or 'shared'.
+    """
+    backend = os.getenv('DATABASE_BACKEND', 'supabase').lower()
+    if backend == 'postgres':
+        from app.services.postgres_database_service import PostgresDatabaseService
+        db = PostgresDatabaseService()
+    elif backend == 'supabase':
+        db = DatabaseService()
+    else:
+        raise ValueError(f"Unknown DATABASE_BACKEND: {backend}")
+    
+    from app.metrics import InstrumentedDatabaseService
+    db = InstrumentedDatabaseService(db, backend)
+    
+    from app.services.cache_service import CachedDatabaseService, get_cache_backend, get_cache_ttls
+    cache = get_cache_backend()
+    if cache is not None:
+        return CachedDatabaseService(db, cache, get_cache_ttls())
+    return db
+
 class DatabaseService:
     """Service for all database operations using Supabase"""
     
@@ -10,7 +44,61 @@ class DatabaseService:
         url = os.getenv('SUPABASE_URL')
         # Use service role key for admin operations (bypasses RLS)
         key = os.getenv('SUPABASE_SERVICE_ROLE_KEY')
-        self.client: Client = create_client(url, key)
+        # Imported here so the app can start without loading the Supabase client stack
+        from supabase import create_client
+        self.client = create_client(url, key)
+    
+    @contextmanager
+    def transaction(self):
+        """Group calls into one transaction where the backend supports it.
+        
+        PostgREST commits each request on its own, so here this only keeps the
+        call sites backend-agnostic; PostgresDatabaseService makes it atomic.
+        """
+        yield self
+    
+    # =====================================================
+    # Keyset Pagination Helpers
+    # =====================================================
+    
+    @staticmethod
+    def encode_cursor(row: Dict) -> str:
+        """Encode a row's (created_at, id) position as an opaque cursor"""
+        raw = f"{row['created_at']}|{row['id']}"
+        return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii')
+    
+    @staticmethod
+    def _decode_cursor(cursor: str) -> tuple:
+        """Decode a cursor back into (created_at, id); raises ValueError if malformed.
+        
+        Both parts are parsed, so a client-supplied cursor can only ever carry
+        a timestamp and a UUID into a query.
+        """
+        try:
+            raw = base64.urlsafe_b64decode(cursor.encode('ascii')).decode('utf-8')
+            created_at, row_id = raw.split('|', 1)
+            return datetime.fromisoformat(created_at), uuid.UUID(row_id)
+        except Exception:
+            raise ValueError('Invalid cursor')
+    
+    def _paginate(self, query, limit: int = None, cursor: str = None):
+        """Apply newest-first keyset ordering, cursor filter and limit to a query.
+        
+        Rows are ordered by (created_at, id) descending so ties on created_at
+        still page deterministically.
+        """
+        if cursor:
+            created_at, row_id = self._decode_cursor(cursor)
+            created_at = created_at.isoformat()
+            # postgrest-py 0.13 has no or_() builder, so add the raw PostgREST param
+            query.params = query.params.add(
+                'or', f'(created_at.lt."{created_at}",and(created_at.eq."{created_at}",id.lt.{row_id}))'
+            )
+        # Both sort keys must go in a single order param
+        query.params = query.params.add('order', 'created_at.desc,id.desc')
+        if limit:
+            query = query.limit(limit)
+        return query
     
     # =====================================================
     # Sprint Operations
@@ -31,9 +119,10 @@ class DatabaseService:
         response = self.client.table('sprints').select('*').eq('share_token', token).execute()
         return response.data[0] if response.data else None
     
-    def get_all_sprints(self) -> List[Dict]:
-        """Get all sprints ordered by creation date"""
-        response = self.client.table('sprints').select('*').order('created_at', desc=True).execute()
+    def get_all_sprints(self, limit: int = None, cursor: str = None) -> List[Dict]:
+        """Get sprints newest first, optionally one keyset page at a time"""
+        query = self.client.table('sprints').select('*')
+        response = self._paginate(query, limit, cursor).execute()
         return response.data if response.data else []
     
     def update_sprint_status(self, sprint_id: str, status: str) -> Dict:
@@ -41,9 +130,23 @@ class DatabaseService:
         response = self.client.table('sprints').update({'status': status}).eq('id', sprint_id).execute()
         return response.data[0] if response.data else None
         
-    def get_sprints_by_creator(self, user_id: str) -> List[Dict]:
-        """Get all sprints created by a specific user"""
-        response = self.client.table('sprints').select('*').eq('created_by', user_id).order('created_at', desc=True).execute()
+    def get_sprint_submission_counts(self, sprint_id: str) -> Optional[Dict]:
+        """Get trigger-maintained team_size, submitted_count and response_count for a sprint"""
+        response = self.client.table('sprints')\
+            .select('team_size, submitted_count, response_count')\
+            .eq('id', sprint_id)\
+            .execute()
+        return response.data[0] if response.data else None
+        
+    def get_sprint_version(self, sprint_id: str) -> Optional[int]:
+        """Get the trigger-maintained row_version of a sprint, or None if it doesn't exist"""
+        response = self.client.table('sprints').select('row_version').eq('id', sprint_id).execute()
+        return response.data[0]['row_version'] if response.data else None
+        
+    def get_sprints_by_creator(self, user_id: str, limit: int = None, cursor: str = None) -> List[Dict]:
+        """Get sprints created by a specific user, newest first"""
+        query = self.client.table('sprints').select('*').eq('created_by', user_id)
+        response = self._paginate(query, limit, cursor).execute()
         return response.data if response.data else []
     
     # =====================================================
@@ -65,21 +168,27 @@ class DatabaseService:
         response = self.client.table('team_members').select('*').eq('sprint_id', sprint_id).execute()
         return response.data if response.data else []
     
-    def get_member_sprints(self, email: str) -> List[Dict]:
-        """Get all sprints a member is assigned to"""
-        # Join team_members with sprints
-        response = self.client.table('team_members').select('sprint:sprints(*)').eq('email', email).execute()
+    def get_member_sprints(self, email: str, limit: int = None, cursor: str = None) -> List[Dict]:
+        """Get sprints a member is assigned to, newest first"""
+        # Query sprints with an inner join on team_members so ordering and
+        # limits are applied by the database rather than in Python
+        query = self.client.table('sprints')\
+            .select('*, team_members!inner(id)')\
+            .eq('team_members.email', email)
+        response = self._paginate(query, limit, cursor).execute()
         
         sprints = []
-        if response.data:
-            for item in response.data:
-                if item.get('sprint'):
-                    sprints.append(item['sprint'])
-        
-        # Sort by start_date desc
-        sprints.sort(key=lambda x: x.get('start_date', ''), reverse=True)
+        for sprint in response.data or []:
+            sprint.pop('team_members', None)
+            sprints.append(sprint)
         return sprints
     
+    def get_member_dashboard(self, email: str, limit: int = None, cursor: str = None) -> List[Dict]:
+        """Get a member's sprints with submission status, active session and last activity"""
+        query = self.client.table('member_sprint_dashboard').select('*').eq('member_email', email)
+        response = self._paginate(query, limit, cursor).execute()
+        return response.data or []
+    
     def mark_member_submitted(self, sprint_id: str, user_name: str) -> None:
         """Mark a team member as having submitted"""
         self.client.table('team_members').update({
@@ -118,6 +227,20 @@ class DatabaseService:
             return response.data[0]
         return None
 
+    def bootstrap_chat_session(self, access_code: str, session_token: str) -> Dict:
+        """Validate access code and get or create the member's session in one round trip.
+
+        Calls the bootstrap_chat_session database function, which returns a dict
+        with a 'status' field ('ok', 'invalid_code', 'sprint_not_found', 'not_accepting')
+        and, on success, member, sprint context, session_token and history.
+        session_token is only used if a new session has to be created.
+        """
+        response = self.client.rpc('bootstrap_chat_session', {
+            'p_access_code': access_code,
+            'p_session_token': session_token
+        }).execute()
+        return response.data if response.data else {'status': 'invalid_code'}
+
     def get_conversation_history(self, session_token: str) -> List[Dict]:
         """Get conversation history for a session"""
         response = self.client.table('conversation_sessions').select('conversation_history').eq('session_token', session_token).execute()
@@ -131,6 +254,24 @@ class DatabaseService:
             'conversation_history': conversation
         }).eq('session_token', session_token).execute()
     
+    def archive_conversation_sessions(self, submitted_before: datetime, stale_before: datetime,
+                                      batch_size: int = 500, dry_run: bool = False) -> Dict:
+        """Move one batch of submitted/stale sessions into conversation_sessions_archive.
+        
+        Only sessions of analyzed or closed sprints move. Sessions of members who
+        submitted are archived once last updated before submitted_before; any
+        other session once last updated before stale_before.
+        Returns counts {'archived', 'submitted', 'stale', 'bytes'}. With dry_run
+        nothing moves and the counts cover every eligible session.
+        """
+        response = self.client.rpc('archive_conversation_sessions', {
+            'p_submitted_before': submitted_before.isoformat(),
+            'p_stale_before': stale_before.isoformat(),
+            'p_batch_size': batch_size,
+            'p_dry_run': dry_run
+        }).execute()
+        return response.data
+    
     # =====================================================
     # Response Operations
     # =====================================================
@@ -149,11 +290,78 @@ class DatabaseService:
         response = self.client.table('responses').insert(data).execute()
         return response.data[0]['id'] if response.data else None
     
-    def get_sprint_responses(self, sprint_id: str) -> List[Dict]:
-        """Get all responses for a sprint"""
-        response = self.client.table('responses').select('*').eq('sprint_id', sprint_id).execute()
+    def get_sprint_responses(self, sprint_id: str, columns: str = '*') -> List[Dict]:
+        """Get all responses for a sprint, optionally projecting only some columns"""
+        response = self.client.table('responses').select(columns).eq('sprint_id', sprint_id).execute()
         return response.data if response.data else []
     
+    def count_sprint_responses(self, sprint_id: str) -> int:
+        """Count responses for a sprint without transferring any rows"""
+        response = self.client.table('responses')\
+            .select('id', count='exact')\
+            .eq('sprint_id', sprint_id)\
+            .limit(1)\
+            .execute()
+        return response.count or 0
+    
+    def get_response_conversations(self, response_ids: List[str]) -> Dict[str, List[Dict]]:
+        """Map response id -> conversation for the given responses"""
+        if not response_ids:
+            return {}
+        response = self.client.table('responses')\
+            .select('id, conversation')\
+            .in_('id', response_ids)\
+            .execute()
+        return {row['id']: row['conversation'] for row in response.data or []}
+    
+    def get_response_user_texts(self, response_ids: List[str], max_chars: int = 500) -> Dict[str, str]:
+        """Map response id -> the first max_chars of its user messages joined by spaces"""
+        if not response_ids:
+            return {}
+        response = self.client.rpc('response_user_texts', {
+            'p_response_ids': list(response_ids),
+            'p_max_chars': max_chars
+        }).execute()
+        return response.data or {}
+    
+    def get_response_message_counts(self, response_ids: List[str]) -> Dict[str, Dict]:
+        """Map response id -> {'message_count', 'user_message_count'} of its conversation"""
+        if not response_ids:
+            return {}
+        response = self.client.rpc('response_message_counts', {
+            'p_response_ids': list(response_ids)
+        }).execute()
+        return response.data or {}
+    
+    def iter_sprint_responses(self, sprint_id: str, columns: str = '*',
+                              batch_size: int = 100) -> Iterator[List[Dict]]:
+        """Yield a sprint's responses in batches of at most batch_size rows.
+        
+        Pages by id so only one batch is held in memory at a time. The id
+        column is always fetched since it drives the paging.
+        """
+        yield from self.iter_sprint_rows('responses', sprint_id, columns, batch_size)
+    
+    def iter_sprint_rows(self, table: str, sprint_id: str, columns: str = '*',
+                         batch_size: int = 100) -> Iterator[List[Dict]]:
+        """Yield a sprint's rows from table in id order, batch_size rows at a time"""
+        if columns != '*' and 'id' not in [c.strip() for c in columns.split(',')]:
+            columns = f'id, {columns}'
+        
+        last_id = None
+        while True:
+            query = self.client.table(table).select(columns).eq('sprint_id', sprint_id)
+            if last_id:
+                query = query.gt('id', last_id)
+            response = query.order('id').limit(batch_size).execute()
+            batch = response.data or []
+            if not batch:
+                return
+            yield batch
+            if len(batch) < batch_size:
+                return
+            last_id = batch[-1]['id']
+    
     # =====================================================
     # Analysis Report Operations
     # =====================================================
@@ -175,6 +383,11 @@ class DatabaseService:
         response = self.client.table('analysis_reports').select('*').eq('sprint_id', sprint_id).execute()
         return response.data[0] if response.data else None
     
+    def get_analysis_report_version(self, sprint_id: str) -> Optional[Dict]:
+        """Get just the id and generated_at of a sprint's analysis report"""
+        response = self.client.table('analysis_reports').select('id, generated_at').eq('sprint_id', sprint_id).execute()
+        return response.data[0] if response.data else None
+    
     # =====================================================
     # Action Item Operations
     # =====================================================
@@ -196,6 +409,27 @@ class DatabaseService:
         response = self.client.table('action_items').select('*').eq('sprint_id', sprint_id).execute()
         return response.data if response.data else []
     
+    # =====================================================
+    # LLM Usage Operations
+    # =====================================================
+    
+    def record_llm_usage(self, entry: Dict) -> None:
+        """Append one LLM call to the llm_usage ledger"""
+        self.client.table('llm_usage').insert(entry).execute()
+    
+    def get_sprint_llm_usage(self, sprint_id: str) -> Dict:
+        """Token and cost totals for a sprint, overall and per call type/provider/model"""
+        response = self.client.rpc('sprint_llm_usage', {'p_sprint_id': sprint_id}).execute()
+        return response.data
+    
+    def get_top_llm_usage_sprints(self, since: datetime = None, limit: int = 20) -> List[Dict]:
+        """Sprints with the highest LLM cost since a point in time (all time when None)"""
+        response = self.client.rpc('top_llm_usage_sprints', {
+            'p_since': since.isoformat() if since else None,
+            'p_limit': limit
+        }).execute()
+        return response.data
+    
     # =====================================================
     # Project Operations
     # =====================================================
@@ -215,9 +449,10 @@ class DatabaseService:
         response = self.client.table('projects').select('*').order('created_at', desc=True).execute()
         return response.data if response.data else []
     
-    def get_projects_by_creator(self, user_id: str) -> List[Dict]:
-        """Get projects created by a specific user"""
-        response = self.client.table('projects').select('*').eq('created_by', user_id).order('created_at', desc=True).execute()
+    def get_projects_by_creator(self, user_id: str, limit: int = None, cursor: str = None) -> List[Dict]:
+        """Get projects created by a specific user, newest first"""
+        query = self.client.table('projects').select('*').eq('created_by', user_id)
+        response = self._paginate(query, limit, cursor).execute()
         return response.data if response.data else []
     
     def migrate_project_ownership(self, old_identifier: str, new_user_id: str) -> int:
@@ -237,9 +472,10 @@ class DatabaseService:
         response = self.client.table('projects').update(updates).eq('id', project_id).execute()
         return response.data[0] if response.data else None
     
-    def get_sprints_by_project(self, project_id: str) -> List[Dict]:
-        """Get all sprints associated with a project"""
-        response = self.client.table('sprints').select('*').eq('project_id', project_id).order('created_at', desc=True).execute()
+    def get_sprints_by_project(self, project_id: str, limit: int = None, cursor: str = None) -> List[Dict]:
+        """Get sprints associated with a project, newest first"""
+        query = self.client.table('sprints').select('*').eq('project_id', project_id)
+        response = self._paginate(query, limit, cursor).execute()
         return response.data if response.data else []
     
     def get_project_team_members(self, project_id: str) -> List[Dict]:
@@ -261,14 +497,9 @@ class DatabaseService:
     def add_team_member_with_details(self, sprint_id: str, name: str, role: str, 
                                       email: str = None, access_code: str = None) -> Dict:
         """Add a team member with full details including email and access code"""
-        import secrets
-        import string
-        
         # Generate access code if not provided
         if not access_code:
-            # Generate 8-character alphanumeric code (excluding confusing characters)
-            chars = 'ABCDEFGHJKLMNPQRSTUVWXYZ23456789'
-            access_code = ''.join(secrets.choice(chars) for _ in range(8))
+            access_code = generate_access_code()
         
         data = {
             'sprint_id': sprint_id,
@@ -290,6 +521,22 @@ class DatabaseService:
         response = self.client.table('team_members').select('*').eq('id', member_id).execute()
         return response.data[0] if response.data else None
     
+    def get_team_member_by_email(self, sprint_id: str, email: str) -> Optional[Dict]:
+        """Get a sprint's team member by email (point lookup, no roster scan)"""
+        response = self.client.table('team_members')\
+            .select('*')\
+            .eq('sprint_id', sprint_id)\
+            .eq('email', email)\
+            .limit(1)\
+            .execute()
+        return response.data[0] if response.data else None
+    
+    def set_team_member_access_code(self, member_id: str, access_code: str) -> None:
+        """Set a team member's access code"""
+        self.client.table('team_members').update({
+            'access_code': access_code
+        }).eq('id', member_id).execute()
+    
     def update_team_member_invite_sent(self, member_id: str) -> None:
         """Mark that invite was sent to a team member"""
         self.client.table('team_members').update({
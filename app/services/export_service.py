@@ -0,0 +1,89 @@
+import csv
+import io
+from typing import Dict, Iterable, Iterator, List
+from app.json_provider import dumps
+
+# Exportable datasets: name -> (table, columns in output order).
+# Session tokens are left out on purpose.
+EXPORT_DATASETS = {
+    'responses': ('responses', [
+        'id', 'sprint_id', 'team_member_id', 'user_name', 'is_anonymous',
+        'submitted_at', 'sentiment_score', 'summary_data', 'conversation'
+    ]),
+    'reports': ('analysis_reports', [
+        'id', 'sprint_id', 'generated_at', 'analysis_duration_seconds',
+        'themes', 'recommendations', 'sentiment_summary'
+    ]),
+    'action_items': ('action_items', [
+        'id', 'sprint_id', 'report_id', 'description', 'priority', 'status',
+        'assigned_to', 'created_at', 'completed_at', 'theme_related'
+    ]),
+}
+
+EXPORT_FORMATS = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv',
+}
+
+EXPORT_BATCH_SIZE = 200
+
+def iter_project_sprint_ids(db, project_id: str, page_size: int = 100) -> Iterator[str]:
+    """Yield a project's sprint ids newest first, one page of sprints at a time"""
+    return _iter_sprint_ids(
+        lambda cursor: db.get_sprints_by_project(project_id, limit=page_size, cursor=cursor),
+        db, page_size
+    )
+
+def iter_all_sprint_ids(db, page_size: int = 100) -> Iterator[str]:
+    """Yield every sprint id newest first, one page of sprints at a time"""
+    return _iter_sprint_ids(
+        lambda cursor: db.get_all_sprints(limit=page_size, cursor=cursor), db, page_size
+    )
+
+def _iter_sprint_ids(fetch_page, db, page_size: int) -> Iterator[str]:
+    cursor = None
+    while True:
+        sprints = fetch_page(cursor)
+        for sprint in sprints:
+            yield sprint['id']
+        if len(sprints) < page_size:
+            return
+        cursor = db.encode_cursor(sprints[-1])
+
+def iter_export_batches(db, dataset: str, sprint_ids: Iterable[str],
+                        batch_size: int = EXPORT_BATCH_SIZE) -> Iterator[List[Dict]]:
+    """Yield batches of dataset rows for each sprint in turn"""
+    table, columns = EXPORT_DATASETS[dataset]
+    for sprint_id in sprint_ids:
+        yield from db.iter_sprint_rows(table, sprint_id, ', '.join(columns), batch_size)
+
+def iter_ndjson(batches: Iterable[List[Dict]]) -> Iterator[str]:
+    """Encode each batch as newline-delimited JSON, one chunk per batch"""
+    for batch in batches:
+        yield ''.join(dumps(row) + '\n' for row in batch)
+
+def iter_csv(batches: Iterable[List[Dict]], columns: List[str]) -> Iterator[str]:
+    """Encode rows as CSV with a header row; nested values are written as JSON"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    yield buffer.getvalue()
+
+    for batch in batches:
+        buffer.seek(0)
+        buffer.truncate()
+        for row in batch:
+            writer.writerow([_csv_value(row.get(column)) for column in columns])
+        yield buffer.getvalue()
+
+def _csv_value(value):
+    if isinstance(value, (dict, list)):
+        return dumps(value)
+    return '' if value is None else value
+
+def iter_export(db, dataset: str, fmt: str, sprint_ids: Iterable[str]) -> Iterator[str]:
+    """Stream a dataset for the given sprints as NDJSON or CSV text chunks"""
+    batches = iter_export_batches(db, dataset, sprint_ids)
+    if fmt == 'csv':
+        return iter_csv(batches, EXPORT_DATASETS[dataset][1])
+    return iter_ndjson(batches)
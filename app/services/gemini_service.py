@@ -1,17 +1,32 @@
 import google.generativeai as genai
-import json
 import re
 import os
 from typing import List, Dict
 import google.api_core.exceptions
+import logging
 import time
+from app.json_provider import JSONDecodeError, dumps, loads
+from app.logging_config import log_payload
+from app.metrics import observe_llm_call, record_llm_retry
+from app.services.llm_replay import recorded_call
+from app.services.llm_usage import estimate_tokens, record_usage
+
+logger = logging.getLogger(__name__)
+
+# Characters of a member's messages sent for sentiment scoring
+SENTIMENT_TEXT_CHARS = 500
 
 class GeminiService:
     """Service for all Gemini AI operations"""
     
     def __init__(self):
         api_key = os.getenv('GEMINI_API_KEY')
-        genai.configure(api_key=api_key)
+        # 'rest' goes through requests, which gevent can make cooperative; the
+        # default grpc transport blocks the whole worker while a call is in flight
+        # GEMINI_API_ENDPOINT redirects calls, e.g. to benchmarks/fake_services.py
+        endpoint = os.getenv('GEMINI_API_ENDPOINT')
+        genai.configure(api_key=api_key, transport=os.getenv('GEMINI_TRANSPORT') or None,
+                        client_options={'api_endpoint': endpoint} if endpoint else None)
         self.model = genai.GenerativeModel('gemini-3-flash-preview')
         self.generation_config = {
             "response_mime_type": "application/json",
@@ -66,35 +81,61 @@ Ask relevant follow-up questions based on their role when appropriate."""
                 text_config = {
                     "temperature": 0.7,
                 }
-                response = self.model.generate_content(full_prompt, generation_config=text_config)
+                response = self._generate('interview', full_prompt, text_config)
                 
                 # Check for safety blocks or other issues that don't raise exceptions but return empty/invalid response
                 if response.prompt_feedback and response.prompt_feedback.block_reason:
-                    print(f"Gemini Blocked Response: {response.prompt_feedback.block_reason}")
+                    logger.warning("Gemini blocked response", extra={'block_reason': str(response.prompt_feedback.block_reason)})
                     return "I apologize, but I cannot respond to that specific message due to safety guidelines. Could we please rephrase or move to the next topic?"
 
                 return self._clean_response(response.text)
                 
             except google.api_core.exceptions.ResourceExhausted as e:
-                print(f"Gemini Rate Limit Hit: {e}")
+                logger.warning("Gemini rate limit hit: %s", e)
                 return "I'm receiving a lot of messages right now. Please wait a moment (about 30 seconds) and try again."
                 
             except google.api_core.exceptions.ServiceUnavailable as e:
-                print(f"Gemini Service Unavailable (Attempt {attempt+1}/{max_retries}): {e}")
+                logger.warning("Gemini service unavailable (attempt %d/%d): %s", attempt + 1, max_retries, e)
                 if attempt < max_retries - 1:
+                    record_llm_retry('gemini', 'interview')
                     time.sleep(2 * (attempt + 1)) # Exponential backoff
                     continue
                 return "The AI service is currently experiencing high traffic. Please try again in a few moments."
                 
             except Exception as e:
-                print(f"Gemini API error (Attempt {attempt+1}/{max_retries}): {e}")
+                logger.warning("Gemini API error (attempt %d/%d): %s", attempt + 1, max_retries, e)
                 if attempt < max_retries - 1:
+                    record_llm_retry('gemini', 'interview')
                     time.sleep(1)
                     continue
                 return "I apologize, but I'm having trouble processing your response due to a technical issue. Could you please try again?"
                 
         return "I apologize, but I'm unable to connect to the AI service right now. Please try again later."
     
+    def _generate(self, operation: str, prompt: str, generation_config: Dict):
+        """Call the model, recording latency, errors and token usage under operation"""
+        model = self.model.model_name.split('/')[-1]
+        with observe_llm_call('gemini', operation) as timing:
+            response = recorded_call(
+                'gemini', model, operation,
+                {'prompt': prompt, 'generation_config': generation_config},
+                lambda: self.model.generate_content(prompt, generation_config=generation_config)
+            )
+        # Token accounting must never fail a call that already succeeded
+        usage = getattr(response, 'usage_metadata', None)
+        if usage:
+            prompt_tokens = getattr(usage, 'prompt_token_count', None)
+            completion_tokens = getattr(usage, 'candidates_token_count', None)
+        else:
+            # Older SDKs only report output tokens, per candidate; estimate the prompt
+            prompt_tokens = estimate_tokens(prompt)
+            completion_tokens = sum(getattr(c, 'token_count', 0) or 0
+                                    for c in getattr(response, 'candidates', None) or [])
+        record_usage('gemini', model, operation,
+                     prompt_tokens, completion_tokens, latency_seconds=timing['seconds'],
+                     prompt_chars=len(prompt), tokens_estimated=usage is None)
+        return response
+    
     def _build_sprint_context(self, sprint_context: Dict) -> str:
         """Build sprint context section for the prompt"""
         if not sprint_context:
@@ -269,16 +310,16 @@ Be thorough in extracting all feedback points. If a category has no relevant con
 Return ONLY the JSON object, no other text."""
 
         try:
-            response = self.model.generate_content(prompt, generation_config=self.generation_config)
+            response = self._generate('summary', prompt, self.generation_config)
             result_text = response.text.strip()
             
             # Clean up response
             result_text = re.sub(r'^```json\s*', '', result_text, flags=re.MULTILINE)
             result_text = re.sub(r'\s*```$', '', result_text, flags=re.MULTILINE)
             
-            return json.loads(result_text)
-        except json.JSONDecodeError as e:
-            print(f"JSON parse error in summary: {e}")
+            return loads(result_text)
+        except JSONDecodeError as e:
+            logger.warning("Unparseable summary JSON from Gemini: %s", e)
             return {
                 "went_well": [],
                 "challenges": [],
@@ -289,7 +330,7 @@ Return ONLY the JSON object, no other text."""
                 "summary": "Unable to generate summary from conversation."
             }
         except Exception as e:
-            print(f"Error generating summary: {e}")
+            logger.exception("Summary generation failed")
             return {
                 "went_well": [],
                 "challenges": [],
@@ -316,109 +357,107 @@ Return ONLY the JSON object, no other text."""
     
     def _extract_themes(self, responses: List[Dict]) -> Dict:
         """Extract common themes from responses"""
-        print(f"\n=== THEME EXTRACTION START ===")
-        print(f"Number of responses to analyze: {len(responses)}")
+        formatted_responses = self._format_responses_for_analysis(responses)
+        return self._extract_themes_from_text(formatted_responses, len(responses))
+    
+    def _extract_themes_from_text(self, formatted_responses: str, team_size: int) -> Dict:
+        """Extract common themes from already formatted responses"""
+        logger.info("Extracting themes", extra={'responses': team_size})
         
         prompt_template = self._load_prompt('theme_extraction.txt')
         
-        # Format responses
-        formatted_responses = self._format_responses_for_analysis(responses)
-        print(f"Formatted responses preview: {formatted_responses[:500]}...")
-        
         prompt = prompt_template.format(
-            team_size=len(responses),
+            team_size=team_size,
             summaries=formatted_responses
         )
-        print(f"Prompt preview: {prompt[:300]}...")
+        log_payload(logger, "Theme extraction prompt", prompt)
         
         try:
-            print(f"Calling Gemini model: {self.model.model_name}")
-            response = self.model.generate_content(
-                prompt,
-                generation_config=self.generation_config
-            )
-            
-            print(f"Raw Gemini response: {response.text[:1000] if response.text else 'EMPTY'}")
+            response = self._generate('themes', prompt, self.generation_config)
+            log_payload(logger, "Theme extraction response", response.text)
             
             cleaned_text = self._clean_json_string(response.text)
-            print(f"Cleaned text: {cleaned_text[:500]}...")
             
-            result = json.loads(cleaned_text)
-            print(f"Parsed themes count: {len(result.get('themes', []))}")
-            print(f"=== THEME EXTRACTION END ===\n")
+            result = loads(cleaned_text)
+            logger.info("Extracted themes", extra={'themes': len(result.get('themes', []))})
             return result
-        except json.JSONDecodeError as e:
-            print(f"JSON parsing error: {e}")
-            print(f"Raw response text: {response.text if 'response' in dir() else 'No response'}")
-            print(f"=== THEME EXTRACTION FAILED (JSON) ===\n")
+        except JSONDecodeError as e:
+            logger.warning("Unparseable themes JSON from Gemini: %s", e)
+            log_payload(logger, "Unparseable theme extraction response", response.text, limit=10000)
             return {"themes": []}
-        except Exception as e:
-            print(f"Theme extraction error: {type(e).__name__}: {e}")
-            import traceback
-            traceback.print_exc()
-            print(f"=== THEME EXTRACTION FAILED ===\n")
+        except Exception:
+            logger.exception("Theme extraction failed")
             return {"themes": []}
     
     def _generate_recommendations(self, themes: List[Dict]) -> Dict:
         """Generate recommendations based on themes"""
-        print(f"\n=== RECOMMENDATIONS START ===")
-        print(f"Number of themes input: {len(themes)}")
-        
         if not themes:
-            print("WARNING: No themes provided, skipping recommendations")
-            print(f"=== RECOMMENDATIONS SKIPPED ===\n")
+            logger.warning("No themes provided, skipping recommendations")
             return {"recommendations": []}
         
         prompt_template = self._load_prompt('recommendations.txt')
         
-        themes_text = json.dumps(themes, indent=2)
+        themes_text = dumps(themes, indent=True)
         prompt = prompt_template.format(themes=themes_text)
-        print(f"Prompt preview: {prompt[:300]}...")
+        log_payload(logger, "Recommendations prompt", prompt)
         
         try:
-            print(f"Calling Gemini for recommendations...")
-            response = self.model.generate_content(
-                prompt,
-                generation_config=self.generation_config
-            )
-            
-            print(f"Raw Gemini response: {response.text[:1000] if response.text else 'EMPTY'}")
+            response = self._generate('recommendations', prompt, self.generation_config)
+            log_payload(logger, "Recommendations response", response.text)
             
             cleaned_text = self._clean_json_string(response.text)
-            result = json.loads(cleaned_text)
-            print(f"Parsed recommendations count: {len(result.get('recommendations', []))}")
-            print(f"=== RECOMMENDATIONS END ===\n")
+            result = loads(cleaned_text)
+            logger.info("Generated recommendations", extra={
+                'themes': len(themes), 'recommendations': len(result.get('recommendations', []))
+            })
             return result
-        except Exception as e:
-            print(f"Recommendations generation error: {type(e).__name__}: {e}")
-            import traceback
-            traceback.print_exc()
-            print(f"=== RECOMMENDATIONS FAILED ===\n")
+        except Exception:
+            logger.exception("Recommendations generation failed")
             return {"recommendations": []}
     
     def _analyze_sentiment(self, responses: List[Dict]) -> Dict:
         """Analyze overall sentiment from responses"""
+        counts = self._count_sentiment(responses)
+        return self._summarize_sentiment(counts)
+    
+    def _count_sentiment(self, responses: List[Dict], counts: Dict = None) -> Dict:
+        """Score each response and tally positive/neutral/negative counts.
+        
+        Pass the counts from a previous batch to accumulate across batches.
+        """
         # Simple implementation - could be enhanced
-        positive_count = 0
-        neutral_count = 0
-        negative_count = 0
+        if counts is None:
+            counts = {'positive': 0, 'neutral': 0, 'negative': 0}
         
         for response in responses:
-            conversation = response.get('conversation', [])
-            # Combine all user messages
-            user_text = ' '.join([msg['content'] for msg in conversation if msg['role'] == 'user'])
-            
             # Use Gemini to score sentiment
-            score = self._get_sentiment_score(user_text)
+            score = self._get_sentiment_score(self._sentiment_text(response))
             
             if score > 0.3:
-                positive_count += 1
+                counts['positive'] += 1
             elif score < -0.3:
-                negative_count += 1
+                counts['negative'] += 1
             else:
-                neutral_count += 1
+                counts['neutral'] += 1
         
-        total = len(responses)
+        return counts
+    
+    def _sentiment_text(self, response: Dict) -> str:
+        """Text to score: the member's own messages, joined"""
+        # Streamed analysis rows carry it precomputed (get_response_user_texts)
+        if 'user_text' in response:
+            return response['user_text']
+        conversation = response.get('conversation') or []
+        # Combine all user messages
+        return ' '.join([msg['content'] for msg in conversation if msg['role'] == 'user'])
+    
+    def _summarize_sentiment(self, counts: Dict) -> Dict:
+        """Turn sentiment counts into the report's sentiment summary"""
+        positive_count = counts['positive']
+        neutral_count = counts['neutral']
+        negative_count = counts['negative']
+        
+        total = positive_count + neutral_count + negative_count
         if total == 0:
             return {
                 'overall_mood': 'neutral',
@@ -439,50 +478,54 @@ Return ONLY the JSON object, no other text."""
         prompt = f"""Analyze the sentiment of this text and return a score between -1 (very negative) and 1 (very positive).
 Return ONLY a JSON object with a single 'score' field.
 
-Text: {text[:500]}
+Text: {text[:SENTIMENT_TEXT_CHARS]}
 
 Return format: {{"score": 0.5}}"""
         
         try:
-            response = self.model.generate_content(
-                prompt,
-                generation_config=self.generation_config
-            )
-            result = json.loads(self._clean_json_string(response.text))
+            response = self._generate('sentiment', prompt, self.generation_config)
+            result = loads(self._clean_json_string(response.text))
             return result.get('score', 0.0)
         except:
             return 0.0
     
     def _format_responses_for_analysis(self, responses: List[Dict]) -> str:
         """Format responses for analysis prompts - uses summary_data when available"""
-        formatted = ""
-        for i, resp in enumerate(responses, 1):
-            formatted += f"\n[Response {i}]\n"
-            formatted += f"User: {resp.get('user_name', 'Anonymous')}\n"
-            
-            # Prefer summary_data (structured) over raw conversation
-            summary = resp.get('summary_data')
-            if summary and isinstance(summary, dict):
-                # Use structured summary data
-                if summary.get('went_well'):
-                    formatted += f"What went well: {', '.join(summary.get('went_well', []))}\n"
-                if summary.get('challenges'):
-                    formatted += f"Challenges: {', '.join(summary.get('challenges', []))}\n"
-                if summary.get('improvements'):
-                    formatted += f"Improvement ideas: {', '.join(summary.get('improvements', []))}\n"
-                if summary.get('team_feedback'):
-                    formatted += f"Team feedback: {', '.join(summary.get('team_feedback', []))}\n"
-                if summary.get('sentiment'):
-                    formatted += f"Sentiment: {summary.get('sentiment')}\n"
-                if summary.get('summary'):
-                    formatted += f"Summary: {summary.get('summary')}\n"
-            else:
-                # Fallback to raw conversation
-                conversation = resp.get('conversation', [])
-                user_messages = [msg['content'] for msg in conversation if msg['role'] == 'user']
-                formatted += f"Feedback: {' '.join(user_messages)}\n"
+        formatted = "".join(
+            self._format_response_for_analysis(i, resp)
+            for i, resp in enumerate(responses, 1)
+        )
+        
+        log_payload(logger, "Formatted responses for analysis", formatted, limit=500)
+        return formatted
+    
+    def _format_response_for_analysis(self, i: int, resp: Dict) -> str:
+        """Format a single numbered response for analysis prompts"""
+        formatted = f"\n[Response {i}]\n"
+        formatted += f"User: {resp.get('user_name', 'Anonymous')}\n"
+        
+        # Prefer summary_data (structured) over raw conversation
+        summary = resp.get('summary_data')
+        if summary and isinstance(summary, dict):
+            # Use structured summary data
+            if summary.get('went_well'):
+                formatted += f"What went well: {', '.join(summary.get('went_well', []))}\n"
+            if summary.get('challenges'):
+                formatted += f"Challenges: {', '.join(summary.get('challenges', []))}\n"
+            if summary.get('improvements'):
+                formatted += f"Improvement ideas: {', '.join(summary.get('improvements', []))}\n"
+            if summary.get('team_feedback'):
+                formatted += f"Team feedback: {', '.join(summary.get('team_feedback', []))}\n"
+            if summary.get('sentiment'):
+                formatted += f"Sentiment: {summary.get('sentiment')}\n"
+            if summary.get('summary'):
+                formatted += f"Summary: {summary.get('summary')}\n"
+        else:
+            # Fallback to raw conversation
+            conversation = resp.get('conversation') or []
+            user_messages = [msg['content'] for msg in conversation if msg['role'] == 'user']
+            formatted += f"Feedback: {' '.join(user_messages)}\n"
         
-        print(f"DEBUG: Formatted responses for analysis:\n{formatted[:500]}...")
         return formatted
     
     def _clean_json_string(self, json_str: str) -> str:
@@ -2,7 +2,13 @@ from groq import Groq
 import os
 import re
 from typing import List, Dict
+import logging
 import time
+from app.metrics import observe_llm_call, record_llm_retry
+from app.services.llm_replay import recorded_call
+from app.services.llm_usage import record_usage
+
+logger = logging.getLogger(__name__)
 
 class GroqService:
     """Service for Groq-powered fast chat responses"""
@@ -11,7 +17,8 @@ class GroqService:
         api_key = os.getenv('GROQ_API_KEY')
         if not api_key:
             raise ValueError("GROQ_API_KEY not found in environment variables")
-        self.client = Groq(api_key=api_key)
+        # Must stay below the gunicorn worker timeout (see gunicorn.conf.py)
+        self.client = Groq(api_key=api_key, timeout=float(os.getenv('GROQ_TIMEOUT', '60')))
         # Using Llama 3.1 8B Instant for fast responses
         self.model = "llama-3.1-8b-instant"
     
@@ -47,12 +54,23 @@ class GroqService:
         for attempt in range(max_retries):
             try:
                 # Call Groq API
-                chat_completion = self.client.chat.completions.create(
-                    model=self.model,
-                    messages=messages,
-                    temperature=0.7,
-                    max_tokens=300,  # Keep responses concise
-                )
+                with observe_llm_call('groq', 'interview') as timing:
+                    chat_completion = recorded_call(
+                        'groq', self.model, 'interview',
+                        {'messages': messages, 'temperature': 0.7, 'max_tokens': 300},
+                        lambda: self.client.chat.completions.create(
+                            model=self.model,
+                            messages=messages,
+                            temperature=0.7,
+                            max_tokens=300,  # Keep responses concise
+                        )
+                    )
+                usage = chat_completion.usage
+                record_usage('groq', self.model, 'interview',
+                             usage.prompt_tokens if usage else None,
+                             usage.completion_tokens if usage else None,
+                             latency_seconds=timing['seconds'],
+                             prompt_chars=sum(len(m['content']) for m in messages))
                 
                 response_text = chat_completion.choices[0].message.content
                 return self._clean_response(response_text)
@@ -62,20 +80,22 @@ class GroqService:
                 
                 # Handle rate limiting
                 if 'rate_limit' in error_str or 'rate limit' in error_str:
-                    print(f"Groq Rate Limit Hit: {e}")
+                    logger.warning("Groq rate limit hit: %s", e)
                     return "I'm receiving a lot of messages right now. Please wait a moment (about 30 seconds) and try again."
                 
                 # Handle service unavailable
                 if 'unavailable' in error_str or 'service' in error_str:
-                    print(f"Groq Service Unavailable (Attempt {attempt+1}/{max_retries}): {e}")
+                    logger.warning("Groq service unavailable (attempt %d/%d): %s", attempt + 1, max_retries, e)
                     if attempt < max_retries - 1:
+                        record_llm_retry('groq', 'interview')
                         time.sleep(2 * (attempt + 1))  # Exponential backoff
                         continue
                     return "The AI service is currently experiencing high traffic. Please try again in a few moments."
                 
                 # General error
-                print(f"Groq API error (Attempt {attempt+1}/{max_retries}): {e}")
+                logger.warning("Groq API error (attempt %d/%d): %s", attempt + 1, max_retries, e)
                 if attempt < max_retries - 1:
+                    record_llm_retry('groq', 'interview')
                     time.sleep(1)
                     continue
                 return "I apologize, but I'm having trouble processing your response due to a technical issue. Could you please try again?"
@@ -0,0 +1,173 @@
+"""Record and replay LLM calls at the GroqService/GeminiService boundary.
+
+With LLM_REPLAY=record, every Groq and Gemini call is made live and its
+request and response are saved as a JSON fixture. With LLM_REPLAY=replay, calls are
+answered from those fixtures without touching the network, so benchmarks
+and regression runs of analyze_sprint see the same model output every time:
+
+    LLM_REPLAY=record python run.py      # go through the flows once, live
+    LLM_REPLAY=replay LLM_REPLAY_LATENCY=recorded python -m benchmarks.load_test ...
+
+Fixtures live under LLM_FIXTURES_DIR as <provider>/<operation>/<key>.json,
+keyed by a hash of the model, operation and full request. Settings:
+
+    LLM_REPLAY           'off' (default), 'record' or 'replay'
+    LLM_FIXTURES_DIR     fixture root (default benchmarks/fixtures/llm)
+    LLM_REPLAY_LATENCY   'none' (default), 'recorded' to sleep for the latency
+                         measured when recording, or a fixed number of seconds
+    LLM_REPLAY_MATCH     'exact' (default) fails on a request that wasn't
+                         recorded; 'operation' then picks one of that
+                         operation's fixtures, deterministically by key, for
+                         runs whose prompts differ (e.g. freshly seeded data)
+"""
+import hashlib
+import json
+import os
+import tempfile
+import time
+from types import SimpleNamespace
+from typing import Callable, Dict
+from app.json_provider import dumps, loads
+
+DEFAULT_FIXTURES_DIR = os.path.join(os.path.dirname(__file__), '..', '..', 'benchmarks', 'fixtures', 'llm')
+
+class ReplayMissError(LookupError):
+    """No fixture recorded for a request in replay mode"""
+
+def replay_mode() -> str:
+    mode = os.getenv('LLM_REPLAY', 'off').lower()
+    if mode not in ('off', 'record', 'replay'):
+        raise ValueError(f"LLM_REPLAY must be off, record or replay, not {mode!r}")
+    return mode
+
+def fixtures_dir() -> str:
+    return os.getenv('LLM_FIXTURES_DIR') or DEFAULT_FIXTURES_DIR
+
+def fixture_key(provider: str, model: str, operation: str, request: Dict) -> str:
+    # Sorted keys so the hash doesn't depend on dict order (orjson can't sort)
+    canonical = json.dumps({'provider': provider, 'model': model, 'operation': operation,
+                            'request': request}, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()[:24]
+
+# =====================================================
+# Provider Adapters
+# =====================================================
+
+# Each provider's response is stored as a plain dict holding only what the
+# services read, and replayed as an object with the same attributes.
+
+def _groq_to_record(completion) -> Dict:
+    usage = completion.usage
+    return {
+        'content': completion.choices[0].message.content,
+        'prompt_tokens': usage.prompt_tokens if usage else None,
+        'completion_tokens': usage.completion_tokens if usage else None,
+    }
+
+def _groq_from_record(data: Dict):
+    usage = None
+    if data.get('prompt_tokens') is not None:
+        usage = SimpleNamespace(prompt_tokens=data['prompt_tokens'],
+                                completion_tokens=data['completion_tokens'])
+    message = SimpleNamespace(content=data['content'])
+    return SimpleNamespace(choices=[SimpleNamespace(message=message)], usage=usage)
+
+def _gemini_to_record(response) -> Dict:
+    try:
+        text = response.text
+    except ValueError:
+        # Blocked or empty responses have no text
+        text = None
+    feedback = getattr(response, 'prompt_feedback', None)
+    usage = getattr(response, 'usage_metadata', None)
+    return {
+        'text': text,
+        'block_reason': int(feedback.block_reason) if feedback and feedback.block_reason else None,
+        'candidate_tokens': [getattr(c, 'token_count', 0) or 0
+                             for c in getattr(response, 'candidates', None) or []],
+        'usage': {
+            'prompt_token_count': getattr(usage, 'prompt_token_count', None),
+            'candidates_token_count': getattr(usage, 'candidates_token_count', None),
+        } if usage else None,
+    }
+
+def _gemini_from_record(data: Dict):
+    usage = data.get('usage')
+    return SimpleNamespace(
+        text=data['text'],
+        prompt_feedback=SimpleNamespace(block_reason=data.get('block_reason')),
+        candidates=[SimpleNamespace(token_count=count) for count in data.get('candidate_tokens', [])],
+        usage_metadata=SimpleNamespace(**usage) if usage else None,
+    )
+
+ADAPTERS = {
+    'groq': (_groq_to_record, _groq_from_record),
+    'gemini': (_gemini_to_record, _gemini_from_record),
+}
+
+# =====================================================
+# Recording and Replay
+# =====================================================
+
+def recorded_call(provider: str, model: str, operation: str, request: Dict, call: Callable):
+    """Make (or, when recording or replaying, record or replay) one LLM call.
+
+    request must hold everything that determines the response (prompt or
+    messages and generation settings); call makes the live request.
+    """
+    mode = replay_mode()
+    if mode == 'off':
+        return call()
+    to_record, from_record = ADAPTERS[provider]
+    key = fixture_key(provider, model, operation, request)
+    if mode == 'replay':
+        fixture = _load(provider, operation, key)
+        _simulate_latency(fixture.get('latency_seconds'))
+        return from_record(fixture['response'])
+
+    start = time.perf_counter()
+    response = call()
+    _save(provider, operation, key, {
+        'provider': provider,
+        'model': model,
+        'operation': operation,
+        'request': request,
+        'response': to_record(response),
+        'latency_seconds': round(time.perf_counter() - start, 4),
+    })
+    return response
+
+def _operation_dir(provider: str, operation: str) -> str:
+    return os.path.join(fixtures_dir(), provider, operation)
+
+def _load(provider: str, operation: str, key: str) -> Dict:
+    directory = _operation_dir(provider, operation)
+    path = os.path.join(directory, f'{key}.json')
+    if not os.path.exists(path):
+        if os.getenv('LLM_REPLAY_MATCH', 'exact').lower() != 'operation':
+            raise ReplayMissError(f"No {provider} {operation} fixture {key} in {directory}; "
+                                  f"record it with LLM_REPLAY=record")
+        candidates = sorted(name for name in os.listdir(directory)
+                            if name.endswith('.json')) if os.path.isdir(directory) else []
+        if not candidates:
+            raise ReplayMissError(f"No {provider} {operation} fixtures in {directory}")
+        path = os.path.join(directory, candidates[int(key, 16) % len(candidates)])
+    with open(path, encoding='utf-8') as f:
+        return loads(f.read())
+
+def _save(provider: str, operation: str, key: str, fixture: Dict) -> None:
+    directory = _operation_dir(provider, operation)
+    os.makedirs(directory, exist_ok=True)
+    # Write then rename, so concurrent workers never leave a partial fixture
+    fd, temp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        f.write(dumps(fixture, indent=True))
+    os.replace(temp_path, os.path.join(directory, f'{key}.json'))
+
+def _simulate_latency(recorded: float) -> None:
+    setting = os.getenv('LLM_REPLAY_LATENCY', 'none').lower()
+    if setting == 'none':
+        return
+    delay = recorded if setting == 'recorded' else float(setting)
+    if delay:
+        time.sleep(delay)
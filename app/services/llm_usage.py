@@ -0,0 +1,89 @@
+"""Per-call LLM token and cost ledger.
+
+GroqService and GeminiService report every call through record_usage(). It
+counts the tokens in the Prometheus metrics and appends a row to llm_usage
+(migrations/011_llm_usage_ledger.sql), tagged with the sprint and session of
+the enclosing usage_context():
+
+    with usage_context(sprint_id, session_token):
+        chat_ai.conduct_interview(...)
+
+Cost is estimated from LLM_PRICING (USD per million prompt/completion
+tokens), overridable with the LLM_PRICING environment variable as JSON, e.g.
+'{"llama-3.1-8b-instant": [0.05, 0.08]}'. Set LLM_LEDGER_ENABLED=false to
+keep only the metrics.
+"""
+import logging
+import os
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Optional
+from app.json_provider import loads
+from app.metrics import record_llm_tokens
+from app.services import registry
+
+logger = logging.getLogger(__name__)
+
+# List prices, USD per million (prompt, completion) tokens
+LLM_PRICING = {
+    'llama-3.1-8b-instant': (0.05, 0.08),
+    'gemini-3-flash-preview': (0.50, 3.00),
+}
+
+# Rough size of a token in characters, for providers that don't report one
+CHARS_PER_TOKEN = 4
+
+_context: ContextVar[Dict] = ContextVar('llm_usage_context', default={})
+
+@contextmanager
+def usage_context(sprint_id: str = None, session_token: str = None):
+    """Attribute LLM calls made inside the block to this sprint and session"""
+    token = _context.set({'sprint_id': sprint_id, 'session_token': session_token})
+    try:
+        yield
+    finally:
+        _context.reset(token)
+
+def get_pricing() -> Dict:
+    pricing = dict(LLM_PRICING)
+    override = os.getenv('LLM_PRICING')
+    if override:
+        pricing.update({model: tuple(prices) for model, prices in loads(override).items()})
+    return pricing
+
+def estimate_tokens(text: str) -> int:
+    return max(1, len(text) // CHARS_PER_TOKEN) if text else 0
+
+def call_cost(model: str, prompt_tokens: int, completion_tokens: int) -> float:
+    """Estimated USD cost of one call; 0 for models without a price"""
+    prompt_price, completion_price = get_pricing().get(model, (0.0, 0.0))
+    return (prompt_tokens * prompt_price + completion_tokens * completion_price) / 1_000_000
+
+def record_usage(provider: str, model: str, call_type: str, prompt_tokens: Optional[int],
+                 completion_tokens: Optional[int], latency_seconds: float = None,
+                 prompt_chars: int = None, tokens_estimated: bool = False) -> None:
+    """Count one call's tokens and append it to the ledger; never raises"""
+    record_llm_tokens(provider, call_type, prompt_tokens, completion_tokens)
+    if os.getenv('LLM_LEDGER_ENABLED', 'true').lower() != 'true':
+        return
+
+    prompt_tokens = prompt_tokens or 0
+    completion_tokens = completion_tokens or 0
+    context = _context.get()
+    try:
+        registry.database.record_llm_usage({
+            'sprint_id': context.get('sprint_id'),
+            'session_token': context.get('session_token'),
+            'provider': provider,
+            'model': model,
+            'call_type': call_type,
+            'prompt_tokens': prompt_tokens,
+            'completion_tokens': completion_tokens,
+            'tokens_estimated': tokens_estimated,
+            'prompt_chars': prompt_chars,
+            'latency_ms': int(latency_seconds * 1000) if latency_seconds is not None else None,
+            'cost_usd': round(call_cost(model, prompt_tokens, completion_tokens), 6),
+        })
+    except Exception as e:
+        # Losing a ledger row must never fail the user's request
+        logger.warning("Failed to record LLM usage: %s", e)
@@ -0,0 +1,595 @@
+from psycopg import sql
+from psycopg.rows import dict_row
+from psycopg.types.json import Jsonb, set_json_dumps, set_json_loads
+from psycopg_pool import ConnectionPool
+from typing import List, Dict, Optional, Iterator
+from contextlib import contextmanager
+from datetime import date, datetime
+from uuid import UUID
+import os
+import threading
+from app.services.database_service import DatabaseService, generate_access_code
+from app.json_provider import dumps, loads
+
+# Decode and encode JSONB with the app's fast JSON functions
+set_json_loads(loads)
+set_json_dumps(dumps)
+
+def _to_json_value(value):
+    """Convert driver types to the JSON-friendly values PostgREST returns"""
+    if isinstance(value, UUID):
+        return str(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+def _json_row(cursor):
+    """Row factory returning dicts shaped like Supabase responses"""
+    make_dict = dict_row(cursor)
+    def make_row(values):
+        return {key: _to_json_value(value) for key, value in make_dict(values).items()}
+    return make_row
+
+def _adapt(value):
+    """Wrap dicts and lists so they are sent as JSONB"""
+    if isinstance(value, (dict, list)):
+        return Jsonb(value)
+    return value
+
+def _columns(columns: str) -> sql.Composable:
+    """Turn a PostgREST-style column list ('*' or 'a, b') into safe SQL"""
+    if columns.strip() == '*':
+        return sql.SQL('*')
+    return sql.SQL(', ').join(sql.Identifier(c.strip()) for c in columns.split(','))
+
+class PostgresDatabaseService:
+    """Database operations over a pooled direct Postgres connection.
+
+    Drop-in alternative to DatabaseService (same method surface and return
+    shapes) that skips the PostgREST HTTP hop, prepares repeated statements
+    and supports real multi-statement transactions. Select it with
+    DATABASE_BACKEND=postgres and DATABASE_URL.
+    """
+
+    # Keyset cursors are shared with the Supabase backend
+    encode_cursor = staticmethod(DatabaseService.encode_cursor)
+    _decode_cursor = staticmethod(DatabaseService._decode_cursor)
+
+    def __init__(self, dsn: str = None):
+        dsn = dsn or os.getenv('DATABASE_URL')
+        if not dsn:
+            raise ValueError("DATABASE_URL not found in environment variables")
+        self.pool = ConnectionPool(
+            dsn,
+            min_size=int(os.getenv('DATABASE_POOL_MIN_SIZE', 1)),
+            max_size=int(os.getenv('DATABASE_POOL_MAX_SIZE', 10)),
+            # Prepare statements server-side from their second execution
+            kwargs={'row_factory': _json_row, 'prepare_threshold': 1},
+            open=True
+        )
+        self._local = threading.local()
+
+    # =====================================================
+    # Connection & Query Helpers
+    # =====================================================
+
+    @contextmanager
+    def _connection(self):
+        """Reuse the connection of an open transaction, else borrow one from the pool"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            yield conn
+            return
+        with self.pool.connection() as conn:
+            yield conn
+
+    @contextmanager
+    def transaction(self):
+        """Run the enclosed calls in one transaction; nested use creates a savepoint"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            with conn.transaction():
+                yield self
+            return
+        with self.pool.connection() as conn:
+            self._local.conn = conn
+            try:
+                with conn.transaction():
+                    yield self
+            finally:
+                self._local.conn = None
+
+    def _fetch_all(self, query, params=None) -> List[Dict]:
+        with self._connection() as conn:
+            return conn.execute(query, params).fetchall()
+
+    def _fetch_one(self, query, params=None) -> Optional[Dict]:
+        with self._connection() as conn:
+            return conn.execute(query, params).fetchone()
+
+    def _execute(self, query, params=None) -> int:
+        """Run a statement and return the affected row count"""
+        with self._connection() as conn:
+            return conn.execute(query, params).rowcount
+
+    def _insert(self, table: str, data: Dict) -> Optional[Dict]:
+        """Insert a row and return it"""
+        query = sql.SQL('INSERT INTO {} ({}) VALUES ({}) RETURNING *').format(
+            sql.Identifier(table),
+            sql.SQL(', ').join(sql.Identifier(k) for k in data),
+            sql.SQL(', ').join(sql.Placeholder() * len(data))
+        )
+        return self._fetch_one(query, [_adapt(v) for v in data.values()])
+
+    def _update(self, table: str, updates: Dict, where: Dict) -> List[Dict]:
+        """Update rows matching all where-equalities and return them"""
+        query = sql.SQL('UPDATE {} SET {} WHERE {} RETURNING *').format(
+            sql.Identifier(table),
+            sql.SQL(', ').join(sql.SQL('{} = %s').format(sql.Identifier(k)) for k in updates),
+            sql.SQL(' AND ').join(sql.SQL('{} = %s').format(sql.Identifier(k)) for k in where)
+        )
+        params = [_adapt(v) for v in updates.values()] + list(where.values())
+        return self._fetch_all(query, params)
+
+    def _paginate(self, query: str, params: list, limit: int = None, cursor: str = None,
+                  alias: str = '') -> tuple:
+        """Append newest-first keyset filter, ordering and limit to a WHERE query"""
+        prefix = f'{alias}.' if alias else ''
+        if cursor:
+            created_at, row_id = self._decode_cursor(cursor)
+            query += (f' AND ({prefix}created_at < %s'
+                      f' OR ({prefix}created_at = %s AND {prefix}id < %s))')
+            params = params + [created_at, created_at, row_id]
+        query += f' ORDER BY {prefix}created_at DESC, {prefix}id DESC'
+        if limit:
+            query += ' LIMIT %s'
+            params = params + [limit]
+        return query, params
+
+    # =====================================================
+    # Sprint Operations
+    # =====================================================
+
+    def create_sprint(self, sprint_data: Dict) -> Dict:
+        """Create a new sprint"""
+        return self._insert('sprints', sprint_data)
+
+    def get_sprint(self, sprint_id: str) -> Optional[Dict]:
+        """Get sprint by ID"""
+        return self._fetch_one('SELECT * FROM sprints WHERE id = %s', [sprint_id])
+
+    def get_sprint_by_token(self, token: str) -> Optional[Dict]:
+        """Get sprint by share token"""
+        return self._fetch_one('SELECT * FROM sprints WHERE share_token = %s', [token])
+
+    def get_all_sprints(self, limit: int = None, cursor: str = None) -> List[Dict]:
+        """Get sprints newest first, optionally one keyset page at a time"""
+        query, params = self._paginate('SELECT * FROM sprints WHERE TRUE', [], limit, cursor)
+        return self._fetch_all(query, params)
+
+    def update_sprint_status(self, sprint_id: str, status: str) -> Dict:
+        """Update sprint status"""
+        rows = self._update('sprints', {'status': status}, {'id': sprint_id})
+        return rows[0] if rows else None
+
+    def get_sprint_submission_counts(self, sprint_id: str) -> Optional[Dict]:
+        """Get trigger-maintained team_size, submitted_count and response_count for a sprint"""
+        return self._fetch_one(
+            'SELECT team_size, submitted_count, response_count FROM sprints WHERE id = %s',
+            [sprint_id]
+        )
+
+    def get_sprint_version(self, sprint_id: str) -> Optional[int]:
+        """Get the trigger-maintained row_version of a sprint, or None if it doesn't exist"""
+        row = self._fetch_one('SELECT row_version FROM sprints WHERE id = %s', [sprint_id])
+        return row['row_version'] if row else None
+
+    def get_sprints_by_creator(self, user_id: str, limit: int = None, cursor: str = None) -> List[Dict]:
+        """Get sprints created by a specific user, newest first"""
+        query, params = self._paginate(
+            'SELECT * FROM sprints WHERE created_by = %s', [user_id], limit, cursor
+        )
+        return self._fetch_all(query, params)
+
+    # =====================================================
+    # Team Member Operations
+    # =====================================================
+
+    def add_team_member(self, sprint_id: str, name: str, role: str = None) -> Dict:
+        """Add a team member to a sprint"""
+        return self._insert('team_members', {'sprint_id': sprint_id, 'name': name, 'role': role})
+
+    def get_team_members(self, sprint_id: str) -> List[Dict]:
+        """Get all team members for a sprint"""
+        return self._fetch_all('SELECT * FROM team_members WHERE sprint_id = %s', [sprint_id])
+
+    def get_member_sprints(self, email: str, limit: int = None, cursor: str = None) -> List[Dict]:
+        """Get sprints a member is assigned to, newest first"""
+        query, params = self._paginate(
+            'SELECT s.* FROM sprints s WHERE EXISTS ('
+            'SELECT 1 FROM team_members t WHERE t.sprint_id = s.id AND t.email = %s)',
+            [email], limit, cursor, alias='s'
+        )
+        return self._fetch_all(query, params)
+
+    def get_member_dashboard(self, email: str, limit: int = None, cursor: str = None) -> List[Dict]:
+        """Get a member's sprints with submission status, active session and last activity"""
+        query, params = self._paginate(
+            'SELECT * FROM member_sprint_dashboard WHERE member_email = %s',
+            [email], limit, cursor
+        )
+        return self._fetch_all(query, params)
+
+    def mark_member_submitted(self, sprint_id: str, user_name: str) -> None:
+        """Mark a team member as having submitted"""
+        self._update('team_members',
+                     {'has_submitted': True, 'submitted_at': datetime.utcnow()},
+                     {'sprint_id': sprint_id, 'name': user_name})
+
+    # =====================================================
+    # Conversation Session Operations
+    # =====================================================
+
+    def create_session(self, sprint_id: str, session_token: str, member_id: str = None) -> Dict:
+        """Create a new conversation session"""
+        return self._insert('conversation_sessions', {
+            'sprint_id': sprint_id,
+            'session_token': session_token,
+            'conversation_history': [],
+            'team_member_id': member_id
+        })
+
+    def get_active_session(self, sprint_id: str, member_id: str) -> Optional[Dict]:
+        """Get an existing active session for a team member"""
+        return self._fetch_one(
+            'SELECT * FROM conversation_sessions WHERE sprint_id = %s AND team_member_id = %s '
+            'ORDER BY created_at DESC LIMIT 1',
+            [sprint_id, member_id]
+        )
+
+    def bootstrap_chat_session(self, access_code: str, session_token: str) -> Dict:
+        """Validate access code and get or create the member's session in one round trip"""
+        row = self._fetch_one('SELECT bootstrap_chat_session(%s, %s) AS result',
+                              [access_code, session_token])
+        return row['result'] if row and row['result'] else {'status': 'invalid_code'}
+
+    def get_conversation_history(self, session_token: str) -> List[Dict]:
+        """Get conversation history for a session"""
+        row = self._fetch_one(
+            'SELECT conversation_history FROM conversation_sessions WHERE session_token = %s',
+            [session_token]
+        )
+        return (row.get('conversation_history') or []) if row else []
+
+    def save_conversation_state(self, session_token: str, conversation: List[Dict]) -> None:
+        """Update conversation history for a session"""
+        self._execute(
+            'UPDATE conversation_sessions SET conversation_history = %s WHERE session_token = %s',
+            [Jsonb(conversation), session_token]
+        )
+
+    def archive_conversation_sessions(self, submitted_before: datetime, stale_before: datetime,
+                                      batch_size: int = 500, dry_run: bool = False) -> Dict:
+        """Move one batch of submitted/stale sessions into conversation_sessions_archive"""
+        row = self._fetch_one('SELECT archive_conversation_sessions(%s, %s, %s, %s) AS result',
+                              [submitted_before, stale_before, batch_size, dry_run])
+        return row['result']
+
+    # =====================================================
+    # Response Operations
+    # =====================================================
+
+    def save_response(self, sprint_id: str, user_name: str, is_anonymous: bool,
+                      conversation: List[Dict], session_token: str, summary_data: Dict = None) -> str:
+        """Save a completed retrospective response"""
+        row = self._insert('responses', {
+            'sprint_id': sprint_id,
+            'user_name': user_name if not is_anonymous else 'Anonymous',
+            'is_anonymous': is_anonymous,
+            'conversation': conversation,
+            'session_token': session_token,
+            'summary_data': summary_data
+        })
+        return row['id'] if row else None
+
+    def get_sprint_responses(self, sprint_id: str, columns: str = '*') -> List[Dict]:
+        """Get all responses for a sprint, optionally projecting only some columns"""
+        query = sql.SQL('SELECT {} FROM responses WHERE sprint_id = %s').format(_columns(columns))
+        return self._fetch_all(query, [sprint_id])
+
+    def count_sprint_responses(self, sprint_id: str) -> int:
+        """Count responses for a sprint without transferring any rows"""
+        row = self._fetch_one('SELECT COUNT(*) AS count FROM responses WHERE sprint_id = %s', [sprint_id])
+        return row['count'] if row else 0
+
+    def get_response_conversations(self, response_ids: List[str]) -> Dict[str, List[Dict]]:
+        """Map response id -> conversation for the given responses"""
+        if not response_ids:
+            return {}
+        rows = self._fetch_all('SELECT id, conversation FROM responses WHERE id = ANY(%s::uuid[])',
+                               [list(response_ids)])
+        return {row['id']: row['conversation'] for row in rows}
+
+    def get_response_user_texts(self, response_ids: List[str], max_chars: int = 500) -> Dict[str, str]:
+        """Map response id -> the first max_chars of its user messages joined by spaces"""
+        if not response_ids:
+            return {}
+        return self._fetch_one('SELECT response_user_texts(%s::uuid[], %s) AS result',
+                               [list(response_ids), max_chars])['result']
+
+    def get_response_message_counts(self, response_ids: List[str]) -> Dict[str, Dict]:
+        """Map response id -> {'message_count', 'user_message_count'} of its conversation"""
+        if not response_ids:
+            return {}
+        return self._fetch_one('SELECT response_message_counts(%s::uuid[]) AS result',
+                               [list(response_ids)])['result']
+
+    def iter_sprint_responses(self, sprint_id: str, columns: str = '*',
+                              batch_size: int = 100) -> Iterator[List[Dict]]:
+        """Yield a sprint's responses in batches of at most batch_size rows"""
+        yield from self.iter_sprint_rows('responses', sprint_id, columns, batch_size)
+
+    def iter_sprint_rows(self, table: str, sprint_id: str, columns: str = '*',
+                         batch_size: int = 100) -> Iterator[List[Dict]]:
+        """Yield a sprint's rows from table in id order, batch_size rows at a time"""
+        if columns != '*' and 'id' not in [c.strip() for c in columns.split(',')]:
+            columns = f'id, {columns}'
+
+        query = sql.SQL(
+            'SELECT {} FROM {} WHERE sprint_id = %s AND (%s::uuid IS NULL OR id > %s::uuid) '
+            'ORDER BY id LIMIT %s'
+        ).format(_columns(columns), sql.Identifier(table))
+
+        last_id = None
+        while True:
+            batch = self._fetch_all(query, [sprint_id, last_id, last_id, batch_size])
+            if not batch:
+                return
+            yield batch
+            if len(batch) < batch_size:
+                return
+            last_id = batch[-1]['id']
+
+    # =====================================================
+    # Analysis Report Operations
+    # =====================================================
+
+    def save_analysis_report(self, sprint_id: str, report_data: Dict) -> str:
+        """Save analysis report"""
+        row = self._insert('analysis_reports', {
+            'sprint_id': sprint_id,
+            'themes': report_data.get('themes', []),
+            'recommendations': report_data.get('recommendations', []),
+            'sentiment_summary': report_data.get('sentiment_summary', {}),
+            'analysis_duration_seconds': report_data.get('analysis_duration_seconds', 0)
+        })
+        return row['id'] if row else None
+
+    def get_analysis_report(self, sprint_id: str) -> Optional[Dict]:
+        """Get analysis report for a sprint"""
+        return self._fetch_one('SELECT * FROM analysis_reports WHERE sprint_id = %s', [sprint_id])
+
+    def get_analysis_report_version(self, sprint_id: str) -> Optional[Dict]:
+        """Get just the id and generated_at of a sprint's analysis report"""
+        return self._fetch_one('SELECT id, generated_at FROM analysis_reports WHERE sprint_id = %s',
+                               [sprint_id])
+
+    # =====================================================
+    # Action Item Operations
+    # =====================================================
+
+    def create_action_item(self, action_data: Dict) -> str:
+        """Create an action item"""
+        row = self._insert('action_items', action_data)
+        return row['id'] if row else None
+
+    def update_action_item_status(self, item_id: str, status: str) -> None:
+        """Update action item status"""
+        update_data = {'status': status}
+        if status == 'done':
+            update_data['completed_at'] = datetime.utcnow()
+        self._update('action_items', update_data, {'id': item_id})
+
+    def get_action_items(self, sprint_id: str) -> List[Dict]:
+        """Get all action items for a sprint"""
+        return self._fetch_all('SELECT * FROM action_items WHERE sprint_id = %s', [sprint_id])
+
+    # =====================================================
+    # LLM Usage Operations
+    # =====================================================
+
+    def record_llm_usage(self, entry: Dict) -> None:
+        """Append one LLM call to the llm_usage ledger"""
+        self._insert('llm_usage', entry)
+
+    def get_sprint_llm_usage(self, sprint_id: str) -> Dict:
+        """Token and cost totals for a sprint, overall and per call type/provider/model"""
+        return self._fetch_one('SELECT sprint_llm_usage(%s) AS result', [sprint_id])['result']
+
+    def get_top_llm_usage_sprints(self, since: datetime = None, limit: int = 20) -> List[Dict]:
+        """Sprints with the highest LLM cost since a point in time (all time when None)"""
+        return self._fetch_one('SELECT top_llm_usage_sprints(%s, %s) AS result', [since, limit])['result']
+
+    # =====================================================
+    # Project Operations
+    # =====================================================
+
+    def create_project(self, project_data: Dict) -> Dict:
+        """Create a new project"""
+        return self._insert('projects', project_data)
+
+    def get_project(self, project_id: str) -> Optional[Dict]:
+        """Get project by ID"""
+        return self._fetch_one('SELECT * FROM projects WHERE id = %s', [project_id])
+
+    def get_all_projects(self) -> List[Dict]:
+        """Get all projects ordered by creation date"""
+        return self._fetch_all('SELECT * FROM projects ORDER BY created_at DESC')
+
+    def get_projects_by_creator(self, user_id: str, limit: int = None, cursor: str = None) -> List[Dict]:
+        """Get projects created by a specific user, newest first"""
+        query, params = self._paginate(
+            'SELECT * FROM projects WHERE created_by = %s', [user_id], limit, cursor
+        )
+        return self._fetch_all(query, params)
+
+    def migrate_project_ownership(self, old_identifier: str, new_user_id: str) -> int:
+        """Update projects and sprints from old identifier (name) to new user_id"""
+        with self.transaction():
+            p_count = self._execute('UPDATE projects SET created_by = %s WHERE created_by = %s',
+                                    [new_user_id, old_identifier])
+            s_count = self._execute('UPDATE sprints SET created_by = %s WHERE created_by = %s',
+                                    [new_user_id, old_identifier])
+        return p_count + s_count
+
+    def update_project(self, project_id: str, updates: Dict) -> Dict:
+        """Update project details"""
+        rows = self._update('projects', updates, {'id': project_id})
+        return rows[0] if rows else None
+
+    def get_sprints_by_project(self, project_id: str, limit: int = None, cursor: str = None) -> List[Dict]:
+        """Get sprints associated with a project, newest first"""
+        query, params = self._paginate(
+            'SELECT * FROM sprints WHERE project_id = %s', [project_id], limit, cursor
+        )
+        return self._fetch_all(query, params)
+
+    def get_project_team_members(self, project_id: str) -> List[Dict]:
+        """Get all team members from sprints associated with a project"""
+        return self._fetch_all(
+            'SELECT t.name, t.role, t.email FROM team_members t '
+            'JOIN sprints s ON s.id = t.sprint_id WHERE s.project_id = %s',
+            [project_id]
+        )
+
+    # =====================================================
+    # Enhanced Team Member Operations
+    # =====================================================
+
+    def add_team_member_with_details(self, sprint_id: str, name: str, role: str,
+                                     email: str = None, access_code: str = None) -> Dict:
+        """Add a team member with full details including email and access code"""
+        return self._insert('team_members', {
+            'sprint_id': sprint_id,
+            'name': name,
+            'role': role,
+            'email': email,
+            'access_code': access_code or generate_access_code()
+        })
+
+    def get_team_member_by_code(self, access_code: str) -> Optional[Dict]:
+        """Get team member by their unique access code, with the sprint nested under 'sprints'"""
+        return self._fetch_one(
+            'SELECT t.*, to_jsonb(s) AS sprints FROM team_members t '
+            'LEFT JOIN sprints s ON s.id = t.sprint_id WHERE t.access_code = %s',
+            [access_code]
+        )
+
+    def get_team_member_by_id(self, member_id: str) -> Optional[Dict]:
+        """Get team member by ID"""
+        return self._fetch_one('SELECT * FROM team_members WHERE id = %s', [member_id])
+
+    def get_team_member_by_email(self, sprint_id: str, email: str) -> Optional[Dict]:
+        """Get a sprint's team member by email (point lookup, no roster scan)"""
+        return self._fetch_one(
+            'SELECT * FROM team_members WHERE sprint_id = %s AND email = %s LIMIT 1',
+            [sprint_id, email]
+        )
+
+    def set_team_member_access_code(self, member_id: str, access_code: str) -> None:
+        """Set a team member's access code"""
+        self._update('team_members', {'access_code': access_code}, {'id': member_id})
+
+    def update_team_member_invite_sent(self, member_id: str) -> None:
+        """Mark that invite was sent to a team member"""
+        self._update('team_members', {'invite_sent_at': datetime.utcnow()}, {'id': member_id})
+
+    def mark_member_submitted_by_id(self, member_id: str) -> None:
+        """Mark a team member as having submitted by their ID"""
+        self._update('team_members',
+                     {'has_submitted': True, 'submitted_at': datetime.utcnow()},
+                     {'id': member_id})
+
+    # =====================================================
+    # Sprint Goals Operations
+    # =====================================================
+
+    def add_sprint_goal(self, sprint_id: str, goal_text: str, display_order: int = 0) -> Dict:
+        """Add a goal to a sprint"""
+        return self._insert('sprint_goals', {
+            'sprint_id': sprint_id,
+            'goal_text': goal_text,
+            'display_order': display_order
+        })
+
+    def get_sprint_goals(self, sprint_id: str) -> List[Dict]:
+        """Get all goals for a sprint ordered by display order"""
+        return self._fetch_all(
+            'SELECT * FROM sprint_goals WHERE sprint_id = %s ORDER BY display_order', [sprint_id]
+        )
+
+    def delete_sprint_goals(self, sprint_id: str) -> None:
+        """Delete all goals for a sprint"""
+        self._execute('DELETE FROM sprint_goals WHERE sprint_id = %s', [sprint_id])
+
+    # =====================================================
+    # Sprint Outcomes Operations
+    # =====================================================
+
+    def save_sprint_outcomes(self, sprint_id: str, progress_summary: str,
+                             what_went_well: str, what_went_wrong: str) -> Dict:
+        """Save or update sprint outcomes (progress, what went right/wrong)"""
+        return self._fetch_one(
+            'INSERT INTO sprint_outcomes (sprint_id, progress_summary, what_went_well, what_went_wrong) '
+            'VALUES (%s, %s, %s, %s) ON CONFLICT (sprint_id) DO UPDATE SET '
+            'progress_summary = EXCLUDED.progress_summary, '
+            'what_went_well = EXCLUDED.what_went_well, '
+            'what_went_wrong = EXCLUDED.what_went_wrong '
+            'RETURNING *',
+            [sprint_id, progress_summary, what_went_well, what_went_wrong]
+        )
+
+    def get_sprint_outcomes(self, sprint_id: str) -> Optional[Dict]:
+        """Get outcomes for a sprint"""
+        return self._fetch_one('SELECT * FROM sprint_outcomes WHERE sprint_id = %s', [sprint_id])
+
+    # =====================================================
+    # Sprint with Related Data Operations
+    # =====================================================
+
+    def get_sprint_with_context(self, sprint_id: str) -> Optional[Dict]:
+        """Get sprint with project, goals, and outcomes for AI context in one query"""
+        row = self._fetch_one(
+            'SELECT to_jsonb(s) AS sprint, '
+            '  COALESCE((SELECT jsonb_agg(to_jsonb(g) ORDER BY g.display_order) '
+            '            FROM sprint_goals g WHERE g.sprint_id = s.id), \'[]\'::jsonb) AS goals, '
+            '  (SELECT to_jsonb(o) FROM sprint_outcomes o WHERE o.sprint_id = s.id) AS outcomes, '
+            '  (SELECT to_jsonb(p) FROM projects p WHERE p.id = s.project_id) AS project '
+            'FROM sprints s WHERE s.id = %s',
+            [sprint_id]
+        )
+        if not row:
+            return None
+
+        sprint = row['sprint']
+        sprint['goals'] = row['goals']
+        sprint['outcomes'] = row['outcomes']
+        if sprint.get('project_id'):
+            sprint['project'] = row['project']
+        return sprint
+
+    # =====================================================
+    # Sprint Comparison Operations
+    # =====================================================
+
+    def save_sprint_comparison(self, comparison_data: Dict) -> str:
+        """Save sprint comparison"""
+        row = self._insert('sprint_comparisons', comparison_data)
+        return row['id'] if row else None
+
+    def get_sprint_comparison(self, current_sprint_id: str, previous_sprint_id: str) -> Optional[Dict]:
+        """Get comparison between two sprints"""
+        return self._fetch_one(
+            'SELECT * FROM sprint_comparisons WHERE current_sprint_id = %s AND previous_sprint_id = %s',
+            [current_sprint_id, previous_sprint_id]
+        )
@@ -0,0 +1,85 @@
+"""Lazily built, process-local service instances.
+
+Blueprints hold LazyService proxies (database, groq, gemini, analysis) instead
+of constructing services at import time. Each service and its heavy client
+library are created on first use, once per process, and discarded in a child
+after fork, so gunicorn --preload workers never share clients or sockets with
+the master.
+"""
+import os
+import threading
+import time
+from typing import Dict
+
+def _create_database():
+    from app.services.database_service import create_database_service
+    return create_database_service()
+
+def _create_groq():
+    from app.services.groq_service import GroqService
+    return GroqService()
+
+def _create_gemini():
+    from app.services.gemini_service import GeminiService
+    return GeminiService()
+
+def _create_analysis():
+    from app.services.analysis_service import AnalysisService
+    return AnalysisService()
+
+FACTORIES = {
+    'database': _create_database,
+    'groq': _create_groq,
+    'gemini': _create_gemini,
+    'analysis': _create_analysis,
+}
+
+_instances = {}
+_init_times = {}
+# Re-entrant: building 'analysis' fetches 'gemini' and 'database'
+_lock = threading.RLock()
+
+def get_service(name: str):
+    """The process's instance of a service, created on first call"""
+    instance = _instances.get(name)
+    if instance is None:
+        with _lock:
+            instance = _instances.get(name)
+            if instance is None:
+                start = time.perf_counter()
+                instance = FACTORIES[name]()
+                _init_times[name] = time.perf_counter() - start
+                _instances[name] = instance
+    return instance
+
+def service_init_times() -> Dict[str, float]:
+    """Seconds spent constructing each service created so far in this process"""
+    return dict(_init_times)
+
+def reset_services() -> None:
+    """Forget every instance; the next access builds fresh ones"""
+    global _lock
+    _instances.clear()
+    _init_times.clear()
+    _lock = threading.RLock()
+
+# A forked worker must not reuse the parent's HTTP clients, pools or locks
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=reset_services)
+
+class LazyService:
+    """Module-level stand-in that forwards attribute access to get_service(name)"""
+
+    def __init__(self, name: str):
+        self._name = name
+
+    def __getattr__(self, attr):
+        return getattr(get_service(self._name), attr)
+
+    def __repr__(self):
+        return f'<LazyService {self._name}>'
+
+database = LazyService('database')
+groq = LazyService('groq')
+gemini = LazyService('gemini')
+analysis = LazyService('analysis')
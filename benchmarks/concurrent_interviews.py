@@ -0,0 +1,167 @@
+"""Measure how many concurrent interviews each gunicorn worker mode sustains.
+
+Starts a fake Groq endpoint that answers after a fixed delay (standing in
+for LLM latency), seeds a sprint with one member per simulated participant,
+then for each worker mode launches `gunicorn -c gunicorn.conf.py wsgi:app`
+against the Postgres backend and ramps up concurrent participants. Each one
+repeatedly POSTs /api/chat/message. Reports throughput and latency per level,
+and the highest level whose p95 stays under --slo with under 1% errors:
+
+    python -m benchmarks.concurrent_interviews \\
+        --dsn postgresql://postgres@localhost:5432/retro_local \\
+        --modes gthread gevent sync --levels 8 32 64 128 --workers 2
+
+Migrations must already be applied (scripts.local_postgres.setup_database).
+"""
+import argparse
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import threading
+import time
+import httpx
+from app.services.postgres_database_service import PostgresDatabaseService
+from benchmarks.compare_database_backends import seed_fixture
+from benchmarks.fake_services import start_fake_groq
+
+ROOT = os.path.join(os.path.dirname(__file__), '..')
+
+def seed_participants(dsn: str, count: int) -> list:
+    """Access codes for count fresh members of a new sprint"""
+    db = PostgresDatabaseService(dsn)
+    try:
+        fixture = seed_fixture(db, team_size=1, turns=2)
+        codes = []
+        with db.transaction():
+            for i in range(count):
+                member = db.add_team_member_with_details(
+                    fixture['sprint_id'], f'Participant {i}', 'Developer',
+                    f"{fixture['user_id']}-p{i}@example.com"
+                )
+                codes.append(member['access_code'])
+        return codes
+    finally:
+        db.pool.close()
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+def start_gunicorn(mode: str, port: int, env: dict) -> subprocess.Popen:
+    """Launch gunicorn in mode and wait until it accepts requests"""
+    env = dict(env, WSGI_WORKER_MODE=mode, PORT=str(port), WSGI_ACCESS_LOG='')
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', 'wsgi:app'],
+        cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True
+    )
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f'gunicorn ({mode}) exited: {process.stderr.read()[-2000:]}')
+        try:
+            httpx.get(f'http://127.0.0.1:{port}/api/chat/validate-code/warmup', timeout=5)
+            return process
+        except httpx.TransportError:
+            time.sleep(0.2)
+    process.kill()
+    raise RuntimeError(f'gunicorn ({mode}) did not start within 30s')
+
+def run_level(base_url: str, codes: list, duration: float) -> dict:
+    """Run one participant per code for duration seconds"""
+    latencies, errors = [], []
+    lock = threading.Lock()
+    stop_at = time.perf_counter() + duration
+
+    def participant(code):
+        with httpx.Client(base_url=base_url, timeout=180) as client:
+            try:
+                client.get(f'/api/chat/validate-code/{code}').raise_for_status()
+            except httpx.HTTPError as e:
+                with lock:
+                    errors.append(e)
+                return
+            while time.perf_counter() < stop_at:
+                start = time.perf_counter()
+                try:
+                    client.post('/api/chat/message',
+                                json={'message': 'We shipped the export feature.'}).raise_for_status()
+                    with lock:
+                        latencies.append(time.perf_counter() - start)
+                except httpx.HTTPError as e:
+                    with lock:
+                        errors.append(e)
+
+    threads = [threading.Thread(target=participant, args=(code,)) for code in codes]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    ordered = sorted(latencies)
+    total = len(latencies) + len(errors)
+    return {
+        'requests': len(latencies),
+        'errors': len(errors),
+        'error_rate': len(errors) / total if total else 1.0,
+        'throughput': len(latencies) / elapsed,
+        'p50': statistics.median(ordered) if ordered else float('nan'),
+        'p95': ordered[int(len(ordered) * 0.95) - 1] if ordered else float('nan'),
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Concurrent interviews per gunicorn worker mode')
+    parser.add_argument('--dsn', default=os.getenv('DATABASE_URL'), help='Postgres DSN with migrations applied')
+    parser.add_argument('--modes', nargs='+', default=['gthread', 'gevent'],
+                        choices=['gthread', 'gevent', 'sync'])
+    parser.add_argument('--levels', nargs='+', type=int, default=[8, 32, 64, 128],
+                        help='Concurrent participants to try, in increasing order')
+    parser.add_argument('--workers', type=int, default=2, help='WEB_CONCURRENCY for every mode')
+    parser.add_argument('--latency', type=float, default=1.0, help='Fake Groq response delay (s)')
+    parser.add_argument('--duration', type=float, default=10.0, help='Seconds per level')
+    parser.add_argument('--slo', type=float, default=3.0, help='p95 latency budget (s)')
+    args = parser.parse_args(argv)
+    if not args.dsn:
+        parser.error('--dsn or DATABASE_URL is required')
+
+    groq = start_fake_groq(args.latency)
+    codes = seed_participants(args.dsn, max(args.levels))
+    env = dict(
+        os.environ,
+        DATABASE_BACKEND='postgres', DATABASE_URL=args.dsn, CACHE_BACKEND='memory',
+        GROQ_API_KEY=os.getenv('GROQ_API_KEY', 'bench'), GEMINI_API_KEY=os.getenv('GEMINI_API_KEY', 'bench'),
+        GROQ_BASE_URL=f'http://127.0.0.1:{groq.server_address[1]}',
+        WEB_CONCURRENCY=str(args.workers), FLASK_ENV='production',
+    )
+
+    print(f"Fake LLM latency {args.latency:.2f}s, {args.workers} workers, p95 budget {args.slo:.1f}s")
+    header = f"{'mode':<10}{'clients':>9}{'req/s':>10}{'p50':>10}{'p95':>10}{'errors':>9}"
+    print(header)
+    print('-' * len(header))
+    sustained = {}
+    for mode in args.modes:
+        port = free_port()
+        process = start_gunicorn(mode, port, env)
+        try:
+            for level in args.levels:
+                result = run_level(f'http://127.0.0.1:{port}', codes[:level], args.duration)
+                print(f"{mode:<10}{level:>9}{result['throughput']:>10.1f}{result['p50']:>9.2f}s"
+                      f"{result['p95']:>9.2f}s{result['errors']:>9}")
+                if result['p95'] > args.slo or result['error_rate'] > 0.01:
+                    break
+                sustained[mode] = level
+        finally:
+            process.terminate()
+            process.wait(timeout=60)
+
+    print()
+    for mode in args.modes:
+        print(f"{mode:<10} sustains {sustained.get(mode, 0)} concurrent interviews")
+    groq.shutdown()
+
+if __name__ == '__main__':
+    main()
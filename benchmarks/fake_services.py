@@ -0,0 +1,492 @@
+"""Local stand-ins for Groq, Gemini and the Supabase REST API.
+
+Each fake is a threaded HTTP server that waits for a latency drawn from a
+configurable distribution and fails a configurable fraction of requests with
+a 503, so the app can be load-tested without spending API quota:
+
+    groq = start_fake(FakeGroqHandler, latency='lognormal:0.6,0.4', error_rate=0.02)
+    gemini = start_fake(FakeGeminiHandler, latency='lognormal:2,0.5')
+    supabase = start_fake_supabase(dsn, latency='uniform:0.005,0.03')
+
+Point the app at them with GROQ_BASE_URL, GEMINI_API_ENDPOINT (with
+GEMINI_TRANSPORT=rest) and SUPABASE_URL. The Groq fake walks through the
+8-question interview, and the Gemini fake answers each analysis prompt
+with JSON of the expected shape. The Supabase fake translates the PostgREST
+requests DatabaseService makes into SQL against a local Postgres with the
+migrations applied. That covers filters, or=/and= trees, order, limit,
+exact counts, insert, upsert, update, delete and rpc; embedded resources
+such as select=*,sprints(*) are answered with a 501.
+"""
+import json
+import math
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, unquote, urlsplit
+import psycopg
+from psycopg import sql
+from psycopg.types.json import Jsonb
+from psycopg_pool import ConnectionPool
+
+# =====================================================
+# Latency and Failure Injection
+# =====================================================
+
+class Latency:
+    """Delay distribution parsed from a spec string, in seconds:
+
+        0.5                 fixed
+        uniform:0.2,1.0     uniform between the bounds
+        normal:0.8,0.2      mean, standard deviation (clipped at 0)
+        lognormal:0.6,0.4   median, sigma of the underlying normal
+        exp:0.5             exponential with this mean
+    """
+
+    def __init__(self, spec):
+        self.spec = str(spec)
+        kind, _, raw = self.spec.partition(':')
+        if not raw:
+            kind, raw = 'fixed', kind
+        try:
+            params = [float(value) for value in raw.split(',')]
+        except ValueError:
+            raise ValueError(f'Invalid latency spec: {spec!r}')
+        samplers = {
+            'fixed': (1, lambda value: value),
+            'uniform': (2, random.uniform),
+            'normal': (2, lambda mean, std: max(0.0, random.gauss(mean, std))),
+            'lognormal': (2, lambda median, sigma: random.lognormvariate(math.log(median), sigma)),
+            'exp': (1, lambda mean: random.expovariate(1 / mean) if mean > 0 else 0.0),
+        }
+        if kind not in samplers or len(params) != samplers[kind][0]:
+            raise ValueError(f'Invalid latency spec: {spec!r}')
+        self._sample = samplers[kind][1]
+        self.params = params
+
+    def sample(self) -> float:
+        return self._sample(*self.params)
+
+    def __repr__(self):
+        return f'Latency({self.spec!r})'
+
+class FakeServer(ThreadingHTTPServer):
+    """Counts calls and injected failures; handlers read latency and error_rate from it"""
+    daemon_threads = True
+
+    def __init__(self, handler_class, latency, error_rate: float):
+        super().__init__(('127.0.0.1', 0), handler_class)
+        self.latency = latency if isinstance(latency, Latency) else Latency(latency)
+        self.error_rate = error_rate
+        self.calls = 0
+        self.injected_errors = 0
+        self._lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        return f'http://127.0.0.1:{self.server_address[1]}'
+
+    def count(self, failed: bool) -> None:
+        with self._lock:
+            self.calls += 1
+            self.injected_errors += failed
+
+    def stats(self) -> dict:
+        return {'calls': self.calls, 'injected_errors': self.injected_errors}
+
+class _FakeHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    # Body sent with an injected 503, in the provider's error format
+    unavailable = {'error': {'message': 'Service unavailable'}}
+
+    def do_GET(self):
+        self._handle()
+
+    def do_POST(self):
+        self._handle()
+
+    def do_PATCH(self):
+        self._handle()
+
+    def do_DELETE(self):
+        self._handle()
+
+    def _handle(self) -> None:
+        length = int(self.headers.get('Content-Length', 0))
+        raw = self.rfile.read(length) if length else b''
+        failed = random.random() < self.server.error_rate
+        self.server.count(failed)
+        time.sleep(self.server.latency.sample())
+        if failed:
+            self.send_json(503, self.unavailable)
+            return
+        self.respond(json.loads(raw) if raw else None)
+
+    def respond(self, body) -> None:
+        raise NotImplementedError
+
+    def send_json(self, status: int, payload=None, headers: dict = None, raw: str = None) -> None:
+        data = (raw if raw is not None else json.dumps(payload)).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+def start_fake(handler_class, latency='0', error_rate: float = 0.0, **attrs) -> FakeServer:
+    """Serve handler_class on a free local port in a background thread"""
+    server = FakeServer(handler_class, latency, error_rate)
+    for name, value in attrs.items():
+        setattr(server, name, value)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+# =====================================================
+# Groq
+# =====================================================
+
+class FakeGroqHandler(_FakeHandler):
+    """OpenAI-style chat completions that step through the 8-question interview"""
+    unavailable = {'error': {'message': 'Service unavailable', 'type': 'server_error'}}
+
+    def respond(self, body) -> None:
+        messages = (body or {}).get('messages') or []
+        system = messages[0]['content'] if messages else ''
+        # Follow GroqService's instructions: which marker to include, and
+        # completion once 8 questions are answered
+        answered = re.search(r'User has answered (\d+) question', system)
+        marker = re.search(r'include (\[Q:\d/8\])', system)
+        if answered and int(answered.group(1)) >= 8:
+            content = 'Thank you, that covers everything. [INTERVIEW_COMPLETE]'
+        else:
+            content = f"Thanks! What slowed the team down this sprint? {marker.group(1) if marker else '[Q:2/8]'}"
+        prompt_tokens = sum(len(m.get('content') or '') for m in messages) // 4
+        completion_tokens = len(content) // 4
+        self.send_json(200, {
+            'id': 'fake', 'object': 'chat.completion', 'created': int(time.time()),
+            'model': (body or {}).get('model', 'llama-3.1-8b-instant'),
+            'choices': [{'index': 0, 'finish_reason': 'stop',
+                         'message': {'role': 'assistant', 'content': content}}],
+            'usage': {'prompt_tokens': prompt_tokens, 'completion_tokens': completion_tokens,
+                      'total_tokens': prompt_tokens + completion_tokens},
+        })
+
+def start_fake_groq(latency: float) -> FakeServer:
+    return start_fake(FakeGroqHandler, latency)
+
+# =====================================================
+# Gemini
+# =====================================================
+
+FAKE_SUMMARY = {
+    'went_well': ['Pairing on the export feature'],
+    'challenges': ['Flaky CI on the staging branch'],
+    'improvements': ['Split large stories before planning'],
+    'team_feedback': ['Reviews were quick and helpful'],
+    'sentiment': 'positive',
+    'key_quotes': ['We shipped the export feature.'],
+    'summary': 'A productive sprint slowed down by CI instability.',
+}
+
+FAKE_THEMES = {'themes': [
+    {'name': 'Staging CI Instability', 'category': 'Critical Issue', 'frequency': '3 out of 5',
+     'percentage': 60, 'impact': 'Merges wait hours for green builds',
+     'quotes': ['CI kept failing'], 'mentioned_by': ['Anonymous'], 'severity': 'high'},
+    {'name': 'Effective Pair Programming', 'category': 'Success', 'frequency': '2 out of 5',
+     'percentage': 40, 'impact': 'Faster onboarding on the export work',
+     'quotes': ['Pairing helped'], 'mentioned_by': ['Anonymous'], 'severity': 'low'},
+]}
+
+FAKE_RECOMMENDATIONS = {'recommendations': [
+    {'theme': 'Staging CI Instability', 'priority': 'High', 'action_items': [
+        {'action': 'Quarantine the three flakiest integration tests', 'effort_estimate': '1 day',
+         'impact': 'high', 'owner_suggestion': 'Tech Lead'}]},
+]}
+
+class FakeGeminiHandler(_FakeHandler):
+    """generateContent over REST, answering each GeminiService prompt in its expected shape"""
+    unavailable = {'error': {'code': 503, 'message': 'The model is overloaded.', 'status': 'UNAVAILABLE'}}
+
+    def respond(self, body) -> None:
+        prompt = ''.join(part.get('text', '') for content in (body or {}).get('contents', [])
+                         for part in content.get('parts', []))
+        if '"score"' in prompt:
+            text = json.dumps({'score': round(random.uniform(-1, 1), 2)})
+        elif '"went_well"' in prompt:
+            text = json.dumps(FAKE_SUMMARY)
+        elif 'recommendations' in prompt and 'Themes:' in prompt:
+            text = json.dumps(FAKE_RECOMMENDATIONS)
+        elif '"themes"' in prompt:
+            text = json.dumps(FAKE_THEMES)
+        else:
+            text = 'Thanks for sharing. What would you change next sprint? [Q:2/8]'
+        self.send_json(200, {
+            'candidates': [{
+                'content': {'parts': [{'text': text}], 'role': 'model'},
+                'finishReason': 'STOP', 'index': 0, 'tokenCount': len(text) // 4,
+            }],
+            'promptFeedback': {'safetyRatings': []},
+        })
+
+# =====================================================
+# Supabase (PostgREST)
+# =====================================================
+
+class UnsupportedQuery(Exception):
+    """A PostgREST feature this fake doesn't implement"""
+
+_OPERATORS = {'eq': '=', 'neq': '<>', 'gt': '>', 'gte': '>=', 'lt': '<', 'lte': '<=',
+              'like': 'LIKE', 'ilike': 'ILIKE'}
+_IS_VALUES = {'null': 'NULL', 'true': 'TRUE', 'false': 'FALSE', 'unknown': 'UNKNOWN'}
+_RESERVED_PARAMS = {'select', 'order', 'limit', 'offset', 'on_conflict', 'columns'}
+
+def _split_top_level(text: str) -> list:
+    """Split on commas outside parentheses and double quotes"""
+    parts, depth, quoted, current = [], 0, False, ''
+    for char in text:
+        if char == '"':
+            quoted = not quoted
+        elif not quoted and char in '()':
+            depth += 1 if char == '(' else -1
+        elif not quoted and depth == 0 and char == ',':
+            parts.append(current)
+            current = ''
+            continue
+        current += char
+    if current:
+        parts.append(current)
+    return parts
+
+def _unquote(value: str) -> str:
+    if len(value) >= 2 and value[0] == value[-1] == '"':
+        return value[1:-1].replace('\\"', '"')
+    return value
+
+def _column(name: str):
+    if '.' in name or '->' in name:
+        raise UnsupportedQuery(f'Filters on embedded or JSON paths are not supported: {name}')
+    return sql.Identifier(name)
+
+def _condition(column: str, expression: str, params: list):
+    """SQL for one PostgREST filter such as 'eq.5', 'not.in.(a,b)' or 'is.null'"""
+    negate = expression.startswith('not.')
+    if negate:
+        expression = expression[len('not.'):]
+    operator, _, value = expression.partition('.')
+    target = _column(column)
+    if operator in _OPERATORS:
+        value = _unquote(value)
+        if operator in ('like', 'ilike'):
+            value = value.replace('*', '%')
+        params.append(value)
+        clause = sql.SQL('{} {} %s').format(target, sql.SQL(_OPERATORS[operator]))
+    elif operator == 'is' and value.lower() in _IS_VALUES:
+        clause = sql.SQL('{} IS {}').format(target, sql.SQL(_IS_VALUES[value.lower()]))
+    elif operator == 'in' and value.startswith('(') and value.endswith(')'):
+        values = [_unquote(item) for item in _split_top_level(value[1:-1])]
+        if not values:
+            clause = sql.SQL('FALSE')
+        else:
+            params.extend(values)
+            clause = sql.SQL('{} IN ({})').format(target, sql.SQL(', ').join([sql.SQL('%s')] * len(values)))
+    else:
+        raise UnsupportedQuery(f'Unsupported filter: {column}={expression}')
+    return sql.SQL('NOT ({})').format(clause) if negate else clause
+
+def _logic_tree(operator: str, body: str, params: list):
+    """SQL for an or=(...) / and=(...) tree, e.g. (a.lt.1,and(a.eq.1,id.lt.5))"""
+    if not (body.startswith('(') and body.endswith(')')):
+        raise UnsupportedQuery(f'Invalid {operator} filter: {body}')
+    clauses = []
+    for item in _split_top_level(body[1:-1]):
+        negate = item.startswith('not.')
+        inner = item[len('not.'):] if negate else item
+        nested = re.match(r'^(and|or)(\(.*\))$', inner)
+        if nested:
+            clause = _logic_tree(nested.group(1), nested.group(2), params)
+            clauses.append(sql.SQL('NOT ({})').format(clause) if negate else clause)
+        else:
+            column, _, expression = item.partition('.')
+            clauses.append(_condition(column, expression, params))
+    joiner = sql.SQL(' OR ' if operator == 'or' else ' AND ')
+    return sql.SQL('({})').format(joiner.join(clauses))
+
+def _where(query: list, params: list):
+    clauses = []
+    for key, value in query:
+        if key in _RESERVED_PARAMS:
+            continue
+        if key in ('or', 'and', 'not.or', 'not.and'):
+            clause = _logic_tree(key.split('.')[-1], value, params)
+            clauses.append(sql.SQL('NOT {}').format(clause) if key.startswith('not.') else clause)
+        else:
+            clauses.append(_condition(key, value, params))
+    if not clauses:
+        return sql.SQL('')
+    return sql.SQL(' WHERE ') + sql.SQL(' AND ').join(clauses)
+
+def _select_list(select: str):
+    items = [item.strip() for item in _split_top_level(select or '*') if item.strip()]
+    columns = []
+    for item in items:
+        if item == '*':
+            columns.append(sql.SQL('*'))
+        elif re.match(r'^[A-Za-z_][A-Za-z0-9_]*$', item):
+            columns.append(sql.Identifier(item))
+        else:
+            raise UnsupportedQuery(f'Embedded resources and casts are not supported: {item}')
+    return sql.SQL(', ').join(columns)
+
+def _order_by(order: str):
+    if not order:
+        return sql.SQL('')
+    terms = []
+    for item in order.split(','):
+        column, *modifiers = item.strip().split('.')
+        term = _column(column)
+        for modifier in modifiers:
+            if modifier not in ('asc', 'desc', 'nullsfirst', 'nullslast'):
+                raise UnsupportedQuery(f'Unsupported order: {item}')
+            term = sql.SQL('{} {}').format(term, sql.SQL(
+                {'nullsfirst': 'NULLS FIRST', 'nullslast': 'NULLS LAST'}.get(modifier, modifier.upper())
+            ))
+        terms.append(term)
+    return sql.SQL(' ORDER BY ') + sql.SQL(', ').join(terms)
+
+def _rows_as_json(statement, alias: str = 'r'):
+    """Wrap a row-returning statement so it yields one JSON array as text"""
+    return sql.SQL("WITH {alias} AS ({statement}) SELECT coalesce(json_agg({alias}), '[]')::text FROM {alias}").format(
+        alias=sql.Identifier(alias), statement=statement
+    )
+
+class FakeSupabaseHandler(_FakeHandler):
+    """PostgREST at /rest/v1 over a Postgres connection pool (server.pool)"""
+    unavailable = {'code': 'PGRST000', 'message': 'Could not connect to the database',
+                   'details': None, 'hint': None}
+
+    def respond(self, body) -> None:
+        parts = urlsplit(self.path)
+        path = unquote(parts.path)
+        query = parse_qsl(parts.query, keep_blank_values=True)
+        prefer = self.headers.get('Prefer', '')
+        try:
+            if path.startswith('/rest/v1/rpc/'):
+                self._rpc(path[len('/rest/v1/rpc/'):], body or {})
+            elif path.startswith('/rest/v1/'):
+                self._table(self.command, path[len('/rest/v1/'):], query, prefer, body)
+            else:
+                self.send_json(404, {'message': f'No route for {path}'})
+        except UnsupportedQuery as e:
+            self.send_json(501, {'code': 'PGRST501', 'message': str(e), 'details': None, 'hint': None})
+        except psycopg.Error as e:
+            status = {'23505': 409, '42P01': 404, '42883': 404}.get(e.sqlstate, 400)
+            self.send_json(status, {'code': e.sqlstate, 'message': str(e).splitlines()[0],
+                                    'details': None, 'hint': None})
+
+    def _table(self, method: str, table: str, query: list, prefer: str, body) -> None:
+        params = dict(query)
+        name = sql.Identifier(table)
+        values = []
+        if method == 'GET':
+            statement = sql.SQL('SELECT {} FROM {}').format(_select_list(params.get('select')), name)
+            statement += _where(query, values) + _order_by(params.get('order'))
+            if params.get('limit'):
+                statement += sql.SQL(' LIMIT {}').format(sql.Literal(int(params['limit'])))
+            if params.get('offset'):
+                statement += sql.SQL(' OFFSET {}').format(sql.Literal(int(params['offset'])))
+            status = 200
+        elif method == 'POST':
+            rows = body if isinstance(body, list) else [body]
+            columns = sorted({key for row in rows for key in row})
+            if not columns:
+                raise UnsupportedQuery('Inserting rows without columns is not supported')
+            column_list = sql.SQL(', ').join(map(sql.Identifier, columns))
+            statement = sql.SQL('INSERT INTO {name} ({columns}) SELECT {columns} '
+                                'FROM json_populate_recordset(NULL::{name}, %s::json)').format(
+                name=name, columns=column_list)
+            values.append(json.dumps(rows))
+            if 'resolution=' in prefer:
+                targets = params.get('on_conflict')
+                target = sql.SQL('({})').format(sql.SQL(', ').join(
+                    _column(c.strip()) for c in targets.split(','))) if targets else sql.SQL('ON CONSTRAINT {}').format(
+                    sql.Identifier(f'{table}_pkey'))
+                if 'resolution=ignore-duplicates' in prefer:
+                    statement += sql.SQL(' ON CONFLICT {} DO NOTHING').format(target)
+                else:
+                    statement += sql.SQL(' ON CONFLICT {} DO UPDATE SET {}').format(target, sql.SQL(', ').join(
+                        sql.SQL('{0} = EXCLUDED.{0}').format(sql.Identifier(c)) for c in columns))
+            statement += sql.SQL(' RETURNING *')
+            status = 201
+        elif method == 'PATCH':
+            columns = sorted(body or {})
+            if not columns:
+                raise UnsupportedQuery('Updates without columns are not supported')
+            column_list = sql.SQL(', ').join(map(sql.Identifier, columns))
+            statement = sql.SQL('UPDATE {name} SET ({columns}) = (SELECT {columns} '
+                                'FROM json_populate_record(NULL::{name}, %s::json))').format(
+                name=name, columns=column_list)
+            values.append(json.dumps(body))
+            statement += _where(query, values) + sql.SQL(' RETURNING *')
+            status = 200
+        elif method == 'DELETE':
+            statement = sql.SQL('DELETE FROM {}').format(name) + _where(query, values) + sql.SQL(' RETURNING *')
+            status = 200
+        else:
+            raise UnsupportedQuery(f'Unsupported method {method}')
+
+        headers = {}
+        with self.server.pool.connection() as conn:
+            data = conn.execute(_rows_as_json(statement), values).fetchone()[0]
+            if 'count=exact' in prefer:
+                if method == 'GET':
+                    count_values = []
+                    where = _where(query, count_values)
+                    total = conn.execute(sql.SQL('SELECT count(*) FROM {}').format(name) + where,
+                                         count_values).fetchone()[0]
+                else:
+                    total = len(json.loads(data))
+                returned = len(json.loads(data))
+                headers['Content-Range'] = f'0-{returned - 1}/{total}' if returned else f'*/{total}'
+        if 'return=minimal' in prefer and method != 'GET':
+            self.send_json(204 if status == 200 else status, headers=headers, raw='')
+            return
+        self.send_json(status, headers=headers, raw=data)
+
+    def _rpc(self, function: str, arguments: dict) -> None:
+        with self.server.pool.connection() as conn:
+            returns_set = conn.execute(
+                'SELECT bool_or(proretset) FROM pg_proc WHERE proname = %s', [function]
+            ).fetchone()[0]
+            if returns_set is None:
+                raise psycopg.errors.UndefinedFunction(f'function {function} does not exist')
+            # Like PostgREST, read each JSON argument as the parameter's declared type
+            arg_types = dict(conn.execute(
+                'SELECT unnest(proargnames), unnest(proargtypes::regtype[])::text '
+                'FROM pg_proc WHERE proname = %s', [function]
+            ).fetchall())
+            values, named = [], []
+            for key, value in arguments.items():
+                arg_type = arg_types.get(key, 'jsonb')
+                if isinstance(value, (dict, list)) and arg_type in ('json', 'jsonb'):
+                    value = Jsonb(value)
+                named.append(sql.SQL('{} => %s::{}').format(sql.Identifier(key), sql.SQL(arg_type)))
+                values.append(value)
+            call = sql.SQL('{}({})').format(sql.Identifier(function), sql.SQL(', ').join(named))
+            if returns_set:
+                statement = sql.SQL("SELECT coalesce(json_agg(r), '[]')::text FROM {} r").format(call)
+            else:
+                statement = sql.SQL('SELECT to_json({})::text').format(call)
+            data = conn.execute(statement, values).fetchone()[0]
+        self.send_json(200, raw=data if data is not None else 'null')
+
+def start_fake_supabase(dsn: str, latency='0', error_rate: float = 0.0,
+                        pool_size: int = 20) -> FakeServer:
+    """Fake Supabase REST API backed by the Postgres at dsn (migrations applied)"""
+    pool = ConnectionPool(dsn, min_size=2, max_size=pool_size, open=True)
+    return start_fake(FakeSupabaseHandler, latency, error_rate, pool=pool)
@@ -0,0 +1,124 @@
+"""Benchmark JSON serialization of realistic API payloads.
+
+Compares Flask's default provider with FastJSONProvider (orjson) and its
+stdlib fallback on an analysis report, a 50-turn chat history and a page of
+responses with datetime/UUID values, plus parsing a Gemini themes reply:
+
+    python -m benchmarks.json_serialization --iterations 2000
+"""
+import argparse
+import statistics
+import time
+import uuid
+from datetime import datetime, timedelta
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+import app.json_provider as json_provider
+from app.json_provider import FastJSONProvider
+
+SENTENCE = 'The staging deploy broke twice and we lost half a day waiting on CI — again. '
+
+def make_report(themes: int = 10, recommendations: int = 8) -> dict:
+    return {
+        'id': str(uuid.uuid4()),
+        'sprint_id': str(uuid.uuid4()),
+        'generated_at': datetime.utcnow().isoformat(),
+        'analysis_duration_seconds': 42,
+        'themes': [{
+            'name': f'Staging Environment Instability {i}',
+            'category': 'Critical Issue',
+            'frequency': '5 out of 8',
+            'percentage': 62.5,
+            'impact': SENTENCE * 2,
+            'quotes': [SENTENCE * 2 for _ in range(4)],
+            'mentioned_by': [f'Member {j}' for j in range(5)],
+            'severity': 'high',
+        } for i in range(themes)],
+        'recommendations': [{
+            'title': f'Stabilize staging {i}',
+            'description': SENTENCE * 3,
+            'priority': 'high',
+            'effort': 'medium',
+            'steps': [SENTENCE for _ in range(3)],
+        } for i in range(recommendations)],
+        'sentiment_summary': {'overall_mood': 'positive', 'positive_percentage': 50.0,
+                              'neutral_percentage': 30.0, 'negative_percentage': 20.0},
+    }
+
+def make_history(turns: int = 50) -> list:
+    return [{'role': 'ai' if i % 2 == 0 else 'user', 'content': SENTENCE * 4} for i in range(turns)]
+
+def make_responses(count: int = 100, turns: int = 20) -> list:
+    """Rows with native datetime/UUID values, as a driver returns them"""
+    start = datetime(2026, 1, 1)
+    return [{
+        'id': uuid.uuid4(),
+        'sprint_id': uuid.uuid4(),
+        'user_name': f'Member {i}',
+        'is_anonymous': False,
+        'submitted_at': start + timedelta(minutes=i),
+        'summary_data': {'went_well': ['Pairing'] * 3, 'challenges': [SENTENCE] * 2,
+                         'summary': SENTENCE * 2},
+        'conversation': make_history(turns),
+    } for i in range(count)]
+
+def time_call(func, iterations: int) -> list:
+    """Per-call latencies in microseconds, after one warm-up call"""
+    func()
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1e6)
+    return samples
+
+def stdlib_fallback(func):
+    """Run func with json_provider forced onto its stdlib fallback"""
+    def run():
+        saved, json_provider.orjson = json_provider.orjson, None
+        try:
+            return func()
+        finally:
+            json_provider.orjson = saved
+    return run
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark JSON serialization of API payloads')
+    parser.add_argument('--iterations', type=int, default=1000)
+    args = parser.parse_args(argv)
+
+    app = Flask(__name__)
+    default_provider = DefaultJSONProvider(app)
+    fast_provider = FastJSONProvider(app)
+    payloads = {
+        'report': make_report(),
+        'history (50 turns)': {'history': make_history(50)},
+        'responses (100 rows)': {'responses': make_responses(100)},
+    }
+    themes_reply = json_provider.dumps({'themes': make_report()['themes']})
+
+    cases = []
+    for name, payload in payloads.items():
+        # Flask's default provider can't encode UUIDs; give it the string form
+        plain = json_provider.loads(json_provider.dumps(payload))
+        cases.append((f'{name}: flask default', lambda p=plain: default_provider.response(p)))
+        cases.append((f'{name}: fast (stdlib)', stdlib_fallback(lambda p=payload: fast_provider.response(p))))
+        cases.append((f'{name}: fast (orjson)', lambda p=payload: fast_provider.response(p)))
+    cases.append(('parse themes reply: stdlib', stdlib_fallback(lambda: json_provider.loads(themes_reply))))
+    cases.append(('parse themes reply: orjson', lambda: json_provider.loads(themes_reply)))
+
+    print(f"orjson {'available' if json_provider.orjson else 'NOT installed'}")
+    header = f"{'case':<44}{'p50':>12}{'p95':>12}{'ops/s':>12}"
+    print(header)
+    print('-' * len(header))
+    with app.app_context():
+        for name, func in cases:
+            if 'orjson' in name and not json_provider.orjson:
+                continue
+            samples = time_call(func, args.iterations)
+            p50 = statistics.median(samples)
+            p95 = sorted(samples)[int(len(samples) * 0.95) - 1]
+            print(f"{name:<44}{p50:>10.1f}us{p95:>10.1f}us{1e6 / p50:>12.0f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,268 @@
+"""Load-test the interview and analysis flows against local fake services.
+
+Starts fake Groq, Gemini and Supabase servers (benchmarks/fake_services.py)
+with the given latency distributions and error rates, seeds --sprints
+sprints of --members members each in a local Postgres, and runs the app
+under gunicorn against them. Every simulated member then goes through the
+interview: validate their access code, answer the 8 questions (with
+--think seconds between answers) and submit. Once all of a sprint's
+members are done, an admin logs in, triggers its analysis and fetches the
+report. Reports throughput and p50/p95/p99 per endpoint:
+
+    python -m benchmarks.load_test --dsn postgresql://postgres@localhost:5432/retro_local \\
+        --sprints 4 --members 12 --groq-latency lognormal:0.6,0.4 --groq-errors 0.02 \\
+        --gemini-latency lognormal:2,0.5 --supabase-latency uniform:0.005,0.03
+
+Latencies take the specs of fake_services.Latency ('0.5', 'uniform:a,b',
+'normal:mean,std', 'lognormal:median,sigma', 'exp:mean'). With --backend
+postgres the app talks to the database directly and no Supabase fake is
+started. Migrations must already be applied (scripts.local_postgres.setup_database).
+"""
+import argparse
+import math
+import os
+import random
+import threading
+import time
+from collections import defaultdict
+import httpx
+from app.json_provider import dumps
+from app.services.postgres_database_service import PostgresDatabaseService
+from benchmarks.compare_database_backends import seed_fixture
+from benchmarks.concurrent_interviews import free_port, start_gunicorn
+from benchmarks.fake_services import (
+    FakeGeminiHandler, FakeGroqHandler, Latency, start_fake, start_fake_supabase
+)
+
+# Endpoint labels, in the order they are reported
+ENDPOINTS = [
+    'GET /api/chat/validate-code/<code>',
+    'POST /api/chat/message',
+    'POST /api/response/submit',
+    'POST /api/admin/login',
+    'POST /api/sprint/<id>/analyze',
+    'GET /api/sprint/<id>/report',
+]
+
+ANSWERS = [
+    'We shipped the export feature on time.',
+    'CI on the staging branch kept failing.',
+    'Pairing with the new developer worked well.',
+    'Stories were too large to finish in one sprint.',
+    'Code reviews were quick.',
+    'The product owner was hard to reach mid-sprint.',
+    'I would like fewer meetings on Thursdays.',
+    'Overall a good sprint.',
+]
+
+def percentile(ordered: list, q: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not ordered:
+        return float('nan')
+    return ordered[max(0, math.ceil(q / 100 * len(ordered)) - 1)]
+
+class Recorder:
+    """Collects latencies and failures per endpoint from many threads"""
+
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+        self.degraded = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def request(self, client: httpx.Client, endpoint: str, method: str, path: str, **kwargs):
+        """Send one request, recording it under endpoint; returns the response or None"""
+        start = time.perf_counter()
+        try:
+            response = client.request(method, path, **kwargs)
+        except httpx.HTTPError:
+            response = None
+        elapsed = time.perf_counter() - start
+        with self._lock:
+            if response is None or response.status_code >= 400:
+                self.errors[endpoint] += 1
+            else:
+                self.latencies[endpoint].append(elapsed)
+        return response if response is not None and response.status_code < 400 else None
+
+    def degrade(self, endpoint: str) -> None:
+        with self._lock:
+            self.degraded[endpoint] += 1
+
+    def summary(self, elapsed: float) -> list:
+        rows = []
+        for endpoint in ENDPOINTS:
+            ordered = sorted(self.latencies[endpoint])
+            if not ordered and not self.errors[endpoint]:
+                continue
+            rows.append({
+                'endpoint': endpoint,
+                'requests': len(ordered) + self.errors[endpoint],
+                'errors': self.errors[endpoint],
+                'degraded': self.degraded[endpoint],
+                'throughput': len(ordered) / elapsed,
+                'p50': percentile(ordered, 50),
+                'p95': percentile(ordered, 95),
+                'p99': percentile(ordered, 99),
+                'max': ordered[-1] if ordered else float('nan'),
+            })
+        return rows
+
+def seed_sprints(dsn: str, sprints: int, members: int) -> list:
+    """(sprint_id, [access codes]) for sprints fresh sprints of members members each"""
+    db = PostgresDatabaseService(dsn)
+    try:
+        seeded = []
+        for _ in range(sprints):
+            fixture = seed_fixture(db, team_size=1, turns=2)
+            with db.transaction():
+                codes = [
+                    db.add_team_member_with_details(
+                        fixture['sprint_id'], f'Member {i}', random.choice(['Developer', 'QA', 'Designer']),
+                        f"{fixture['user_id']}-m{i}@example.com"
+                    )['access_code']
+                    for i in range(members)
+                ]
+            seeded.append((fixture['sprint_id'], codes))
+        return seeded
+    finally:
+        db.pool.close()
+
+def run_member(base_url: str, code: str, recorder: Recorder, think: float, start_delay: float) -> None:
+    """One member's interview: validate the code, answer until complete, submit"""
+    time.sleep(start_delay)
+    with httpx.Client(base_url=base_url, timeout=180) as client:
+        if not recorder.request(client, ENDPOINTS[0], 'GET', f'/api/chat/validate-code/{code}'):
+            return
+        # A couple of extra turns for answers the fake LLM failed on
+        for turn in range(len(ANSWERS) + 2):
+            time.sleep(random.uniform(0, 2 * think))
+            response = recorder.request(client, ENDPOINTS[1], 'POST', '/api/chat/message',
+                                        json={'message': ANSWERS[min(turn, len(ANSWERS) - 1)]})
+            if response is None:
+                continue
+            body = response.json()
+            if body.get('interview_complete'):
+                break
+            # The app falls back to an apology without a question marker
+            if not body.get('question_number'):
+                recorder.degrade(ENDPOINTS[1])
+        recorder.request(client, ENDPOINTS[2], 'POST', '/api/response/submit',
+                         json={'is_anonymous': False})
+
+def run_admin(base_url: str, sprint_id: str, password: str, recorder: Recorder,
+              members_done: threading.Event) -> None:
+    """Analyze a sprint once its members are done, then fetch the report"""
+    members_done.wait()
+    with httpx.Client(base_url=base_url, timeout=600) as client:
+        if not recorder.request(client, ENDPOINTS[3], 'POST', '/api/admin/login',
+                                json={'password': password}):
+            return
+        if recorder.request(client, ENDPOINTS[4], 'POST', f'/api/sprint/{sprint_id}/analyze'):
+            recorder.request(client, ENDPOINTS[5], 'GET', f'/api/sprint/{sprint_id}/report')
+
+def run_load(base_url: str, seeded: list, password: str, think: float, ramp: float) -> tuple:
+    recorder = Recorder()
+    threads = []
+    for sprint_id, codes in seeded:
+        members = [threading.Thread(target=run_member,
+                                    args=(base_url, code, recorder, think, random.uniform(0, ramp)))
+                   for code in codes]
+        done = threading.Event()
+        admin = threading.Thread(target=run_admin, args=(base_url, sprint_id, password, recorder, done))
+        # Signal the admin once every member thread of this sprint has finished
+        waiter = threading.Thread(target=lambda ms=members, ev=done: ([m.join() for m in ms], ev.set()))
+        threads.extend(members + [admin, waiter])
+
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return recorder, time.perf_counter() - started
+
+def print_report(rows: list, elapsed: float, fakes: dict) -> None:
+    header = (f"{'endpoint':<38}{'requests':>9}{'errors':>8}{'req/s':>8}"
+              f"{'p50':>9}{'p95':>9}{'p99':>9}{'max':>9}")
+    print(header)
+    print('-' * len(header))
+    for row in rows:
+        print(f"{row['endpoint']:<38}{row['requests']:>9}{row['errors']:>8}{row['throughput']:>8.2f}"
+              f"{row['p50']:>8.2f}s{row['p95']:>8.2f}s{row['p99']:>8.2f}s{row['max']:>8.2f}s")
+    total = sum(row['requests'] - row['errors'] for row in rows)
+    print(f"\n{total} successful requests in {elapsed:.1f}s ({total / elapsed:.1f} req/s)")
+    degraded = {row['endpoint']: row['degraded'] for row in rows if row['degraded']}
+    for endpoint, count in degraded.items():
+        print(f"{endpoint}: {count} answers were LLM fallback messages")
+    print('\nFake services:')
+    for name, server in fakes.items():
+        stats = server.stats()
+        print(f"  {name:<10}{stats['calls']:>7} calls{stats['injected_errors']:>6} injected errors"
+              f"  latency {server.latency.spec}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Load-test interviews and analysis against fake services')
+    parser.add_argument('--dsn', default=os.getenv('DATABASE_URL'), help='Postgres DSN with migrations applied')
+    parser.add_argument('--backend', choices=['supabase', 'postgres'], default='supabase',
+                        help='supabase goes through the fake Supabase REST API')
+    parser.add_argument('--sprints', type=int, default=2)
+    parser.add_argument('--members', type=int, default=10, help='Members per sprint')
+    parser.add_argument('--think', type=float, default=1.0, help='Mean seconds between answers')
+    parser.add_argument('--ramp', type=float, default=5.0, help='Spread member start times over this many seconds')
+    parser.add_argument('--mode', choices=['gthread', 'gevent', 'sync'], default='gthread')
+    parser.add_argument('--workers', type=int, default=2, help='WEB_CONCURRENCY')
+    for service, latency in (('groq', 'lognormal:0.6,0.4'), ('gemini', 'lognormal:2,0.5'),
+                             ('supabase', 'uniform:0.005,0.03')):
+        parser.add_argument(f'--{service}-latency', type=Latency, default=Latency(latency),
+                            help=f'Fake {service} latency distribution (default {latency})')
+        parser.add_argument(f'--{service}-errors', type=float, default=0.0,
+                            help=f'Fraction of fake {service} calls that fail with a 503')
+    parser.add_argument('--json', help='Also write the results to this file')
+    args = parser.parse_args(argv)
+    if not args.dsn:
+        parser.error('--dsn or DATABASE_URL is required')
+
+    fakes = {
+        'groq': start_fake(FakeGroqHandler, args.groq_latency, args.groq_errors),
+        'gemini': start_fake(FakeGeminiHandler, args.gemini_latency, args.gemini_errors),
+    }
+    password = 'load-test'
+    env = dict(
+        os.environ,
+        DATABASE_URL=args.dsn, ADMIN_PASSWORD=password, FLASK_ENV='production',
+        GROQ_API_KEY='bench', GEMINI_API_KEY='bench', GROQ_BASE_URL=fakes['groq'].url,
+        GEMINI_API_ENDPOINT=fakes['gemini'].url, GEMINI_TRANSPORT='rest',
+        WEB_CONCURRENCY=str(args.workers), LOG_LEVEL=os.getenv('LOG_LEVEL', 'WARNING'),
+    )
+    if args.backend == 'supabase':
+        fakes['supabase'] = start_fake_supabase(args.dsn, args.supabase_latency, args.supabase_errors)
+        env.update(DATABASE_BACKEND='supabase', SUPABASE_URL=fakes['supabase'].url,
+                   SUPABASE_SERVICE_ROLE_KEY='bench.bench.bench')
+    else:
+        env.update(DATABASE_BACKEND='postgres')
+
+    seeded = seed_sprints(args.dsn, args.sprints, args.members)
+    print(f"{args.sprints} sprints x {args.members} members, {args.backend} backend, "
+          f"gunicorn {args.mode} x {args.workers}\n")
+    port = free_port()
+    process = start_gunicorn(args.mode, port, env)
+    try:
+        recorder, elapsed = run_load(f'http://127.0.0.1:{port}', seeded, password, args.think, args.ramp)
+    finally:
+        process.terminate()
+        process.wait(timeout=60)
+
+    rows = recorder.summary(elapsed)
+    print_report(rows, elapsed, fakes)
+    if args.json:
+        with open(args.json, 'w') as f:
+            f.write(dumps({
+                'elapsed_seconds': elapsed, 'endpoints': rows,
+                'fakes': {name: dict(server.stats(), latency=server.latency.spec)
+                          for name, server in fakes.items()},
+            }, indent=True))
+    for server in fakes.values():
+        server.shutdown()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,218 @@
+"""Micro-benchmarks for the CPU-side prompt building and analysis helpers.
+
+Times the helpers that run on every chat turn or analysis, on realistic and
+scaled-up fixtures: Groq message building over a 50-turn conversation,
+sprint context rendering, formatting 10 to 500 responses for the theme
+prompt, cleaning a fenced Gemini reply, comparing two sprint reports and
+parsing the interviewer's [Q:N/8] markers:
+
+    python -m benchmarks.microbenchmarks
+    python -m benchmarks.microbenchmarks --save-baseline     # on the reference machine
+    python -m benchmarks.microbenchmarks --check             # exit 1 on a regression
+
+Each run can be appended to --history (JSON lines with the commit and
+per-case medians) to track timings over time. --check compares every case's
+median against --baseline and fails if one is more than --tolerance slower.
+Baselines are machine-specific; record them where the check runs.
+"""
+import argparse
+import os
+import platform
+import statistics
+import subprocess
+import sys
+from datetime import datetime
+from app.json_provider import dumps, loads
+from benchmarks.json_serialization import SENTENCE, make_history, make_report, time_call
+
+BENCH_DIR = os.path.dirname(__file__)
+DEFAULT_BASELINE = os.path.join(BENCH_DIR, 'baselines', 'microbenchmarks.json')
+DEFAULT_HISTORY = os.path.join(BENCH_DIR, 'results', 'microbenchmarks.jsonl')
+
+# Response counts to format for the theme prompt
+RESPONSE_COUNTS = (10, 100, 500)
+
+def make_sprint_context(goals: int = 8) -> dict:
+    """What get_sprint_with_context returns for a sprint with a project, goals and outcomes"""
+    return {
+        'name': 'Sprint 42', 'start_date': '2026-01-05', 'end_date': '2026-01-18',
+        'project': {'name': 'Retro Platform', 'description': SENTENCE * 2},
+        'goals': [{'goal_text': f'Goal {i}: {SENTENCE}', 'display_order': i} for i in range(goals)],
+        'outcomes': {'progress_summary': SENTENCE * 3, 'went_well': SENTENCE * 2,
+                     'went_wrong': SENTENCE * 2},
+    }
+
+def make_analysis_rows(count: int, with_summary: bool = True) -> list:
+    """Rows as the analysis sees them: ANALYSIS_COLUMNS, plus conversation when there's no summary"""
+    rows = [{
+        'id': f'{i:08d}',
+        'user_name': f'Member {i}',
+        'summary_data': {
+            'went_well': [SENTENCE] * 3, 'challenges': [SENTENCE] * 3,
+            'improvements': [SENTENCE] * 2, 'team_feedback': [SENTENCE],
+            'sentiment': 'positive', 'summary': SENTENCE * 2,
+        } if with_summary else None,
+    } for i in range(count)]
+    for row in rows:
+        if not with_summary:
+            row['conversation'] = make_history(16)
+    return rows
+
+def make_fenced_reply(themes: int = 10) -> str:
+    """A themes reply the way Gemini sometimes wraps it"""
+    body = dumps({'themes': make_report(themes=themes)['themes']}, indent=True)
+    return f"Here is the analysis you asked for:\n```json\n{body}\n```\n"
+
+class ReportStore:
+    """Stands in for the database in compare_sprints"""
+
+    def __init__(self, reports: dict):
+        self.reports = reports
+
+    def get_analysis_report(self, sprint_id: str):
+        return self.reports.get(sprint_id)
+
+    def save_sprint_comparison(self, comparison: dict) -> str:
+        return 'comparison'
+
+def make_comparison_store(themes: int) -> ReportStore:
+    current, previous = make_report(themes=themes), make_report(themes=themes)
+    # Half the themes persist, the rest are new or resolved
+    for i, theme in enumerate(previous['themes']):
+        if i % 2:
+            theme['name'] = f'Resolved theme {i}'
+    return ReportStore({'current': current, 'previous': previous})
+
+def build_cases() -> list:
+    """(name, zero-argument callable) for every benchmarked helper"""
+    os.environ.setdefault('GROQ_API_KEY', 'bench')
+    os.environ.setdefault('GEMINI_API_KEY', 'bench')
+    from app.routes.chat import parse_interview_markers
+    from app.services.analysis_service import AnalysisService
+    from app.services.gemini_service import GeminiService
+    from app.services.groq_service import GroqService
+
+    groq, gemini = GroqService(), GeminiService()
+    context = make_sprint_context()
+    sprint_info = groq._build_sprint_context(context)
+    history = make_history(50)
+    guidance = groq._get_role_specific_guidance('Developer')
+    system_prompt = groq._load_prompt('interviewer.txt')
+
+    cases = [
+        ('groq: build messages (50 turns)',
+         lambda: groq._build_groq_messages(system_prompt, 'Member 1', 'Developer', sprint_info,
+                                           guidance, history, 'We shipped it.')),
+        ('groq: build sprint context', lambda: groq._build_sprint_context(context)),
+        ('gemini: build sprint context', lambda: gemini._build_sprint_context(context)),
+    ]
+    for count in RESPONSE_COUNTS:
+        rows = make_analysis_rows(count)
+        cases.append((f'gemini: format {count} responses',
+                      lambda rows=rows: gemini._format_responses_for_analysis(rows)))
+    raw_rows = make_analysis_rows(100, with_summary=False)
+    cases.append(('gemini: format 100 raw conversations',
+                  lambda: gemini._format_responses_for_analysis(raw_rows)))
+    reply = make_fenced_reply()
+    cases.append(('gemini: clean fenced themes reply', lambda: gemini._clean_json_string(reply)))
+    for themes in (10, 50):
+        # Skip __init__, which would build the database and Gemini services
+        analysis = AnalysisService.__new__(AnalysisService)
+        analysis.db = make_comparison_store(themes)
+        cases.append((f'analysis: compare sprints ({themes} themes)',
+                      lambda analysis=analysis: analysis.compare_sprints('current', 'previous')))
+    replies = [f'Thanks, that helps! {SENTENCE} What slowed you down? [Q:{i % 8 + 1}/8]' for i in range(8)]
+    replies.append('Thank you for your feedback! [INTERVIEW_COMPLETE]')
+    cases.append(('chat: parse interview markers (9 replies)',
+                  lambda: [parse_interview_markers(r) for r in replies]))
+    return cases
+
+def run_cases(cases: list, iterations: int, pattern: str = None) -> dict:
+    """Median and p95 per case, in microseconds"""
+    results = {}
+    for name, func in cases:
+        if pattern and pattern not in name:
+            continue
+        samples = sorted(time_call(func, iterations))
+        results[name] = {'median_us': round(statistics.median(samples), 2),
+                         'p95_us': round(samples[int(len(samples) * 0.95) - 1], 2)}
+    return results
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list:
+    """(name, baseline median, current median, ratio) for cases slower than tolerance allows"""
+    regressions = []
+    for name, result in results.items():
+        reference = baseline.get(name)
+        if not reference:
+            continue
+        ratio = result['median_us'] / reference['median_us']
+        if ratio > 1 + tolerance:
+            regressions.append((name, reference['median_us'], result['median_us'], ratio))
+    return regressions
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                              text=True, cwd=BENCH_DIR, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def write_json(path: str, content: str, append: bool = False) -> None:
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, 'a' if append else 'w') as f:
+        f.write(content + '\n')
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description='Micro-benchmark prompt building and analysis helpers')
+    parser.add_argument('--iterations', type=int, default=200)
+    parser.add_argument('--filter', help='Only run cases whose name contains this')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE)
+    parser.add_argument('--save-baseline', action='store_true', help='Write these results as the baseline')
+    parser.add_argument('--check', action='store_true', help='Exit 1 if a case regressed against the baseline')
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help='Allowed slowdown of a case median before --check fails (0.25 = 25%%)')
+    parser.add_argument('--history', nargs='?', const=DEFAULT_HISTORY,
+                        help=f'Append this run to a JSON-lines history (default {DEFAULT_HISTORY})')
+    args = parser.parse_args(argv)
+
+    results = run_cases(build_cases(), args.iterations, args.filter)
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = loads(f.read()).get('cases', {})
+
+    header = f"{'case':<44}{'median':>12}{'p95':>12}{'vs base':>10}"
+    print(header)
+    print('-' * len(header))
+    for name, result in results.items():
+        reference = baseline.get(name)
+        change = f"{result['median_us'] / reference['median_us'] - 1:>+9.0%}" if reference else '        -'
+        print(f"{name:<44}{result['median_us']:>10.1f}us{result['p95_us']:>10.1f}us {change}")
+
+    run = {
+        'timestamp': datetime.utcnow().isoformat() + 'Z',
+        'commit': git_commit(),
+        'python': platform.python_version(),
+        'machine': platform.node(),
+        'cases': results,
+    }
+    if args.history:
+        write_json(args.history, dumps(run), append=True)
+    if args.save_baseline:
+        write_json(args.baseline, dumps(run, indent=True))
+        print(f"\nBaseline written to {args.baseline}")
+
+    if args.check:
+        if not baseline:
+            print(f"\nNo baseline at {args.baseline}; record one with --save-baseline")
+            return 1
+        regressions = compare(results, baseline, args.tolerance)
+        for name, before, after, ratio in regressions:
+            print(f"REGRESSION {name}: {before:.1f}us -> {after:.1f}us ({ratio - 1:+.0%})")
+        if regressions:
+            return 1
+        print(f"\nNo case is more than {args.tolerance:.0%} slower than the baseline")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
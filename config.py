@@ -15,6 +15,42 @@ class Config:
     SUPABASE_ANON_KEY = os.getenv('SUPABASE_ANON_KEY')
     SUPABASE_SERVICE_ROLE_KEY = os.getenv('SUPABASE_SERVICE_ROLE_KEY')
     
+    # Database backend: 'supabase' (PostgREST) or 'postgres' (pooled direct connection)
+    DATABASE_BACKEND = os.getenv('DATABASE_BACKEND', 'supabase')
+    DATABASE_URL = os.getenv('DATABASE_URL')
+    
+    # Read-through database cache: 'none', 'memory' (per worker) or 'shared' (SQLite file per host)
+    CACHE_BACKEND = os.getenv('CACHE_BACKEND', 'none')
+    # Shared cache file; defaults to cache.sqlite3 in a per-user 0700 directory under the temp dir
+    CACHE_PATH = os.getenv('CACHE_PATH')
+    
+    # Response compression (gzip, or brotli when installed)
+    COMPRESS_ENABLED = os.getenv('COMPRESS_ENABLED', 'true').lower() == 'true'
+    COMPRESS_MIN_SIZE = int(os.getenv('COMPRESS_MIN_SIZE', '500'))
+    COMPRESS_GZIP_LEVEL = int(os.getenv('COMPRESS_GZIP_LEVEL', '6'))
+    COMPRESS_BROTLI_QUALITY = int(os.getenv('COMPRESS_BROTLI_QUALITY', '4'))
+    # Per-blueprint overrides, e.g. {'chat': {'min_size': 256}, 'admin': {'enabled': False}}
+    COMPRESS_BLUEPRINTS = {}
+    
+    # Prometheus metrics at /metrics (bearer token required when METRICS_TOKEN is set;
+    # with METRICS_REQUIRE_TOKEN and no token the endpoint is not served)
+    METRICS_ENABLED = os.getenv('METRICS_ENABLED', 'true').lower() == 'true'
+    METRICS_TOKEN = os.getenv('METRICS_TOKEN')
+    METRICS_REQUIRE_TOKEN = os.getenv('METRICS_REQUIRE_TOKEN', 'false').lower() == 'true'
+    
+    # Logging: JSON lines in production, DEBUG records kept for 1% of requests,
+    # prompt/response payloads never logged unless LOG_PAYLOADS is set
+    LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
+    LOG_FORMAT = os.getenv('LOG_FORMAT', 'json')
+    LOG_DEBUG_SAMPLE = float(os.getenv('LOG_DEBUG_SAMPLE', '0.01'))
+    LOG_PAYLOADS = os.getenv('LOG_PAYLOADS', 'false').lower() == 'true'
+    
+    # Request profiling: admins send "X-Profile: cpu[,memory]" to capture one
+    # request; nothing is registered unless PROFILING_ENABLED is set
+    PROFILING_ENABLED = os.getenv('PROFILING_ENABLED', 'false').lower() == 'true'
+    PROFILE_DIR = os.getenv('PROFILE_DIR', '/tmp/retro_profiles')
+    PROFILE_KEEP = int(os.getenv('PROFILE_KEEP', '50'))
+    
     # Admin
     ADMIN_PASSWORD = os.getenv('ADMIN_PASSWORD', 'admin123')
     
@@ -25,10 +61,15 @@ class Config:
 class DevelopmentConfig(Config):
     """Development configuration"""
     DEBUG = True
+    LOG_LEVEL = os.getenv('LOG_LEVEL', 'DEBUG')
+    LOG_FORMAT = os.getenv('LOG_FORMAT', 'text')
+    LOG_DEBUG_SAMPLE = float(os.getenv('LOG_DEBUG_SAMPLE', '1.0'))
+    LOG_PAYLOADS = os.getenv('LOG_PAYLOADS', 'true').lower() == 'true'
 
 class ProductionConfig(Config):
     """Production configuration"""
     DEBUG = False
+    METRICS_REQUIRE_TOKEN = True
     
 config = {
     'development': DevelopmentConfig,
@@ -95,17 +95,23 @@ const MemberDashboard = () => {
                                 <div key={sprint.id} style={styles.card}>
                                     <div style={styles.cardHeader}>
                                         <h3 style={styles.cardTitle}>{sprint.name}</h3>
-                                        <span style={styles.badgeActive}>Active</span>
+                                        <span style={sprint.has_submitted ? styles.badgeClosed : styles.badgeActive}>
+                                            {sprint.has_submitted ? 'Submitted' : 'Active'}
+                                        </span>
                                     </div>
                                     <div style={styles.cardMeta}>
                                         <span style={{ display: 'flex', alignItems: 'center', gap: '6px' }}><Calendar size={14} /> {formatDate(sprint.end_date)}</span>
                                         <span style={{ display: 'flex', alignItems: 'center', gap: '6px' }}><Users size={14} /> {sprint.team_size || '0'} members</span>
+                                        {sprint.last_activity_at && (
+                                            <span style={{ display: 'flex', alignItems: 'center', gap: '6px' }}><Clock size={14} /> Last active {formatDate(sprint.last_activity_at)}</span>
+                                        )}
                                     </div>
                                     <button
                                         onClick={() => handleStartRetro(sprint.id)}
                                         style={styles.actionButton}
                                     >
-                                        <PlayCircle size={16} style={{ marginRight: '6px' }} /> Start Retrospective
+                                        <PlayCircle size={16} style={{ marginRight: '6px' }} />
+                                        {sprint.has_submitted ? 'View Retrospective' : sprint.has_active_session ? 'Continue Retrospective' : 'Start Retrospective'}
                                     </button>
                                 </div>
                             ))}
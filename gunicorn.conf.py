@@ -0,0 +1,78 @@
+"""Gunicorn settings for wsgi:app.
+
+Almost all of a chat request is spent waiting on Groq/Gemini, so workers are
+sized for concurrent I/O rather than CPU. WSGI_WORKER_MODE selects the model:
+
+    gthread  (default) threads per worker; no patching, works everywhere
+    gevent   greenlets per worker; the standard library is monkey-patched so
+             httpx (Groq, Supabase), requests (Gemini over REST) and psycopg
+             yield while waiting on the network
+    sync     one request per worker; only useful as a baseline
+
+Every setting can be overridden from the environment (see .env.example).
+Measure with `python -m benchmarks.concurrent_interviews`.
+"""
+import multiprocessing
+import os
+
+WORKER_MODE = os.getenv('WSGI_WORKER_MODE', 'gthread')
+if WORKER_MODE not in ('gevent', 'gthread', 'sync'):
+    raise ValueError(f"WSGI_WORKER_MODE must be gevent, gthread or sync, not {WORKER_MODE!r}")
+
+if WORKER_MODE == 'gevent':
+    # Patch before the app (and ssl, via the API clients) is imported by
+    # preload_app, so every socket it creates is cooperative
+    from gevent import monkey
+    # Non-aggressive keeps select.epoll for now: httpcore imports trio when it
+    # is installed, and trio needs epoll at import time. The worker re-patches
+    # aggressively after fork, so the HTTP stack is imported before that happens.
+    # psycopg and urllib3 wait via the patched poll either way.
+    monkey.patch_all(aggressive=False)
+    import httpx  # noqa: F401
+    # The gRPC transport isn't cooperative under gevent
+    os.environ.setdefault('GEMINI_TRANSPORT', 'rest')
+
+_cpus = multiprocessing.cpu_count()
+
+bind = f"0.0.0.0:{os.getenv('PORT', '5000')}"
+worker_class = WORKER_MODE
+# gevent gets one process per core; gthread overlaps GIL-bound work across two
+workers = int(os.getenv('WEB_CONCURRENCY', _cpus if WORKER_MODE == 'gevent' else 2 * _cpus))
+# gunicorn silently swaps sync for gthread when threads > 1
+threads = int(os.getenv('WSGI_THREADS', '8')) if WORKER_MODE == 'gthread' else 1
+worker_connections = int(os.getenv('WSGI_WORKER_CONNECTIONS', '200'))
+
+# A report analysis or a slow LLM turn can legitimately run for a minute;
+# keep this above GROQ_TIMEOUT so the client gives up before the worker is killed
+timeout = int(os.getenv('WSGI_TIMEOUT', '120'))
+graceful_timeout = int(os.getenv('WSGI_GRACEFUL_TIMEOUT', '30'))
+keepalive = int(os.getenv('WSGI_KEEPALIVE', '5'))
+
+# Recycle workers now and then so slow leaks in client libraries can't accumulate
+max_requests = int(os.getenv('WSGI_MAX_REQUESTS', '2000'))
+max_requests_jitter = max_requests // 10
+
+# Import the app once in the master; services are built lazily per worker
+# (app/services/registry.py), so nothing stateful is shared across the fork
+preload_app = True
+
+# Set WSGI_ACCESS_LOG empty to turn access logging off
+accesslog = os.getenv('WSGI_ACCESS_LOG', '-') or None
+errorlog = '-'
+loglevel = os.getenv('WSGI_LOG_LEVEL', 'info')
+
+# With PROMETHEUS_MULTIPROC_DIR set, workers write metrics to files there and
+# /metrics aggregates them (app/metrics.py); stale files from a previous run
+# and from exited workers must not be counted
+def on_starting(server):
+    path = os.getenv('PROMETHEUS_MULTIPROC_DIR')
+    if path:
+        os.makedirs(path, exist_ok=True)
+        for name in os.listdir(path):
+            if name.endswith('.db'):
+                os.remove(os.path.join(path, name))
+
+def child_exit(server, worker):
+    if os.getenv('PROMETHEUS_MULTIPROC_DIR'):
+        from prometheus_client import multiprocess
+        multiprocess.mark_process_dead(worker.pid)
@@ -0,0 +1,91 @@
+-- Migration: One-round-trip chat bootstrap
+-- Description: Validates an access code, gets or atomically creates the member's
+-- conversation session, and returns member, sprint context and history in one call.
+-- Run this in your Supabase SQL Editor
+
+-- =====================================================
+-- Function: bootstrap_chat_session
+-- =====================================================
+-- Returns a JSONB object with a 'status' field:
+--   'ok'             - member, sprint, session_token, history, restored, submitted
+--   'invalid_code'   - no team member has this access code
+--   'sprint_not_found'
+--   'not_accepting'  - sprint status is not collecting/active
+CREATE OR REPLACE FUNCTION bootstrap_chat_session(
+    p_access_code VARCHAR,
+    p_session_token VARCHAR
+)
+RETURNS JSONB AS $$
+DECLARE
+    v_member team_members%ROWTYPE;
+    v_sprint sprints%ROWTYPE;
+    v_session conversation_sessions%ROWTYPE;
+    v_restored BOOLEAN := TRUE;
+BEGIN
+    -- Lock the member row so concurrent tabs serialize on session creation
+    SELECT * INTO v_member
+    FROM team_members
+    WHERE access_code = p_access_code
+    FOR UPDATE;
+
+    IF NOT FOUND THEN
+        RETURN jsonb_build_object('status', 'invalid_code');
+    END IF;
+
+    SELECT * INTO v_sprint FROM sprints WHERE id = v_member.sprint_id;
+
+    IF NOT FOUND THEN
+        RETURN jsonb_build_object('status', 'sprint_not_found');
+    END IF;
+
+    IF v_sprint.status NOT IN ('collecting', 'active') THEN
+        RETURN jsonb_build_object('status', 'not_accepting');
+    END IF;
+
+    -- Most recent session for this member, or create one
+    SELECT * INTO v_session
+    FROM conversation_sessions
+    WHERE sprint_id = v_sprint.id AND team_member_id = v_member.id
+    ORDER BY created_at DESC
+    LIMIT 1;
+
+    IF NOT FOUND THEN
+        INSERT INTO conversation_sessions (sprint_id, session_token, conversation_history, team_member_id)
+        VALUES (v_sprint.id, p_session_token, '[]'::jsonb, v_member.id)
+        RETURNING * INTO v_session;
+        v_restored := FALSE;
+    END IF;
+
+    RETURN jsonb_build_object(
+        'status', 'ok',
+        'member', jsonb_build_object(
+            'id', v_member.id,
+            'name', v_member.name,
+            'role', COALESCE(v_member.role, 'Team Member'),
+            'email', v_member.email,
+            'has_submitted', COALESCE(v_member.has_submitted, FALSE)
+        ),
+        'sprint', jsonb_build_object(
+            'id', v_sprint.id,
+            'name', v_sprint.name,
+            'start_date', v_sprint.start_date,
+            'end_date', v_sprint.end_date,
+            'goals', COALESCE((
+                SELECT jsonb_agg(to_jsonb(g) ORDER BY g.display_order)
+                FROM sprint_goals g
+                WHERE g.sprint_id = v_sprint.id
+            ), '[]'::jsonb),
+            'outcomes', (
+                SELECT to_jsonb(o) FROM sprint_outcomes o WHERE o.sprint_id = v_sprint.id
+            ),
+            'project', (
+                SELECT to_jsonb(p) FROM projects p WHERE p.id = v_sprint.project_id
+            )
+        ),
+        'session_token', v_session.session_token,
+        'history', COALESCE(v_session.conversation_history, '[]'::jsonb),
+        'restored', v_restored,
+        'submitted', COALESCE(v_member.has_submitted, FALSE)
+    );
+END;
+$$ LANGUAGE plpgsql;
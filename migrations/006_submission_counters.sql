@@ -0,0 +1,88 @@
+-- Migration: Submission counters on sprints
+-- Description: Keeps submitted_count and response_count on each sprint up to date
+-- with triggers, so status polling reads a few integers instead of every member
+-- and response row. Also fixes team_size not updating on member delete.
+-- Run this in your Supabase SQL Editor
+
+-- =====================================================
+-- Counter columns
+-- =====================================================
+ALTER TABLE sprints
+ADD COLUMN IF NOT EXISTS submitted_count INTEGER DEFAULT 0;
+
+ALTER TABLE sprints
+ADD COLUMN IF NOT EXISTS response_count INTEGER DEFAULT 0;
+
+-- =====================================================
+-- Helper Functions
+-- =====================================================
+
+-- Function to update team_size automatically
+-- (replaces the 001 version, which read NEW.sprint_id and so did nothing on DELETE)
+CREATE OR REPLACE FUNCTION update_sprint_team_size()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        UPDATE sprints SET team_size = team_size + 1 WHERE id = NEW.sprint_id;
+        RETURN NEW;
+    END IF;
+
+    UPDATE sprints SET team_size = GREATEST(team_size - 1, 0) WHERE id = OLD.sprint_id;
+    RETURN OLD;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Function to keep submitted_count in step with team_members.has_submitted
+CREATE OR REPLACE FUNCTION update_sprint_submitted_count()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') AND COALESCE(OLD.has_submitted, FALSE) THEN
+        UPDATE sprints SET submitted_count = GREATEST(submitted_count - 1, 0) WHERE id = OLD.sprint_id;
+    END IF;
+
+    IF TG_OP IN ('INSERT', 'UPDATE') AND COALESCE(NEW.has_submitted, FALSE) THEN
+        UPDATE sprints SET submitted_count = submitted_count + 1 WHERE id = NEW.sprint_id;
+    END IF;
+
+    IF TG_OP = 'DELETE' THEN
+        RETURN OLD;
+    END IF;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Trigger to update submitted_count
+DROP TRIGGER IF EXISTS trigger_update_submitted_count ON team_members;
+CREATE TRIGGER trigger_update_submitted_count
+AFTER INSERT OR DELETE OR UPDATE OF has_submitted, sprint_id ON team_members
+FOR EACH ROW
+EXECUTE FUNCTION update_sprint_submitted_count();
+
+-- Function to keep response_count in step with responses
+CREATE OR REPLACE FUNCTION update_sprint_response_count()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        UPDATE sprints SET response_count = response_count + 1 WHERE id = NEW.sprint_id;
+        RETURN NEW;
+    END IF;
+
+    UPDATE sprints SET response_count = GREATEST(response_count - 1, 0) WHERE id = OLD.sprint_id;
+    RETURN OLD;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Trigger to update response_count
+DROP TRIGGER IF EXISTS trigger_update_response_count ON responses;
+CREATE TRIGGER trigger_update_response_count
+AFTER INSERT OR DELETE ON responses
+FOR EACH ROW
+EXECUTE FUNCTION update_sprint_response_count();
+
+-- =====================================================
+-- Backfill existing sprints
+-- =====================================================
+UPDATE sprints s
+SET team_size = (SELECT COUNT(*) FROM team_members t WHERE t.sprint_id = s.id),
+    submitted_count = (SELECT COUNT(*) FROM team_members t WHERE t.sprint_id = s.id AND t.has_submitted),
+    response_count = (SELECT COUNT(*) FROM responses r WHERE r.sprint_id = s.id);
@@ -0,0 +1,48 @@
+-- Migration: Composite indexes for hot DatabaseService lookups
+-- Description: Matches each DatabaseService filter/order combination with an index.
+-- Checked by scripts/check_query_plans.py, which fails if any query falls back
+-- to a sequential scan.
+-- Run this in your Supabase SQL Editor
+
+-- =====================================================
+-- Team member lookups
+-- =====================================================
+-- get_member_sprints and membership checks filter by email
+CREATE INDEX IF NOT EXISTS idx_team_members_email ON team_members(email);
+CREATE INDEX IF NOT EXISTS idx_team_members_sprint_email ON team_members(sprint_id, email);
+
+-- access_code already has a unique index from its UNIQUE constraint (002),
+-- so the separate plain index is redundant write overhead
+DROP INDEX IF EXISTS idx_team_members_access_code;
+
+-- =====================================================
+-- Keyset-paginated listings (ORDER BY created_at DESC, id DESC)
+-- =====================================================
+CREATE INDEX IF NOT EXISTS idx_sprints_created ON sprints(created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_sprints_creator_created ON sprints(created_by, created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_sprints_project_created ON sprints(project_id, created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_projects_created ON projects(created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_projects_creator_created ON projects(created_by, created_at DESC, id DESC);
+
+-- Superseded by idx_sprints_project_created
+DROP INDEX IF EXISTS idx_sprints_project_id;
+
+-- =====================================================
+-- Sessions, responses, goals, comparisons
+-- =====================================================
+-- get_active_session: latest session for a member in a sprint
+CREATE INDEX IF NOT EXISTS idx_conversation_sessions_sprint_member_created
+    ON conversation_sessions(sprint_id, team_member_id, created_at DESC);
+DROP INDEX IF EXISTS idx_conversation_sessions_sprint_id;
+
+-- iter_sprint_responses pages by id within a sprint
+CREATE INDEX IF NOT EXISTS idx_responses_sprint_id_id ON responses(sprint_id, id);
+DROP INDEX IF EXISTS idx_responses_sprint_id;
+
+-- get_sprint_goals orders by display_order
+CREATE INDEX IF NOT EXISTS idx_sprint_goals_sprint_order ON sprint_goals(sprint_id, display_order);
+DROP INDEX IF EXISTS idx_sprint_goals_sprint_id;
+
+-- get_sprint_comparison
+CREATE INDEX IF NOT EXISTS idx_sprint_comparisons_pair
+    ON sprint_comparisons(current_sprint_id, previous_sprint_id);
@@ -0,0 +1,35 @@
+-- Migration: Member dashboard view
+-- Description: One row per (sprint, member email) with the member's submission status,
+-- whether they have an unfinished chat session and when they were last active,
+-- so the member dashboard loads in a single paginated query.
+-- Run this in your Supabase SQL Editor
+
+-- =====================================================
+-- View: member_sprint_dashboard
+-- =====================================================
+-- Sprint columns keep their names (id, created_at, ...) so the usual
+-- created_at/id keyset pagination applies. Filter by member_email.
+-- A member listed more than once on a sprint's roster (same email) still gets
+-- one row per sprint, so (created_at, id) stays unique for the cursor: the
+-- submitted entry if any (has_submitted is then true), else the latest active.
+CREATE OR REPLACE VIEW member_sprint_dashboard AS
+SELECT DISTINCT ON (t.email, s.id)
+    s.*,
+    t.id AS member_id,
+    t.email AS member_email,
+    COALESCE(t.has_submitted, FALSE) AS has_submitted,
+    t.submitted_at,
+    (cs.id IS NOT NULL AND NOT COALESCE(t.has_submitted, FALSE)) AS has_active_session,
+    GREATEST(cs.updated_at, t.submitted_at) AS last_activity_at
+FROM team_members t
+JOIN sprints s ON s.id = t.sprint_id
+-- Latest session only; served by idx_conversation_sessions_sprint_member_created
+LEFT JOIN LATERAL (
+    SELECT c.id, c.updated_at
+    FROM conversation_sessions c
+    WHERE c.sprint_id = t.sprint_id AND c.team_member_id = t.id
+    ORDER BY c.created_at DESC
+    LIMIT 1
+) cs ON TRUE
+ORDER BY t.email, s.id, COALESCE(t.has_submitted, FALSE) DESC,
+         GREATEST(cs.updated_at, t.submitted_at) DESC NULLS LAST, t.id;
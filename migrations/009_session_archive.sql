@@ -0,0 +1,134 @@
+-- Migration: Conversation session archive
+-- Description: Moves submitted and abandoned sessions out of conversation_sessions
+-- into a compressed archive table so the hot table and its indexes stay small.
+-- Driven in batches by scripts/compact_sessions.py.
+-- Run this in your Supabase SQL Editor
+
+-- =====================================================
+-- Table: conversation_sessions_archive
+-- =====================================================
+CREATE TABLE IF NOT EXISTS conversation_sessions_archive (
+    id UUID PRIMARY KEY,
+    sprint_id UUID REFERENCES sprints(id) ON DELETE CASCADE,
+    team_member_id UUID REFERENCES team_members(id) ON DELETE SET NULL,
+    session_token VARCHAR(100) UNIQUE NOT NULL,
+    conversation_history JSONB,
+    message_count INTEGER DEFAULT 0,
+    reason VARCHAR(20) NOT NULL,  -- 'submitted' or 'stale'
+    created_at TIMESTAMP,
+    updated_at TIMESTAMP,
+    archived_at TIMESTAMP DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_conversation_sessions_archive_sprint_id
+    ON conversation_sessions_archive(sprint_id);
+
+-- Archived histories are write-once, so prefer lz4 where the server supports it.
+-- Otherwise the default pglz TOAST compression applies.
+DO $$
+BEGIN
+    ALTER TABLE conversation_sessions_archive ALTER COLUMN conversation_history SET COMPRESSION lz4;
+EXCEPTION WHEN OTHERS THEN
+    RAISE NOTICE 'lz4 compression unavailable, using default TOAST compression';
+END $$;
+
+ALTER TABLE conversation_sessions_archive ENABLE ROW LEVEL SECURITY;
+
+-- Compaction scans oldest-first by last update
+CREATE INDEX IF NOT EXISTS idx_conversation_sessions_updated
+    ON conversation_sessions(updated_at);
+
+-- =====================================================
+-- Function: archive_conversation_sessions
+-- =====================================================
+-- Archives up to p_batch_size sessions of sprints that are 'analyzed' or
+-- 'closed' and that are either
+--   'submitted' - the member submitted (or the token has a response) and the
+--                 session was last updated before p_submitted_before
+--   'stale'     - not submitted and last updated before p_stale_before
+-- Sessions of sprints still collecting stay live: bootstrap_chat_session and
+-- the session reads only look at conversation_sessions, so a member reopening
+-- their access code must still find their history there.
+-- The GREATEST bound is implied by either branch; it is there so the scan can
+-- use idx_conversation_sessions_updated whichever cutoff is later.
+-- Sessions being written to right now are skipped rather than waited on.
+-- With p_dry_run, nothing moves and the totals cover every eligible session.
+-- Returns {'archived', 'submitted', 'stale', 'bytes'}.
+CREATE OR REPLACE FUNCTION archive_conversation_sessions(
+    p_submitted_before TIMESTAMP,
+    p_stale_before TIMESTAMP,
+    p_batch_size INTEGER DEFAULT 500,
+    p_dry_run BOOLEAN DEFAULT FALSE
+)
+RETURNS JSONB AS $$
+DECLARE
+    v_result JSONB;
+BEGIN
+    IF p_dry_run THEN
+        SELECT jsonb_build_object(
+            'archived', 0,
+            'submitted', COUNT(*) FILTER (WHERE x.submitted),
+            'stale', COUNT(*) FILTER (WHERE NOT x.submitted),
+            'bytes', COALESCE(SUM(pg_column_size(c.conversation_history)), 0)
+        ) INTO v_result
+        FROM conversation_sessions c
+        JOIN sprints s ON s.id = c.sprint_id AND s.status IN ('analyzed', 'closed')
+        LEFT JOIN team_members t ON t.id = c.team_member_id
+        CROSS JOIN LATERAL (
+            SELECT COALESCE(t.has_submitted, FALSE) OR EXISTS (
+                SELECT 1 FROM responses r WHERE r.session_token = c.session_token
+            ) AS submitted
+        ) x
+        WHERE c.updated_at < GREATEST(p_submitted_before, p_stale_before)
+          AND ((x.submitted AND c.updated_at < p_submitted_before)
+               OR (NOT x.submitted AND c.updated_at < p_stale_before));
+        RETURN v_result;
+    END IF;
+
+    WITH batch AS (
+        SELECT c.id, x.submitted
+        FROM conversation_sessions c
+        JOIN sprints s ON s.id = c.sprint_id AND s.status IN ('analyzed', 'closed')
+        LEFT JOIN team_members t ON t.id = c.team_member_id
+        CROSS JOIN LATERAL (
+            SELECT COALESCE(t.has_submitted, FALSE) OR EXISTS (
+                SELECT 1 FROM responses r WHERE r.session_token = c.session_token
+            ) AS submitted
+        ) x
+        WHERE c.updated_at < GREATEST(p_submitted_before, p_stale_before)
+          AND ((x.submitted AND c.updated_at < p_submitted_before)
+               OR (NOT x.submitted AND c.updated_at < p_stale_before))
+        ORDER BY c.updated_at
+        LIMIT p_batch_size
+        FOR UPDATE OF c SKIP LOCKED
+    ),
+    moved AS (
+        DELETE FROM conversation_sessions c
+        USING batch b
+        WHERE c.id = b.id
+        RETURNING c.*, b.submitted
+    ),
+    archived AS (
+        INSERT INTO conversation_sessions_archive (
+            id, sprint_id, team_member_id, session_token, conversation_history,
+            message_count, reason, created_at, updated_at
+        )
+        SELECT id, sprint_id, team_member_id, session_token, conversation_history,
+               CASE WHEN jsonb_typeof(conversation_history) = 'array'
+                    THEN jsonb_array_length(conversation_history) ELSE 0 END,
+               CASE WHEN submitted THEN 'submitted' ELSE 'stale' END,
+               created_at, updated_at
+        FROM moved
+        RETURNING reason, pg_column_size(conversation_history) AS bytes
+    )
+    SELECT jsonb_build_object(
+        'archived', COUNT(*),
+        'submitted', COUNT(*) FILTER (WHERE reason = 'submitted'),
+        'stale', COUNT(*) FILTER (WHERE reason = 'stale'),
+        'bytes', COALESCE(SUM(bytes), 0)
+    ) INTO v_result
+    FROM archived;
+
+    RETURN v_result;
+END;
+$$ LANGUAGE plpgsql;
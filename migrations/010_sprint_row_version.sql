@@ -0,0 +1,79 @@
+-- Migration: Sprint row versions
+-- Description: Adds sprints.row_version, bumped whenever the sprint or anything
+-- shown with it (goals, outcomes, team members, project) changes. The API uses
+-- it as a strong ETag for the sprint detail endpoints.
+-- Run this in your Supabase SQL Editor
+
+ALTER TABLE sprints
+ADD COLUMN IF NOT EXISTS row_version BIGINT DEFAULT 1;
+
+-- =====================================================
+-- Bump on every sprint update
+-- =====================================================
+-- Covers direct edits and the team_size/submitted_count/response_count
+-- triggers, so member inserts, deletes and submissions are already handled.
+CREATE OR REPLACE FUNCTION bump_sprint_row_version()
+RETURNS TRIGGER AS $$
+BEGIN
+    NEW.row_version = COALESCE(OLD.row_version, 0) + 1;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS bump_sprint_row_version ON sprints;
+CREATE TRIGGER bump_sprint_row_version
+BEFORE UPDATE ON sprints
+FOR EACH ROW
+EXECUTE FUNCTION bump_sprint_row_version();
+
+-- =====================================================
+-- Bump from related tables
+-- =====================================================
+CREATE OR REPLACE FUNCTION touch_parent_sprint()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        UPDATE sprints SET row_version = row_version + 1 WHERE id = OLD.sprint_id;
+        RETURN OLD;
+    END IF;
+
+    UPDATE sprints SET row_version = row_version + 1 WHERE id = NEW.sprint_id;
+    IF TG_OP = 'UPDATE' AND OLD.sprint_id IS DISTINCT FROM NEW.sprint_id THEN
+        UPDATE sprints SET row_version = row_version + 1 WHERE id = OLD.sprint_id;
+    END IF;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS touch_sprint_from_goals ON sprint_goals;
+CREATE TRIGGER touch_sprint_from_goals
+AFTER INSERT OR UPDATE OR DELETE ON sprint_goals
+FOR EACH ROW
+EXECUTE FUNCTION touch_parent_sprint();
+
+DROP TRIGGER IF EXISTS touch_sprint_from_outcomes ON sprint_outcomes;
+CREATE TRIGGER touch_sprint_from_outcomes
+AFTER INSERT OR UPDATE OR DELETE ON sprint_outcomes
+FOR EACH ROW
+EXECUTE FUNCTION touch_parent_sprint();
+
+-- Inserts, deletes and has_submitted changes already update the sprint counters
+DROP TRIGGER IF EXISTS touch_sprint_from_team_members ON team_members;
+CREATE TRIGGER touch_sprint_from_team_members
+AFTER UPDATE OF name, role, email, access_code, invite_sent_at ON team_members
+FOR EACH ROW
+EXECUTE FUNCTION touch_parent_sprint();
+
+CREATE OR REPLACE FUNCTION touch_project_sprints()
+RETURNS TRIGGER AS $$
+BEGIN
+    UPDATE sprints SET row_version = row_version + 1 WHERE project_id = NEW.id;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS touch_sprints_from_project ON projects;
+CREATE TRIGGER touch_sprints_from_project
+AFTER UPDATE ON projects
+FOR EACH ROW
+EXECUTE FUNCTION touch_project_sprints();
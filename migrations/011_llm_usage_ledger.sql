@@ -0,0 +1,86 @@
+-- Migration: LLM usage ledger
+-- Description: One row per Groq/Gemini call with its token counts and estimated
+-- cost, tagged with the sprint and conversation session it was made for.
+-- Written by app/services/llm_usage.py; aggregated per sprint for the admin API.
+-- Run this in your Supabase SQL Editor
+
+-- =====================================================
+-- Table: llm_usage
+-- =====================================================
+CREATE TABLE IF NOT EXISTS llm_usage (
+    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    sprint_id UUID REFERENCES sprints(id) ON DELETE CASCADE,
+    session_token VARCHAR(100),
+    provider VARCHAR(20) NOT NULL,    -- 'groq' or 'gemini'
+    model VARCHAR(100) NOT NULL,
+    call_type VARCHAR(30) NOT NULL,   -- 'interview', 'summary', 'themes', 'recommendations', 'sentiment'
+    prompt_tokens INTEGER NOT NULL DEFAULT 0,
+    completion_tokens INTEGER NOT NULL DEFAULT 0,
+    tokens_estimated BOOLEAN NOT NULL DEFAULT FALSE,  -- provider didn't report prompt tokens
+    prompt_chars INTEGER,
+    latency_ms INTEGER,
+    cost_usd NUMERIC(12, 6) NOT NULL DEFAULT 0,
+    created_at TIMESTAMP DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_llm_usage_sprint_id ON llm_usage(sprint_id, created_at);
+CREATE INDEX IF NOT EXISTS idx_llm_usage_created_at ON llm_usage(created_at);
+
+ALTER TABLE llm_usage ENABLE ROW LEVEL SECURITY;
+
+-- =====================================================
+-- Function: sprint_llm_usage
+-- =====================================================
+-- Totals for one sprint, overall and per (call_type, provider, model):
+--   {"calls", "prompt_tokens", "completion_tokens", "total_tokens", "cost_usd",
+--    "breakdown": [{"call_type", "provider", "model", "calls", ..., "avg_latency_ms"}]}
+CREATE OR REPLACE FUNCTION sprint_llm_usage(p_sprint_id UUID)
+RETURNS JSONB AS $$
+    WITH breakdown AS (
+        SELECT call_type, provider, model,
+               COUNT(*) AS calls,
+               SUM(prompt_tokens) AS prompt_tokens,
+               SUM(completion_tokens) AS completion_tokens,
+               SUM(prompt_tokens + completion_tokens) AS total_tokens,
+               SUM(cost_usd) AS cost_usd,
+               ROUND(AVG(latency_ms)) AS avg_latency_ms,
+               BOOL_OR(tokens_estimated) AS tokens_estimated
+        FROM llm_usage
+        WHERE sprint_id = p_sprint_id
+        GROUP BY call_type, provider, model
+    )
+    SELECT jsonb_build_object(
+        'sprint_id', p_sprint_id,
+        'calls', COALESCE(SUM(calls), 0),
+        'prompt_tokens', COALESCE(SUM(prompt_tokens), 0),
+        'completion_tokens', COALESCE(SUM(completion_tokens), 0),
+        'total_tokens', COALESCE(SUM(total_tokens), 0),
+        'cost_usd', COALESCE(SUM(cost_usd), 0),
+        'breakdown', COALESCE(jsonb_agg(to_jsonb(breakdown) ORDER BY cost_usd DESC, call_type)
+                              FILTER (WHERE calls IS NOT NULL), '[]'::jsonb)
+    )
+    FROM breakdown;
+$$ LANGUAGE sql STABLE;
+
+-- =====================================================
+-- Function: top_llm_usage_sprints
+-- =====================================================
+-- The most expensive sprints with usage since p_since (all time when NULL)
+CREATE OR REPLACE FUNCTION top_llm_usage_sprints(p_since TIMESTAMP DEFAULT NULL, p_limit INTEGER DEFAULT 20)
+RETURNS JSONB AS $$
+    SELECT COALESCE(jsonb_agg(to_jsonb(ranked) ORDER BY ranked.cost_usd DESC), '[]'::jsonb)
+    FROM (
+        SELECT u.sprint_id, s.name AS sprint_name, s.project_id,
+               COUNT(*) AS calls,
+               COUNT(DISTINCT u.session_token) AS sessions,
+               SUM(u.prompt_tokens + u.completion_tokens) AS total_tokens,
+               SUM(u.cost_usd) AS cost_usd,
+               MAX(u.created_at) AS last_call_at
+        FROM llm_usage u
+        JOIN sprints s ON s.id = u.sprint_id
+        WHERE p_since IS NULL OR u.created_at >= p_since
+        GROUP BY u.sprint_id, s.name, s.project_id
+        ORDER BY cost_usd DESC
+        LIMIT p_limit
+    ) ranked;
+$$ LANGUAGE sql STABLE;
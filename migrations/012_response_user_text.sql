@@ -0,0 +1,26 @@
+-- Migration: Response user text for sentiment scoring
+-- Description: Returns the start of each response's joined user messages, the
+-- text sentiment scoring reads, so the analysis doesn't have to transfer the
+-- whole conversation JSONB to get it.
+-- Run this in your Supabase SQL Editor
+
+-- =====================================================
+-- Function: response_user_texts
+-- =====================================================
+-- {"<response id>": "<user messages joined by spaces, first p_max_chars characters>"}
+-- Responses without user messages map to ''; unknown ids are left out.
+CREATE OR REPLACE FUNCTION response_user_texts(p_response_ids UUID[], p_max_chars INTEGER DEFAULT 500)
+RETURNS JSONB AS $$
+    SELECT COALESCE(jsonb_object_agg(texts.id, texts.user_text), '{}'::jsonb)
+    FROM (
+        SELECT r.id,
+               LEFT(COALESCE(string_agg(m.message->>'content', ' ' ORDER BY m.position)
+                             FILTER (WHERE m.message->>'role' = 'user'), ''), p_max_chars) AS user_text
+        FROM responses r
+        LEFT JOIN LATERAL jsonb_array_elements(
+            CASE WHEN jsonb_typeof(r.conversation) = 'array' THEN r.conversation ELSE '[]'::jsonb END
+        ) WITH ORDINALITY AS m(message, position) ON TRUE
+        WHERE r.id = ANY(p_response_ids)
+        GROUP BY r.id
+    ) texts;
+$$ LANGUAGE sql STABLE;
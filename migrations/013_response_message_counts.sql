@@ -0,0 +1,23 @@
+-- Migration: Response message counts for columnar exports
+-- Description: Counts each response's messages in the database, so exports
+-- don't have to transfer the whole conversation JSONB to get them.
+-- Run this in your Supabase SQL Editor
+
+-- =====================================================
+-- Function: response_message_counts
+-- =====================================================
+-- {"<response id>": {"message_count": n, "user_message_count": n}}
+-- A conversation that isn't an array counts as empty; unknown ids are left out.
+CREATE OR REPLACE FUNCTION response_message_counts(p_response_ids UUID[])
+RETURNS JSONB AS $$
+    SELECT COALESCE(jsonb_object_agg(r.id, jsonb_build_object(
+        'message_count', CASE WHEN jsonb_typeof(r.conversation) = 'array'
+                              THEN jsonb_array_length(r.conversation) ELSE 0 END,
+        'user_message_count', CASE WHEN jsonb_typeof(r.conversation) = 'array'
+                                   THEN (SELECT COUNT(*) FROM jsonb_array_elements(r.conversation) m
+                                         WHERE m->>'role' = 'user')
+                                   ELSE 0 END
+    )), '{}'::jsonb)
+    FROM responses r
+    WHERE r.id = ANY(p_response_ids);
+$$ LANGUAGE sql STABLE;
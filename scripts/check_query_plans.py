@@ -0,0 +1,221 @@
+"""Query-plan regression harness for DatabaseService.
+
+Loads synthetic data into a local Postgres, then EXPLAINs the SQL equivalent of
+each DatabaseService query and fails if any plan contains a sequential scan.
+Run it in CI after changing migrations or DatabaseService queries:
+
+    python -m scripts.check_query_plans --dsn postgresql://postgres@localhost/retro_plans
+
+Exits with status 1 if any query regressed to a sequential scan.
+"""
+import argparse
+import sys
+import psycopg
+from scripts.local_postgres import DEFAULT_DSN, setup_database
+
+# Synthetic data sized so the planner prefers indexes where they exist.
+# Triggers are disabled while loading; counters don't matter for plans.
+SYNTHETIC_DATA = """
+SET session_replication_role = replica;
+
+INSERT INTO projects (id, name, created_by, created_at)
+SELECT gen_random_uuid(), 'Project ' || g, 'user-' || (g %% 500), NOW() - (g || ' minutes')::interval
+FROM generate_series(1, %(projects)s) g;
+
+INSERT INTO sprints (id, name, start_date, end_date, share_token, status, created_by, project_id, created_at)
+SELECT gen_random_uuid(), 'Sprint ' || g, CURRENT_DATE - 14, CURRENT_DATE, 'tok-' || g,
+       (ARRAY['collecting', 'analyzing', 'analyzed', 'closed'])[1 + g %% 4],
+       'user-' || (g %% 500), p.id, NOW() - (g || ' minutes')::interval
+FROM generate_series(1, %(sprints)s) g
+JOIN (SELECT id, row_number() OVER () - 1 AS rn FROM projects) p ON p.rn = g %% %(projects)s;
+
+INSERT INTO team_members (sprint_id, name, role, email, access_code, has_submitted)
+SELECT s.id, 'Member ' || m, 'Developer', 'member-' || ((s.rn * 7 + m) %% %(emails)s) || '@example.com',
+       'C' || s.rn || 'M' || m, m %% 2 = 0
+FROM (SELECT id, row_number() OVER () AS rn FROM sprints) s, generate_series(1, %(team_size)s) m;
+
+INSERT INTO conversation_sessions (sprint_id, team_member_id, session_token, conversation_history)
+SELECT sprint_id, id, 'sess-' || id, '[]'::jsonb FROM team_members;
+
+INSERT INTO responses (sprint_id, team_member_id, user_name, conversation, session_token, summary_data)
+SELECT sprint_id, id, name, '[]'::jsonb, 'resp-' || id, '{}'::jsonb
+FROM team_members WHERE has_submitted;
+
+INSERT INTO sprint_goals (sprint_id, goal_text, display_order)
+SELECT s.id, 'Goal ' || g, g FROM sprints s, generate_series(0, 2) g;
+
+INSERT INTO sprint_outcomes (sprint_id, progress_summary) SELECT id, 'Progress' FROM sprints;
+
+INSERT INTO analysis_reports (sprint_id, themes, recommendations)
+SELECT id, '[]'::jsonb, '[]'::jsonb FROM sprints WHERE status = 'analyzed';
+
+INSERT INTO action_items (sprint_id, description, priority)
+SELECT s.id, 'Action ' || g, 'medium' FROM sprints s, generate_series(1, 3) g;
+
+INSERT INTO sprint_comparisons (current_sprint_id, previous_sprint_id)
+SELECT id, id FROM sprints WHERE status = 'analyzed';
+
+INSERT INTO llm_usage (sprint_id, session_token, provider, model, call_type, prompt_tokens, completion_tokens, cost_usd)
+SELECT c.sprint_id, c.session_token, 'groq', 'llama-3.1-8b-instant', 'interview', 900, 40, 0.00005
+FROM conversation_sessions c, generate_series(1, 4) g;
+
+SET session_replication_role = DEFAULT;
+ANALYZE;
+"""
+
+# Real keys to plug into the queries below
+SAMPLE_SQL = """
+SELECT s.id AS sprint_id, s.share_token, s.created_by AS user_id, s.project_id,
+       s.created_at, t.id AS member_id, t.email, t.access_code, t.name AS member_name,
+       c.session_token
+FROM sprints s
+JOIN team_members t ON t.sprint_id = s.id
+JOIN conversation_sessions c ON c.team_member_id = t.id
+LIMIT 1
+"""
+
+# SQL equivalent of each DatabaseService read/update path, keyed by method name
+QUERIES = {
+    'get_sprint': "SELECT * FROM sprints WHERE id = %(sprint_id)s",
+    'get_sprint_by_token': "SELECT * FROM sprints WHERE share_token = %(share_token)s",
+    'get_all_sprints': "SELECT * FROM sprints ORDER BY created_at DESC, id DESC LIMIT 50",
+    'get_all_sprints (cursor)': """
+        SELECT * FROM sprints
+        WHERE created_at < %(created_at)s OR (created_at = %(created_at)s AND id < %(sprint_id)s)
+        ORDER BY created_at DESC, id DESC LIMIT 50""",
+    'get_sprints_by_creator': """
+        SELECT * FROM sprints WHERE created_by = %(user_id)s
+        ORDER BY created_at DESC, id DESC LIMIT 50""",
+    'get_sprint_submission_counts': """
+        SELECT team_size, submitted_count, response_count FROM sprints WHERE id = %(sprint_id)s""",
+    'get_sprint_version': "SELECT row_version FROM sprints WHERE id = %(sprint_id)s",
+    'get_team_members': "SELECT * FROM team_members WHERE sprint_id = %(sprint_id)s",
+    'get_member_sprints': """
+        SELECT s.* FROM sprints s
+        WHERE EXISTS (SELECT 1 FROM team_members t WHERE t.sprint_id = s.id AND t.email = %(email)s)
+        ORDER BY s.created_at DESC, s.id DESC LIMIT 50""",
+    'get_member_dashboard': """
+        SELECT * FROM member_sprint_dashboard WHERE member_email = %(email)s
+        ORDER BY created_at DESC, id DESC LIMIT 50""",
+    'mark_member_submitted': """
+        UPDATE team_members SET has_submitted = TRUE
+        WHERE sprint_id = %(sprint_id)s AND name = %(member_name)s""",
+    'get_active_session': """
+        SELECT * FROM conversation_sessions
+        WHERE sprint_id = %(sprint_id)s AND team_member_id = %(member_id)s
+        ORDER BY created_at DESC LIMIT 1""",
+    'get_conversation_history': """
+        SELECT conversation_history FROM conversation_sessions WHERE session_token = %(session_token)s""",
+    'save_conversation_state': """
+        UPDATE conversation_sessions SET conversation_history = '[]'::jsonb
+        WHERE session_token = %(session_token)s""",
+    'archive_conversation_sessions': """
+        SELECT c.id FROM conversation_sessions c
+        JOIN sprints s ON s.id = c.sprint_id AND s.status IN ('analyzed', 'closed')
+        LEFT JOIN team_members t ON t.id = c.team_member_id
+        CROSS JOIN LATERAL (
+            SELECT COALESCE(t.has_submitted, FALSE) OR EXISTS (
+                SELECT 1 FROM responses r WHERE r.session_token = c.session_token
+            ) AS submitted
+        ) x
+        WHERE c.updated_at < GREATEST(NOW() - INTERVAL '7 days', NOW() - INTERVAL '30 days')
+          AND ((x.submitted AND c.updated_at < NOW() - INTERVAL '7 days')
+               OR (NOT x.submitted AND c.updated_at < NOW() - INTERVAL '30 days'))
+        ORDER BY c.updated_at LIMIT 500""",
+    'get_sprint_responses': "SELECT * FROM responses WHERE sprint_id = %(sprint_id)s",
+    'count_sprint_responses': "SELECT COUNT(id) FROM responses WHERE sprint_id = %(sprint_id)s",
+    'iter_sprint_responses': """
+        SELECT id, user_name, summary_data FROM responses
+        WHERE sprint_id = %(sprint_id)s AND id > '00000000-0000-0000-0000-000000000000'
+        ORDER BY id LIMIT 100""",
+    'get_analysis_report': "SELECT * FROM analysis_reports WHERE sprint_id = %(sprint_id)s",
+    'get_analysis_report_version': """
+        SELECT id, generated_at FROM analysis_reports WHERE sprint_id = %(sprint_id)s""",
+    'get_action_items': "SELECT * FROM action_items WHERE sprint_id = %(sprint_id)s",
+    'get_sprint_llm_usage': """
+        SELECT call_type, provider, model, COUNT(*), SUM(prompt_tokens), SUM(cost_usd)
+        FROM llm_usage WHERE sprint_id = %(sprint_id)s GROUP BY call_type, provider, model""",
+    'get_project': "SELECT * FROM projects WHERE id = %(project_id)s",
+    'get_all_projects': "SELECT * FROM projects ORDER BY created_at DESC, id DESC LIMIT 50",
+    'get_projects_by_creator': """
+        SELECT * FROM projects WHERE created_by = %(user_id)s
+        ORDER BY created_at DESC, id DESC LIMIT 50""",
+    'get_sprints_by_project': """
+        SELECT * FROM sprints WHERE project_id = %(project_id)s
+        ORDER BY created_at DESC, id DESC LIMIT 50""",
+    'get_project_team_members': """
+        SELECT name, role, email FROM team_members
+        WHERE sprint_id IN (SELECT id FROM sprints WHERE project_id = %(project_id)s)""",
+    'migrate_project_ownership': "UPDATE sprints SET created_by = created_by WHERE created_by = %(user_id)s",
+    'get_team_member_by_code': """
+        SELECT t.*, s.* FROM team_members t LEFT JOIN sprints s ON s.id = t.sprint_id
+        WHERE t.access_code = %(access_code)s""",
+    'get_team_member_by_id': "SELECT * FROM team_members WHERE id = %(member_id)s",
+    'get_team_member_by_email': """
+        SELECT * FROM team_members WHERE sprint_id = %(sprint_id)s AND email = %(email)s LIMIT 1""",
+    'get_sprint_goals': """
+        SELECT * FROM sprint_goals WHERE sprint_id = %(sprint_id)s ORDER BY display_order""",
+    'get_sprint_outcomes': "SELECT * FROM sprint_outcomes WHERE sprint_id = %(sprint_id)s",
+    'get_sprint_comparison': """
+        SELECT * FROM sprint_comparisons
+        WHERE current_sprint_id = %(sprint_id)s AND previous_sprint_id = %(sprint_id)s""",
+}
+
+def find_seq_scans(plan: dict) -> list:
+    """Relation names read with a sequential scan anywhere in a JSON plan tree"""
+    found = []
+    if plan.get('Node Type') == 'Seq Scan':
+        found.append(plan.get('Relation Name'))
+    for child in plan.get('Plans', []):
+        found.extend(find_seq_scans(child))
+    return found
+
+def check_plans(conn, queries: dict = QUERIES) -> dict:
+    """EXPLAIN each query and return {method: [seq-scanned tables]} for failures"""
+    cur = conn.cursor()
+    cur.execute(SAMPLE_SQL)
+    columns = [d.name for d in cur.description]
+    sample = dict(zip(columns, cur.fetchone()))
+
+    failures = {}
+    for name, sql in queries.items():
+        # Roll back so UPDATE checks leave the data untouched
+        with conn.transaction(force_rollback=True):
+            cur.execute('EXPLAIN (FORMAT JSON) ' + sql, sample)
+            plan = cur.fetchone()[0][0]['Plan']
+        seq_scans = find_seq_scans(plan)
+        status = 'SEQ SCAN on ' + ', '.join(seq_scans) if seq_scans else 'ok'
+        print(f"{name:<32} {status}")
+        if seq_scans:
+            failures[name] = seq_scans
+    return failures
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description='Fail if a DatabaseService query plan uses a sequential scan')
+    parser.add_argument('--dsn', default=DEFAULT_DSN, help='Local Postgres database to (re)create')
+    parser.add_argument('--sprints', type=int, default=20000)
+    parser.add_argument('--projects', type=int, default=2000)
+    parser.add_argument('--team-size', type=int, default=8)
+    args = parser.parse_args(argv)
+
+    print(f"Setting up {args.dsn}...")
+    conn = setup_database(args.dsn)
+    # Client-side binding, since the load script has several statements
+    psycopg.ClientCursor(conn).execute(SYNTHETIC_DATA, {
+        'projects': args.projects,
+        'sprints': args.sprints,
+        'team_size': args.team_size,
+        'emails': args.sprints * args.team_size // 4,
+    })
+
+    failures = check_plans(conn)
+    conn.close()
+
+    if failures:
+        print(f"\n{len(failures)} quer{'y' if len(failures) == 1 else 'ies'} regressed to a sequential scan")
+        return 1
+    print(f"\nAll {len(QUERIES)} queries use indexes")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,86 @@
+"""Archive submitted and abandoned chat sessions out of conversation_sessions.
+
+Moves sessions in batches into conversation_sessions_archive (see
+migrations/009_session_archive.sql), so the hot table only holds live
+interviews. Only sessions of analyzed or closed sprints are archived, since
+members of a collecting sprint can still reopen theirs. Uses the configured
+DATABASE_BACKEND:
+
+    python -m scripts.compact_sessions --dry-run
+    python -m scripts.compact_sessions --submitted-days 7 --stale-days 30 --batch-size 500
+
+Safe to run on a schedule (e.g. nightly cron); sessions being written to are
+skipped and picked up on the next run.
+"""
+import argparse
+import sys
+import time
+from datetime import datetime, timedelta
+from dotenv import load_dotenv
+from app.services.database_service import create_database_service
+
+def format_bytes(size: float) -> str:
+    for unit in ('B', 'KB', 'MB'):
+        if size < 1024:
+            return f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GB"
+
+def compact_sessions(db, submitted_before: datetime, stale_before: datetime,
+                     batch_size: int = 500, max_batches: int = None, pause: float = 0) -> dict:
+    """Archive batches until none are left (or max_batches is reached); return totals"""
+    totals = {'archived': 0, 'submitted': 0, 'stale': 0, 'bytes': 0, 'batches': 0}
+    while max_batches is None or totals['batches'] < max_batches:
+        result = db.archive_conversation_sessions(submitted_before, stale_before, batch_size)
+        if not result['archived']:
+            break
+        totals['batches'] += 1
+        for key in ('archived', 'submitted', 'stale', 'bytes'):
+            totals[key] += result[key]
+        print(f"Batch {totals['batches']}: archived {result['archived']} "
+              f"({result['submitted']} submitted, {result['stale']} stale), "
+              f"{totals['archived']} total, {format_bytes(totals['bytes'])} of history moved")
+        if result['archived'] < batch_size:
+            break
+        if pause:
+            # Give autovacuum and live traffic room between batches
+            time.sleep(pause)
+    return totals
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description='Archive submitted and stale conversation sessions')
+    parser.add_argument('--submitted-days', type=int, default=7,
+                        help='Archive sessions of submitted members idle for this many days')
+    parser.add_argument('--stale-days', type=int, default=30,
+                        help='Archive unsubmitted sessions idle for this many days')
+    parser.add_argument('--batch-size', type=int, default=500)
+    parser.add_argument('--max-batches', type=int, default=None,
+                        help='Stop after this many batches (default: until done)')
+    parser.add_argument('--pause', type=float, default=0,
+                        help='Seconds to sleep between batches')
+    parser.add_argument('--dry-run', action='store_true',
+                        help='Report what would be archived without moving anything')
+    args = parser.parse_args(argv)
+
+    load_dotenv()
+    db = create_database_service()
+    now = datetime.utcnow()
+    submitted_before = now - timedelta(days=args.submitted_days)
+    stale_before = now - timedelta(days=args.stale_days)
+
+    if args.dry_run:
+        result = db.archive_conversation_sessions(submitted_before, stale_before, dry_run=True)
+        eligible = result['submitted'] + result['stale']
+        print(f"Would archive {eligible} sessions ({result['submitted']} submitted, "
+              f"{result['stale']} stale), {format_bytes(result['bytes'])} of history")
+        return 0
+
+    start = time.perf_counter()
+    totals = compact_sessions(db, submitted_before, stale_before, args.batch_size,
+                              args.max_batches, args.pause)
+    print(f"Archived {totals['archived']} sessions in {totals['batches']} batches "
+          f"({time.perf_counter() - start:.1f}s)")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,56 @@
+"""Export retro data to Parquet or Arrow IPC files for offline analysis.
+
+Writes responses (with flattened summary_data), themes and sentiment tables
+for the selected sprints using the configured DATABASE_BACKEND. Needs the
+optional analytics extra (pip install -r requirements-analytics.txt).
+
+    python -m scripts.export_columnar --project <project_id> --out exports/q3
+    python -m scripts.export_columnar --all --format arrow --out exports/all
+    python -m scripts.export_columnar --sprint <id> --sprint <id> --out exports/pair
+"""
+import argparse
+import sys
+import time
+from dotenv import load_dotenv
+from app.services.columnar_export_service import COLUMNAR_FORMATS, export_columnar
+from app.services.database_service import create_database_service
+from app.services.export_service import iter_all_sprint_ids, iter_project_sprint_ids
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description='Export retro data to columnar files')
+    scope = parser.add_mutually_exclusive_group(required=True)
+    scope.add_argument('--sprint', action='append', help='Sprint id (repeatable)')
+    scope.add_argument('--project', help='Export every sprint in this project')
+    scope.add_argument('--all', action='store_true', help='Export every sprint')
+    parser.add_argument('--out', required=True, help='Output directory')
+    parser.add_argument('--format', choices=list(COLUMNAR_FORMATS), default='parquet')
+    parser.add_argument('--batch-size', type=int, default=500, help='Rows fetched per query')
+    parser.add_argument('--row-group-size', type=int, default=10000, help='Rows per written row group')
+    args = parser.parse_args(argv)
+
+    load_dotenv()
+    db = create_database_service()
+    if args.sprint:
+        sprint_ids = args.sprint
+    elif args.project:
+        sprint_ids = iter_project_sprint_ids(db, args.project)
+    else:
+        sprint_ids = iter_all_sprint_ids(db)
+
+    start = time.perf_counter()
+    done = 0
+
+    def progress(sprint_id, counts):
+        nonlocal done
+        done += 1
+        print(f"[{done}] {sprint_id}: {counts['responses']} responses, "
+              f"{counts['themes']} themes, {counts['sentiment']} reports so far")
+
+    counts = export_columnar(db, sprint_ids, args.out, args.format,
+                             args.batch_size, args.row_group_size, progress)
+    print(f"Exported {counts['sprints']} sprints to {args.out} in {time.perf_counter() - start:.1f}s: "
+          f"{counts['responses']} responses, {counts['themes']} themes, {counts['sentiment']} reports")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
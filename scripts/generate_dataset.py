@@ -0,0 +1,403 @@
+"""Generate a large synthetic dataset in a local Postgres for scale testing.
+
+Recreates the database, applies migrations (scripts.local_postgres) and fills
+it with projects, their sprint histories, goals, outcomes, team members, chat
+sessions, submitted responses with summary_data, analysis reports and action
+items. Everything is derived from --seed, so the same arguments (and --as-of
+date) always produce the same rows, ids included:
+
+    python -m scripts.generate_dataset --dsn postgresql://postgres@localhost/retro_scale \\
+        --projects 2000 --sprints 12 --team-size 8
+
+Sizes are medians; the --*-skew options are the sigma of a lognormal around
+them, so a few projects get huge teams or long histories:
+
+    python -m scripts.generate_dataset --projects 200 --team-size 10 --team-skew 1.2   # some 100+ teams
+    python -m scripts.generate_dataset --projects 50 --sprints 40 --history-skew 1.0  # years of sprints
+
+Rows are streamed with COPY, one connection per table, with triggers and
+foreign-key checks off (session_replication_role = replica); the sprint
+counters the triggers would maintain are filled in once at the end. The app
+reads the data with DATABASE_BACKEND=postgres, and the Supabase backend sees
+it through the fake Supabase server in benchmarks/fake_services.py.
+"""
+import argparse
+import math
+import random
+import sys
+import time
+import uuid
+from contextlib import ExitStack
+from datetime import date, datetime, timedelta
+from psycopg.copy import QueuedLibpqWriter
+from app.json_provider import dumps
+from scripts.check_query_plans import QUERIES, check_plans
+from scripts.local_postgres import DEFAULT_DSN, connect, setup_database
+
+# Columns written per table, in load order
+TABLES = {
+    'projects': ('id', 'name', 'description', 'created_by', 'created_at', 'updated_at'),
+    'sprints': ('id', 'name', 'start_date', 'end_date', 'status', 'created_by', 'created_at',
+                'share_token', 'project_id'),
+    'sprint_goals': ('id', 'sprint_id', 'goal_text', 'display_order', 'created_at'),
+    'sprint_outcomes': ('id', 'sprint_id', 'progress_summary', 'what_went_well', 'what_went_wrong',
+                        'created_at', 'updated_at'),
+    'team_members': ('id', 'sprint_id', 'name', 'role', 'email', 'access_code', 'has_submitted',
+                     'submitted_at', 'invite_sent_at', 'created_at'),
+    'conversation_sessions': ('id', 'sprint_id', 'team_member_id', 'session_token',
+                              'conversation_history', 'created_at', 'updated_at'),
+    'responses': ('id', 'sprint_id', 'team_member_id', 'user_name', 'is_anonymous', 'conversation',
+                  'sentiment_score', 'submitted_at', 'session_token', 'summary_data'),
+    'analysis_reports': ('id', 'sprint_id', 'themes', 'recommendations', 'sentiment_summary',
+                         'generated_at', 'analysis_duration_seconds'),
+    'action_items': ('id', 'sprint_id', 'report_id', 'description', 'priority', 'status',
+                     'assigned_to', 'created_at', 'completed_at', 'theme_related'),
+}
+
+# What the counter triggers of 006_submission_counters.sql would have maintained
+COUNTERS_SQL = """
+UPDATE sprints s
+SET team_size = t.members, submitted_count = t.submitted
+FROM (SELECT sprint_id, COUNT(*) AS members, COUNT(*) FILTER (WHERE has_submitted) AS submitted
+      FROM team_members GROUP BY sprint_id) t
+WHERE t.sprint_id = s.id;
+
+UPDATE sprints s
+SET response_count = r.responses
+FROM (SELECT sprint_id, COUNT(*) AS responses FROM responses GROUP BY sprint_id) r
+WHERE r.sprint_id = s.id;
+"""
+
+SPRINT_DAYS = 14
+
+# Access codes use generate_access_code()'s alphabet (no I, O, 0 or 1)
+CODE_ALPHABET = 'ABCDEFGHJKLMNPQRSTUVWXYZ23456789'
+CODE_SPACE = len(CODE_ALPHABET) ** 8
+# Odd, so i -> i * CODE_STRIDE mod CODE_SPACE is a bijection: unique codes that don't look sequential
+CODE_STRIDE = 0x9E3779B97F
+
+FIRST_NAMES = ['Alex', 'Sam', 'Priya', 'Chen', 'Maria', 'Tom', 'Aisha', 'Lucas', 'Nadia', 'Kenji',
+               'Olivia', 'Ravi', 'Sofia', 'Daniel', 'Fatima', 'Jonas', 'Mei', 'Carlos', 'Emma', 'Yusuf']
+LAST_NAMES = ['Perera', 'Smith', 'Kumar', 'Wang', 'Garcia', 'Muller', 'Silva', 'Tanaka', 'Okafor',
+              'Novak', 'Johansson', 'Fernando', 'Rossi', 'Kim', 'Dubois', 'Hassan', 'Lee', 'Brown']
+ROLES = [('Developer', 60), ('QA Engineer', 12), ('Designer', 8), ('DevOps Engineer', 8),
+         ('Product Owner', 6), ('Scrum Master', 6)]
+
+PROJECT_NOUNS = ['Payments', 'Checkout', 'Mobile App', 'Search', 'Onboarding', 'Analytics',
+                 'Notifications', 'Billing', 'Admin Portal', 'Data Pipeline', 'Identity', 'Reporting']
+GOALS = ['Ship the {} redesign', 'Cut p95 latency of {} below 300ms', 'Finish the {} migration',
+         'Raise test coverage of {} to 80%', 'Close the top 10 {} bugs', 'Launch {} beta to 5% of users']
+
+QUESTIONS = [
+    "Hi {name}! Thanks for taking the time. Let's start: what went well for you this sprint?",
+    "That's great to hear. What was the biggest challenge you ran into?",
+    "How did that affect your work or the team's delivery?",
+    "How did collaboration within the team feel this sprint?",
+    "Was there anything about our process — planning, standups, reviews — that slowed you down?",
+    "If you could change one thing for next sprint, what would it be?",
+    "Were the sprint goals clear and realistic from your point of view?",
+    "Anything else you'd like the team to hear before we wrap up?",
+]
+ANSWERS = {
+    'went_well': ['We shipped the export feature two days early.', 'Pairing with the new developer worked really well.',
+                  'Code reviews were fast and thorough.', 'The new CI cache cut build times in half.',
+                  'Standups were short and focused.', 'Design handoffs were much clearer this time.'],
+    'challenges': ['The staging environment went down twice and blocked testing.',
+                   'Requirements for the billing story changed mid-sprint.',
+                   'Flaky end-to-end tests kept failing the pipeline.',
+                   'We were waiting on the platform team for API access for three days.',
+                   'Stories were too large to finish within the sprint.',
+                   'Too many meetings on Thursdays broke up focus time.'],
+    'improvements': ['Split stories so each fits in three days.', 'Add acceptance criteria before planning.',
+                     'Give staging an owner and alerting.', 'Quarantine flaky tests instead of retrying them.',
+                     'Keep Thursday afternoons meeting-free.', 'Agree API contracts with other teams up front.'],
+    'team_feedback': ['The team helped each other out a lot when things got stressful.',
+                      'I felt out of the loop on decisions made in side conversations.',
+                      'Communication with the product owner was quick and friendly.',
+                      'Knowledge sharing across frontend and backend could be better.'],
+}
+THEME_NAMES = [('Staging Environment Instability', 'Critical Issue'), ('Flaky End-to-End Tests', 'Critical Issue'),
+               ('Unclear Acceptance Criteria', 'Moderate Issue'), ('Oversized User Stories', 'Moderate Issue'),
+               ('Cross-Team API Dependencies', 'Moderate Issue'), ('Meeting Overload on Thursdays', 'Suggestion'),
+               ('Effective Pair Programming', 'Success'), ('Fast Code Reviews', 'Success')]
+
+def lognormal_size(rng: random.Random, median: float, sigma: float, cap: int) -> int:
+    """A skewed positive count around median, at most cap"""
+    return max(1, min(cap, round(median * math.exp(rng.gauss(0, sigma)))))
+
+def make_uuid(rng: random.Random) -> uuid.UUID:
+    return uuid.UUID(int=rng.getrandbits(128), version=4)
+
+def access_code(index: int) -> str:
+    value = ((index + 1) * CODE_STRIDE) % CODE_SPACE
+    chars = []
+    for _ in range(8):
+        value, digit = divmod(value, len(CODE_ALPHABET))
+        chars.append(CODE_ALPHABET[digit])
+    return ''.join(chars)
+
+class ContentPool:
+    """Conversations, summaries and reports, each encoded to JSON once and reused.
+
+    Building and encoding a conversation costs far more than writing it, so
+    every member draws one of --variants conversations of their length.
+    """
+
+    def __init__(self, seed: int, variants: int, as_of: date):
+        self.seed = seed
+        self.variants = variants
+        self.started = datetime.combine(as_of, datetime.min.time())
+        self.conversations = {}
+        self.reports = {}
+
+    def conversation(self, rng: random.Random, turns: int) -> tuple:
+        """(conversation JSON, summary_data JSON, sentiment score) for a member"""
+        key = (turns, rng.randrange(self.variants))
+        if key not in self.conversations:
+            self.conversations[key] = self._build_conversation(
+                random.Random(f'{self.seed}:conversation:{key[0]}:{key[1]}'), turns)
+        return self.conversations[key]
+
+    def _build_conversation(self, rng: random.Random, turns: int) -> tuple:
+        name = rng.choice(FIRST_NAMES)
+        said = {category: [] for category in ANSWERS}
+        messages = []
+        for i in range(turns):
+            stamp = (self.started + timedelta(seconds=40 * i)).isoformat()
+            if i % 2 == 0:
+                content = QUESTIONS[(i // 2) % len(QUESTIONS)].format(name=name)
+                messages.append({'role': 'ai', 'content': content, 'timestamp': stamp})
+                continue
+            category = ('went_well', 'challenges', 'challenges', 'team_feedback', 'challenges',
+                        'improvements', 'improvements', 'team_feedback')[(i // 2) % len(QUESTIONS)]
+            fresh = [answer for answer in ANSWERS[category] if answer not in said[category]]
+            answer = rng.choice(fresh or ANSWERS[category])
+            said[category].append(answer)
+            messages.append({'role': 'user', 'content': answer, 'timestamp': stamp})
+
+        score = round(max(-1.0, min(1.0, rng.gauss(0.2, 0.45))), 2)
+        sentiment = 'positive' if score > 0.25 else 'negative' if score < -0.25 else 'neutral'
+        quotes = [answer for answers in said.values() for answer in answers][:3]
+        summary = {
+            'went_well': said['went_well'], 'challenges': said['challenges'],
+            'improvements': said['improvements'], 'team_feedback': said['team_feedback'],
+            'sentiment': sentiment, 'key_quotes': quotes,
+            'summary': ' '.join(quotes) or 'The member shared little feedback this sprint.',
+        }
+        return dumps(messages), dumps(summary), score
+
+    def report(self, rng: random.Random) -> tuple:
+        """(themes, recommendations, sentiment_summary) JSON for an analyzed sprint"""
+        variant = rng.randrange(self.variants)
+        if variant not in self.reports:
+            self.reports[variant] = self._build_report(random.Random(f'{self.seed}:report:{variant}'))
+        return self.reports[variant]
+
+    def _build_report(self, rng: random.Random) -> tuple:
+        picked = rng.sample(THEME_NAMES, rng.randint(3, len(THEME_NAMES)))
+        themes = []
+        for name, category in picked:
+            mentioned = rng.randint(2, 8)
+            themes.append({
+                'name': name, 'category': category, 'frequency': f'{mentioned} out of 8',
+                'percentage': round(mentioned / 8 * 100, 1),
+                'impact': rng.choice(ANSWERS['challenges'] if category != 'Success' else ANSWERS['went_well']),
+                'quotes': rng.sample(ANSWERS['challenges'] + ANSWERS['went_well'], 2),
+                'mentioned_by': rng.sample(FIRST_NAMES, mentioned),
+                'severity': 'high' if category == 'Critical Issue' else rng.choice(['medium', 'low']),
+            })
+        recommendations = [{
+            'theme': theme['name'], 'priority': rng.choice(['High', 'Medium', 'Low']),
+            'action_items': [{
+                'action': rng.choice(ANSWERS['improvements']),
+                'effort_estimate': rng.choice(['2 hours', '1 day', '3 days', '1 week']),
+                'impact': rng.choice(['high', 'medium', 'low']),
+                'owner_suggestion': rng.choice(['Scrum Master', 'Tech Lead', 'Team']),
+            } for _ in range(rng.randint(1, 3))],
+        } for theme in themes if theme['category'] != 'Success']
+        split = sorted(rng.sample(range(1, 100), 2))
+        sentiment = {'overall_mood': 'positive' if split[0] > 100 - split[1] else 'needs_improvement',
+                     'positive_percentage': float(split[0]),
+                     'neutral_percentage': float(split[1] - split[0]),
+                     'negative_percentage': float(100 - split[1])}
+        return dumps(themes), dumps(recommendations), dumps(sentiment)
+
+class DatasetGenerator:
+    """Writes one project (with its whole history) at a time to a COPY per table"""
+
+    def __init__(self, args, copies: dict):
+        self.args = args
+        self.copies = copies
+        self.pool = ContentPool(args.seed, args.variants, args.as_of)
+        self.rows = dict.fromkeys(TABLES, 0)
+        self.members = 0
+        self.owners = max(1, args.projects // 4)
+
+    def write(self, table: str, *values) -> None:
+        self.copies[table].write_row(values)
+        self.rows[table] += 1
+
+    def project(self, number: int) -> None:
+        args = self.args
+        # One generator per project, so a project's rows don't depend on how many came before
+        rng = random.Random(f'{args.seed}:project:{number}')
+        sprints = lognormal_size(rng, args.sprints, args.history_skew, args.max_sprints)
+        first_start = args.as_of - timedelta(days=SPRINT_DAYS * sprints)
+        created_at = datetime.combine(first_start, datetime.min.time()) - timedelta(days=rng.randint(1, 30))
+        project_id, owner = make_uuid(rng), f'user-{rng.randrange(self.owners)}'
+        noun = rng.choice(PROJECT_NOUNS)
+        self.write('projects', project_id, f'{noun} {number}',
+                   f'The {noun.lower()} platform and everything around it.', owner, created_at, created_at)
+
+        # Members stay on a project across sprints; a sprint takes the first team_size of them
+        team_median = lognormal_size(rng, args.team_size, args.team_skew, args.max_team_size)
+        team_sizes = [lognormal_size(rng, team_median, 0.15, args.max_team_size) for _ in range(sprints)]
+        roster = [self._person(rng, number, i) for i in range(max(team_sizes))]
+        for index, team_size in enumerate(team_sizes):
+            self.sprint(rng, project_id, owner, noun, index, index == sprints - 1,
+                        first_start + timedelta(days=SPRINT_DAYS * index), roster[:team_size])
+
+    def _person(self, rng: random.Random, project: int, index: int) -> tuple:
+        first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        role = rng.choices([r for r, _ in ROLES], weights=[w for _, w in ROLES])[0]
+        return f'{first} {last}', role, f'{first}.{last}.{project}.{index}@example.com'.lower()
+
+    def sprint(self, rng: random.Random, project_id, owner: str, noun: str, index: int,
+               current: bool, start: date, team: list) -> None:
+        args = self.args
+        sprint_id = make_uuid(rng)
+        end = start + timedelta(days=SPRINT_DAYS - 1)
+        opened = datetime.combine(start, datetime.min.time()) + timedelta(hours=9)
+        closed = datetime.combine(end, datetime.min.time()) + timedelta(hours=17)
+        status = 'collecting' if current else rng.choices(['analyzed', 'closed'], weights=[85, 15])[0]
+        self.write('sprints', sprint_id, f'Sprint {index + 1}', start, end, status, owner, opened,
+                   f'{rng.getrandbits(128):032x}', project_id)
+
+        for order in range(rng.randint(2, 5)):
+            self.write('sprint_goals', make_uuid(rng), sprint_id, rng.choice(GOALS).format(noun),
+                       order, opened)
+        if not current:
+            self.write('sprint_outcomes', make_uuid(rng), sprint_id,
+                       f'Completed {rng.randint(60, 100)}% of committed story points.',
+                       rng.choice(ANSWERS['went_well']), rng.choice(ANSWERS['challenges']), closed, closed)
+
+        # The open sprint is mid-collection; past ones mostly got their feedback
+        submit_rate = args.submit_rate / 2 if current else args.submit_rate
+        for name, role, email in team:
+            member_id = make_uuid(rng)
+            submitted = rng.random() < submit_rate
+            # Some who never submitted still started the interview
+            started = submitted or rng.random() < 0.4
+            submitted_at = closed + timedelta(minutes=rng.randint(0, 3 * 24 * 60)) if submitted else None
+            self.write('team_members', member_id, sprint_id, name, role, email, access_code(self.members),
+                       submitted, submitted_at, opened, opened)
+            self.members += 1
+            if not started:
+                continue
+
+            turns = lognormal_size(rng, args.turns, args.turn_skew, args.max_turns)
+            if not submitted:
+                turns = rng.randint(1, turns)
+            conversation, summary, score = self.pool.conversation(rng, turns)
+            token = str(make_uuid(rng))
+            touched = submitted_at or closed
+            self.write('conversation_sessions', make_uuid(rng), sprint_id, member_id, token, conversation,
+                       touched - timedelta(minutes=30), touched)
+            if submitted:
+                anonymous = rng.random() < args.anonymous_rate
+                self.write('responses', make_uuid(rng), sprint_id, member_id,
+                           'Anonymous' if anonymous else name, anonymous, conversation, score,
+                           submitted_at, token, summary)
+
+        if status == 'analyzed':
+            self.report(rng, sprint_id, closed + timedelta(days=3))
+
+    def report(self, rng: random.Random, sprint_id, generated: datetime) -> None:
+        report_id = make_uuid(rng)
+        themes, recommendations, sentiment = self.pool.report(rng)
+        self.write('analysis_reports', report_id, sprint_id, themes, recommendations, sentiment,
+                   generated, rng.randint(20, 180))
+        for _ in range(rng.randint(2, 6)):
+            done = rng.random() < 0.6
+            self.write('action_items', make_uuid(rng), sprint_id, report_id,
+                       rng.choice(ANSWERS['improvements']), rng.choice(['high', 'medium', 'low']),
+                       'done' if done else rng.choice(['pending', 'in_progress', 'cancelled']),
+                       rng.choice(['Scrum Master', 'Tech Lead', 'Team']), generated,
+                       generated + timedelta(days=rng.randint(1, 14)) if done else None,
+                       rng.choice(THEME_NAMES)[0])
+
+def generate(dsn: str, args) -> dict:
+    """Load the dataset described by args into dsn; returns rows written per table"""
+    with ExitStack() as stack:
+        copies = {}
+        for table, columns in TABLES.items():
+            conn = stack.enter_context(connect(dsn))
+            conn.execute('SET session_replication_role = replica')
+            cursor = conn.cursor()
+            # Sends from a background thread, so the server loads every table at once
+            copies[table] = stack.enter_context(cursor.copy(
+                f"COPY {table} ({', '.join(columns)}) FROM STDIN", writer=QueuedLibpqWriter(cursor)))
+        generator = DatasetGenerator(args, copies)
+
+        started = time.perf_counter()
+        for number in range(args.projects):
+            generator.project(number)
+            if (number + 1) % max(1, args.projects // 10) == 0:
+                total = sum(generator.rows.values())
+                print(f"{number + 1}/{args.projects} projects, {total:,} rows "
+                      f"({total / (time.perf_counter() - started):,.0f} rows/s)")
+    return generator.rows
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description='Fill a local Postgres with a synthetic dataset')
+    parser.add_argument('--dsn', default=DEFAULT_DSN, help='Local Postgres database to (re)create')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--as-of', type=date.fromisoformat, default=date.today(),
+                        help='Date the latest sprints end around (default today)')
+    parser.add_argument('--projects', type=int, default=100)
+    parser.add_argument('--sprints', type=float, default=12, help='Median sprints per project')
+    parser.add_argument('--history-skew', type=float, default=0.6)
+    parser.add_argument('--max-sprints', type=int, default=500)
+    parser.add_argument('--team-size', type=float, default=8, help='Median members per project team')
+    parser.add_argument('--team-skew', type=float, default=0.5)
+    parser.add_argument('--max-team-size', type=int, default=300)
+    parser.add_argument('--turns', type=float, default=16, help='Median messages per interview')
+    parser.add_argument('--turn-skew', type=float, default=0.3)
+    parser.add_argument('--max-turns', type=int, default=80)
+    parser.add_argument('--submit-rate', type=float, default=0.85,
+                        help='Fraction of members of past sprints who submitted')
+    parser.add_argument('--anonymous-rate', type=float, default=0.1)
+    parser.add_argument('--variants', type=int, default=64,
+                        help='Distinct conversations per length (and reports) to draw from')
+    parser.add_argument('--check-plans', action='store_true',
+                        help='Run the query-plan checks of scripts.check_query_plans on the result')
+    args = parser.parse_args(argv)
+
+    print(f"Setting up {args.dsn}...")
+    setup_database(args.dsn).close()
+    started = time.perf_counter()
+    rows = generate(args.dsn, args)
+
+    with connect(args.dsn) as conn:
+        conn.execute('SET session_replication_role = replica')
+        conn.execute(COUNTERS_SQL)
+        conn.execute('SET session_replication_role = DEFAULT')
+        conn.execute('ANALYZE')
+        elapsed = time.perf_counter() - started
+
+        print()
+        for table, count in rows.items():
+            print(f"{table:<24}{count:>14,}")
+        total = sum(rows.values())
+        print(f"\n{total:,} rows in {elapsed:.1f}s ({total / elapsed:,.0f} rows/s)")
+
+        if args.check_plans:
+            print()
+            failures = check_plans(conn)
+            if failures:
+                print(f"\n{len(failures)} of {len(QUERIES)} queries use a sequential scan")
+                return 1
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,71 @@
+"""Helpers for running the schema against a local Postgres instead of Supabase.
+
+Used by the query-plan harness, benchmarks and data generator. Applies
+migrations/ in order, shimming the Supabase pieces a plain Postgres lacks
+(uuid-ossp and the auth schema).
+"""
+import glob
+import os
+import psycopg
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(__file__), '..', 'migrations')
+DEFAULT_DSN = os.getenv('LOCAL_DATABASE_URL', 'postgresql://postgres@localhost:5432/retro_local')
+
+# Minimal stand-ins for Supabase's auth schema so 004_auth_schema.sql applies
+AUTH_SHIM = """
+CREATE SCHEMA IF NOT EXISTS auth;
+CREATE TABLE IF NOT EXISTS auth.users (
+    id UUID PRIMARY KEY,
+    email TEXT,
+    raw_user_meta_data JSONB
+);
+CREATE OR REPLACE FUNCTION auth.uid() RETURNS UUID AS $$
+    SELECT NULL::UUID;
+$$ LANGUAGE sql STABLE;
+"""
+
+# gen_random_uuid() is built in from Postgres 13, so it can back uuid_generate_v4()
+UUID_SHIM = """
+CREATE OR REPLACE FUNCTION uuid_generate_v4() RETURNS UUID AS $$
+    SELECT gen_random_uuid();
+$$ LANGUAGE sql VOLATILE;
+"""
+
+def connect(dsn: str = DEFAULT_DSN, **kwargs) -> psycopg.Connection:
+    """Open an autocommit connection to the local database"""
+    return psycopg.connect(dsn, autocommit=True, **kwargs)
+
+def reset_database(dsn: str = DEFAULT_DSN) -> None:
+    """Drop and recreate the database named in dsn"""
+    info = psycopg.conninfo.conninfo_to_dict(dsn)
+    name = info['dbname']
+    info['dbname'] = 'postgres'
+    with psycopg.connect(psycopg.conninfo.make_conninfo(**info), autocommit=True) as conn:
+        conn.execute(f'DROP DATABASE IF EXISTS "{name}" WITH (FORCE)')
+        conn.execute(f'CREATE DATABASE "{name}"')
+
+def migration_files() -> list:
+    """Migration files in the order they should be applied"""
+    return sorted(glob.glob(os.path.join(MIGRATIONS_DIR, '*.sql')))
+
+def apply_migrations(conn: psycopg.Connection) -> None:
+    """Apply every migration in migrations/ to an empty database"""
+    try:
+        conn.execute('CREATE EXTENSION IF NOT EXISTS "uuid-ossp"')
+    except psycopg.Error:
+        conn.execute(UUID_SHIM)
+    conn.execute(AUTH_SHIM)
+
+    for path in migration_files():
+        with open(path, 'r', encoding='utf-8') as f:
+            sql = f.read()
+        # The extension is handled above
+        sql = sql.replace('CREATE EXTENSION IF NOT EXISTS "uuid-ossp";', '')
+        conn.execute(sql)
+
+def setup_database(dsn: str = DEFAULT_DSN) -> psycopg.Connection:
+    """Recreate the local database, apply migrations and return a connection"""
+    reset_database(dsn)
+    conn = connect(dsn)
+    apply_migrations(conn)
+    return conn
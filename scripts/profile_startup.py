@@ -0,0 +1,93 @@
+"""Report where app startup time goes.
+
+Imports the app in a fresh interpreter with -X importtime and reports the
+cumulative import cost of each app module and the self time of each
+third-party package, then times create_app() and the first construction of
+each lazily built service (see app/services/registry.py):
+
+    python -m scripts.profile_startup
+    python -m scripts.profile_startup --top 25 --skip-services
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+from collections import defaultdict
+
+IMPORT_SNIPPET = 'from app import create_app; create_app()'
+
+def parse_importtime(stderr: str) -> list:
+    """(module, self_us, cumulative_us, depth) for each line of -X importtime output"""
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        depth = (len(name) - len(name.lstrip())) // 2
+        entries.append((name.strip(), int(self_us), int(cumulative_us), depth))
+    return entries
+
+def summarize(entries: list) -> tuple:
+    """Cumulative time per app module, and self time per third-party top-level package"""
+    app_modules = {}
+    packages = defaultdict(int)
+    for name, self_us, cumulative_us, _ in entries:
+        if name == 'app' or name.startswith('app.') or name == 'config':
+            app_modules[name] = cumulative_us
+        else:
+            packages[name.split('.')[0]] += self_us
+    return app_modules, packages
+
+def profile_imports() -> list:
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', IMPORT_SNIPPET],
+        capture_output=True, text=True, cwd=os.path.join(os.path.dirname(__file__), '..')
+    )
+    if result.returncode != 0:
+        print(result.stderr.splitlines()[-1] if result.stderr else 'Import failed')
+    return parse_importtime(result.stderr)
+
+def print_table(title: str, rows: dict, top: int) -> None:
+    print(f"\n{title}")
+    print('-' * 60)
+    for name, micros in sorted(rows.items(), key=lambda item: item[1], reverse=True)[:top]:
+        print(f"{name:<48}{micros / 1000:>10.1f}ms")
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description='Profile import and service initialization cost')
+    parser.add_argument('--top', type=int, default=15, help='Rows to show per table')
+    parser.add_argument('--skip-services', action='store_true',
+                        help="Don't construct services (they need API keys and a database)")
+    args = parser.parse_args(argv)
+
+    entries = profile_imports()
+    app_modules, packages = summarize(entries)
+    total_us = sum(self_us for _, self_us, _, _ in entries)
+    print(f"Total import time: {total_us / 1000:.1f}ms over {len(entries)} modules")
+    print_table('App modules (cumulative import time)', app_modules, args.top)
+    print_table('Third-party packages (self import time)', dict(packages), args.top)
+
+    start = time.perf_counter()
+    from app import create_app
+    create_app()
+    print(f"\nImport + create_app() in this process: {(time.perf_counter() - start) * 1000:.1f}ms")
+
+    if args.skip_services:
+        return 0
+
+    from app.services import registry
+    print('\nService initialization (first use)')
+    print('-' * 60)
+    for name in registry.FACTORIES:
+        start = time.perf_counter()
+        try:
+            registry.get_service(name)
+            status = ''
+        except Exception as e:
+            status = f'  failed: {type(e).__name__}: {e}'
+        print(f"{name:<48}{(time.perf_counter() - start) * 1000:>10.1f}ms{status}")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,90 @@
+"""Keyset pagination of /api/sprint/list on both database backends.
+
+Needs a throwaway Postgres database; it is dropped and recreated with the
+migrations applied:
+
+    TEST_DATABASE_URL=postgresql://postgres@localhost/retro_test python -m pytest tests
+"""
+import os
+from datetime import datetime, timedelta, timezone
+import pytest
+
+psycopg = pytest.importorskip('psycopg')
+
+TEST_DATABASE_URL = os.getenv('TEST_DATABASE_URL')
+pytestmark = pytest.mark.skipif(not TEST_DATABASE_URL, reason='TEST_DATABASE_URL is not set')
+
+SPRINT_COUNT = 11
+
+@pytest.fixture(scope='module')
+def sprint_ids():
+    """Seed sprints created by Admin, several sharing a created_at, newest first"""
+    from scripts.local_postgres import setup_database
+    conn = setup_database(TEST_DATABASE_URL)
+    base = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    with conn:
+        for i in range(SPRINT_COUNT):
+            # Pairs of sprints share a timestamp, so ties must be broken by id
+            conn.execute(
+                "INSERT INTO sprints (name, start_date, end_date, status, created_by, created_at, share_token) "
+                "VALUES (%s, '2026-01-01', '2026-01-14', 'collecting', 'Admin', %s, %s)",
+                (f'Sprint {i}', base + timedelta(hours=i // 2), f'page{i:04d}')
+            )
+        conn.execute("INSERT INTO sprints (name, start_date, end_date, created_by, share_token) "
+                     "VALUES ('Someone else', '2026-01-01', '2026-01-14', 'other', 'other000')")
+        rows = conn.execute("SELECT id::text FROM sprints WHERE created_by = 'Admin' "
+                            "ORDER BY created_at DESC, id DESC").fetchall()
+    conn.close()
+    return [row[0] for row in rows]
+
+@pytest.fixture(params=['supabase', 'postgres'])
+def client(request, sprint_ids, monkeypatch):
+    """Test client logged in as Admin, with the database backend under test"""
+    from app import create_app
+    from app.services import registry
+    registry.reset_services()
+    request.addfinalizer(registry.reset_services)
+    monkeypatch.setenv('DATABASE_BACKEND', request.param)
+    monkeypatch.setenv('CACHE_BACKEND', 'none')
+    if request.param == 'supabase':
+        from benchmarks.fake_services import start_fake_supabase
+        server = start_fake_supabase(TEST_DATABASE_URL, pool_size=2)
+        request.addfinalizer(server.pool.close)
+        request.addfinalizer(server.shutdown)
+        monkeypatch.setenv('SUPABASE_URL', server.url)
+        monkeypatch.setenv('SUPABASE_SERVICE_ROLE_KEY', 'test.test.test')
+    else:
+        monkeypatch.setenv('DATABASE_URL', TEST_DATABASE_URL)
+        request.addfinalizer(lambda: registry.database.pool.close())
+
+    client = create_app('production').test_client()
+    with client.session_transaction() as session:
+        session['is_admin'] = True
+        session['admin_name'] = 'Admin'
+    return client
+
+def test_cursor_pages_through_every_sprint_once(client, sprint_ids):
+    seen, cursor, pages = [], None, 0
+    while True:
+        url = '/api/sprint/list?limit=3' + (f'&cursor={cursor}' if cursor else '')
+        response = client.get(url)
+        assert response.status_code == 200, response.get_data(as_text=True)
+        body = response.get_json()
+        assert len(body['sprints']) <= 3
+        seen.extend(sprint['id'] for sprint in body['sprints'])
+        pages += 1
+        cursor = body['next_cursor']
+        if not cursor:
+            break
+    assert seen == sprint_ids
+    assert pages == SPRINT_COUNT // 3 + 1
+
+def test_unpaged_list_returns_every_sprint(client, sprint_ids):
+    body = client.get('/api/sprint/list').get_json()
+    assert [sprint['id'] for sprint in body['sprints']] == sprint_ids
+    assert body['next_cursor'] is None
+
+@pytest.mark.parametrize('cursor', ['not-base64!', 'fGlk', 'MjAyNi0wMS0wMXwxKSxpZC5ndC4w'])
+def test_invalid_cursor_is_rejected(client, cursor):
+    response = client.get(f'/api/sprint/list?cursor={cursor}')
+    assert response.status_code == 400
@@ -0,0 +1,18 @@
+"""Production WSGI entry point.
+
+    gunicorn -c gunicorn.conf.py wsgi:app
+
+gunicorn.conf.py picks the worker model (WSGI_WORKER_MODE) and, in gevent
+mode, monkey-patches the standard library before this module is imported.
+run.py remains the development server.
+"""
+import os
+from app import create_app
+from config import config
+
+config_name = os.getenv('FLASK_ENV', 'production')
+# 'default' is the development config, so an unknown name must not fall back to it
+if config_name not in config:
+    raise SystemExit(f"Unknown FLASK_ENV {config_name!r}; use one of: {', '.join(sorted(config))}")
+
+app = create_app(config_name)